@@ -0,0 +1,322 @@
+# asyncparser.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Parse queries for asyncio applications in a pool of worker processes.
+
+Calling parser.parse in an asyncio event loop blocks the loop for the
+duration of the parse, which can be long for some queries.  A ParseService
+instance sends each query to a process in a reusable pool and awaits the
+result, so the event loop is free while the query is parsed.
+
+The result of a parse is the dict returned by batchparser.parse_query,
+with the additional key:
+
+saved: null, or the QueryContainer for the query saved by persist.dumps
+       if the parse succeeded and the save argument is True.
+
+Use persist.loads(result["saved"]) to get the QueryContainer.  A
+basenode.NodeError is reported in the dict, with the span of the token
+being processed, rather than raised.
+
+Each call can have a deadline, the timeout argument in seconds.  An
+asyncio.TimeoutError is raised if the result is not available by the
+deadline.  A call which times out, or is cancelled, while the query is
+being parsed stops the processes of the pool because the parse cannot be
+interrupted.  A new pool is started for later calls and calls waiting
+for the stopped pool are sent to the new pool.
+
+The statistics method gives the number of calls waiting for a worker
+process and the latency of recent calls, for example:
+
+service = asyncparser.ParseService(max_workers=2, timeout=5)
+result = await service.parse("cql() k")
+print(service.statistics())
+await service.aclose()
+
+The aparse function does 'await service.parse(...)' with a ParseService
+instance shared by all callers.
+
+"""
+import asyncio
+import collections
+import concurrent.futures
+import concurrent.futures.process
+import os
+import time
+import weakref
+
+from . import batchparser
+from . import pattern
+from . import persist
+
+# Number of recent calls used for latency statistics.
+LATENCY_WINDOW = 1000
+
+# Query parsed when a worker process starts so pattern compilation is not
+# counted in the latency of the first call.
+_WARM_UP_QUERY = "cql() k"
+
+# The ParseService instance used by aparse, created on first use.
+_service = None
+
+
+class ParseServiceError(Exception):
+    """Exception raised for calls to a closed ParseService."""
+
+
+def _warm_up():
+    """Parse a query to compile the patterns in a new worker process."""
+    batchparser.parse_query(_WARM_UP_QUERY)
+
+
+def _parse_and_save(string, version, limits, save):
+    """Return dict of result of parsing string with container if save."""
+    result, container = batchparser.parse_query(
+        string, version=version, limits=limits
+    )
+    if save and container is not None:
+        result["saved"] = persist.dumps(container)
+    else:
+        result["saved"] = None
+    return result
+
+
+def _terminate(pool):
+    """Stop the worker processes of pool without waiting for tasks."""
+    terminate_workers = getattr(pool, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    # ProcessPoolExecutor has a terminate_workers method from Python 3.14.
+    # The calls waiting for pool get a BrokenProcessPool exception when
+    # the processes stop, rather than being cancelled.
+    processes = pool._processes  # pylint: disable=protected-access
+    for process in list(processes.values()) if processes else []:
+        process.terminate()
+    pool.shutdown(wait=False)
+
+
+class ParseService:
+    """Parse queries in a pool of at most max_workers processes.
+
+    max_workers defaults to os.cpu_count().  timeout is the default
+    deadline, in seconds, of parse calls: None means no deadline.
+    mp_context is passed to concurrent.futures.ProcessPoolExecutor.
+    limits is the querycontainer.ParseLimits instance applied to all
+    parse calls, or None for no limits.
+
+    The pool is started by the first parse call.
+    """
+
+    def __init__(
+        self, max_workers=None, timeout=None, mp_context=None, limits=None
+    ):
+        """Initialise service with no worker processes started."""
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError("max_workers must be an int greater than zero")
+        if timeout is not None and timeout < 0:
+            raise ValueError("timeout must be None or not less than zero")
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._mp_context = mp_context
+        self._limits = limits
+        self._pool = None
+        self._stopped_pools = weakref.WeakSet()
+        self._pending = set()
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._completed = 0
+        self._timeouts = 0
+        self._cancelled = 0
+        self._restarts = 0
+        self._closed = False
+
+    @property
+    def max_workers(self):
+        """Return self._max_workers."""
+        return self._max_workers
+
+    @property
+    def timeout(self):
+        """Return self._timeout."""
+        return self._timeout
+
+    @property
+    def limits(self):
+        """Return self._limits."""
+        return self._limits
+
+    @property
+    def closed(self):
+        """Return self._closed."""
+        return self._closed
+
+    @property
+    def queue_depth(self):
+        """Return number of calls waiting for a worker process."""
+        return sum(
+            1
+            for future in self._pending
+            if not future.running() and not future.done()
+        )
+
+    @property
+    def pending(self):
+        """Return number of calls waiting for a result."""
+        return len(self._pending)
+
+    def _current_pool(self):
+        """Return the pool of worker processes, starting it if needed."""
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=self._mp_context,
+                initializer=_warm_up,
+            )
+        return self._pool
+
+    def _stop_pool(self, pool):
+        """Stop pool and start a new one for later calls."""
+        self._stopped_pools.add(pool)
+        if pool is self._pool:
+            self._pool = None
+            self._restarts += 1
+        _terminate(pool)
+
+    async def parse(self, string, timeout=None, version=None, save=True):
+        """Return dict of result of parsing query in string.
+
+        timeout defaults to the timeout given when the service was created.
+        An asyncio.TimeoutError is raised if the result is not available
+        within timeout seconds.
+
+        The version argument is as for parser.parse(), and a
+        pattern.PatternError is raised if version is not known.
+
+        The QueryContainer is saved in the result if save is True.
+
+        """
+        if self._closed:
+            raise ParseServiceError("ParseService is closed")
+        if version is not None:
+            pattern.version_element_indices(version)
+        if timeout is None:
+            timeout = self._timeout
+        start = time.perf_counter()
+        while True:
+            pool = self._current_pool()
+            try:
+                future = pool.submit(
+                    _parse_and_save, string, version, self._limits, save
+                )
+            except concurrent.futures.process.BrokenProcessPool:
+                # A worker process stopped after the last call finished.
+                self._stop_pool(pool)
+                continue
+            self._pending.add(future)
+            try:
+                if timeout is None:
+                    remaining = None
+                else:
+                    remaining = max(timeout - (time.perf_counter() - start), 0)
+                result = await asyncio.wait_for(
+                    asyncio.wrap_future(future), remaining
+                )
+            except concurrent.futures.process.BrokenProcessPool:
+                # Calls sent to a pool stopped by another call are sent to
+                # the new pool, but a pool broken by this call is not used
+                # again.
+                if pool not in self._stopped_pools:
+                    self._stop_pool(pool)
+                    raise
+                continue
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                # The parse cannot be cancelled once started.
+                if not future.cancel() and not future.done():
+                    self._stop_pool(pool)
+                raise
+            except asyncio.CancelledError:
+                self._cancelled += 1
+                if not future.cancel() and not future.done():
+                    self._stop_pool(pool)
+                raise
+            finally:
+                self._pending.discard(future)
+            break
+        self._completed += 1
+        self._latencies.append(time.perf_counter() - start)
+        return result
+
+    def statistics(self):
+        """Return dict of call counts and latencies of recent calls.
+
+        The latencies are in seconds and are None if no calls completed.
+
+        """
+        latencies = sorted(self._latencies)
+        if latencies:
+            latency_mean = sum(latencies) / len(latencies)
+            latency_median = latencies[len(latencies) // 2]
+            latency_p95 = latencies[int(len(latencies) * 0.95)]
+            latency_max = latencies[-1]
+        else:
+            latency_mean = None
+            latency_median = None
+            latency_p95 = None
+            latency_max = None
+        return {
+            "max_workers": self._max_workers,
+            "pending": len(self._pending),
+            "queue_depth": self.queue_depth,
+            "completed": self._completed,
+            "timeouts": self._timeouts,
+            "cancelled": self._cancelled,
+            "restarts": self._restarts,
+            "latency_mean": latency_mean,
+            "latency_median": latency_median,
+            "latency_p95": latency_p95,
+            "latency_max": latency_max,
+        }
+
+    def close(self, wait=True):
+        """Stop the worker processes after the pending calls finish.
+
+        The pending calls are abandoned if wait is False.
+
+        """
+        self._closed = True
+        pool = self._pool
+        self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    async def aclose(self):
+        """Close service without blocking the event loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self):
+        """Return self."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Close service."""
+        await self.aclose()
+
+
+async def aparse(string, timeout=None, version=None, save=True):
+    """Return dict of result of parsing query in string.
+
+    The query is parsed by a ParseService shared by all callers, created
+    with the default arguments on the first call.  See ParseService.parse
+    for the arguments.
+
+    """
+    global _service  # pylint: disable=global-statement
+    if _service is None or _service.closed:
+        _service = ParseService()
+    return await _service.parse(
+        string, timeout=timeout, version=version, save=save
+    )
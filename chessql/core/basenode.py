@@ -11,6 +11,8 @@ returned by those values which are functions are kept in filters even
 if not values in cql.class_from_token_name dict.
 
 """
+import copy
+
 from . import constants
 from . import cqltypes
 
@@ -27,6 +29,17 @@ def debug(tag, node):
     )
 
 
+# Names of attributes in BaseNode.__slots__ which subclasses give their own
+# default value.
+_DEFAULTED_SLOTS = (
+    "_filter_type",
+    "_child_count",
+    "_precedence",
+    "completed",
+    "_name",
+)
+
+
 class NodeError(Exception):
     """Exception raised for problems in BaseNode and subclasses."""
 
@@ -40,16 +53,12 @@ class BaseNode:
     but arguments usually are filters too.
     """
 
-    # Filters do not have a type by default.
-    # Some subclasses may be one several types of filter.
-    # The subclass should override _filter_type to the appropriate subset
-    # of cqltypes.FilterType.ANY, and each instance should set the instance
-    # attribute _filter_type to one of these if the correct one can be
-    # deduced.
-    # In many cases the subclass _filter_type will be one of the options.
-    # See gadycosteff.com/cql/filter.html for derivation of attribute names
-    # for the filter type.
-    _filter_type = ~cqltypes.FilterType.ANY
+    __slots__ = (
+        "_children",
+        "match_",
+        "_container",
+        "_parent",
+    ) + _DEFAULTED_SLOTS
 
     # In BaseNode not CQLObject because the value is tested in a place where
     # node being an instance of QueryContainer cannot be avoided except
@@ -57,40 +66,96 @@ class BaseNode:
     # protecting the test.  See NoArgumentsFilter.__init__().
     _is_parameter = False
 
-    # Most nodes take zero or one child nodes.  The infix nodes take two
-    # child nodes.  The 'If' node takes two or three child nodes, the
-    # third being the 'Else' node if present.  The nodes which represent
-    # '{}' and '()' sequences can have any number of nodes, but in some
-    # contexts the number itself will not be variable.  Nodes which
-    # represent filters with an implicit search parameter can have zero
-    # or one child node; and None is the appropriate _child_count value.
-    # Default is None.  Override with 0 or 1 or 2.
-    # Where the default is not overridden the subclass must override the
-    # complete() method as needed.
-    _child_count = None
-
-    # Operation precedence.
-    # Default is set to None but subclasses which accept child filters
-    # should set precedence to the appropriate cqltypes.Precedence value
-    # to implement the table of precedence in the CQL documentation.
-    _precedence = None
-
-    # A filter is not complete until it's completion condition is met.
-    # Then the <instance>.completed attribute is set True, done by the
-    # complete() method.
-    completed = False
-
-    # BaseNode instances do not have a name, except those which are also
-    # Name instances.
-    _name = None
+    # The default values of the attributes named in _DEFAULTED_SLOTS.
+    # Subclasses override these defaults by class attributes of the same
+    # name: see __init_subclass__().
+    _own_slot_defaults = {
+        # Filters do not have a type by default.
+        # Some subclasses may be one several types of filter.
+        # The subclass should override _filter_type to the appropriate
+        # subset of cqltypes.FilterType.ANY, and each instance should set
+        # the instance attribute _filter_type to one of these if the
+        # correct one can be deduced.
+        # In many cases the subclass _filter_type will be one of the
+        # options.
+        # See gadycosteff.com/cql/filter.html for derivation of attribute
+        # names for the filter type.
+        "_filter_type": ~cqltypes.FilterType.ANY,
+        # Most nodes take zero or one child nodes.  The infix nodes take
+        # two child nodes.  The 'If' node takes two or three child nodes,
+        # the third being the 'Else' node if present.  The nodes which
+        # represent '{}' and '()' sequences can have any number of nodes,
+        # but in some contexts the number itself will not be variable.
+        # Nodes which represent filters with an implicit search parameter
+        # can have zero or one child node; and None is the appropriate
+        # _child_count value.
+        # Default is None.  Override with 0 or 1 or 2.
+        # Where the default is not overridden the subclass must override
+        # the complete() method as needed.
+        "_child_count": None,
+        # Operation precedence.
+        # Default is set to None but subclasses which accept child filters
+        # should set precedence to the appropriate cqltypes.Precedence
+        # value to implement the table of precedence in the CQL
+        # documentation.
+        "_precedence": None,
+        # A filter is not complete until it's completion condition is met.
+        # Then the <instance>.completed attribute is set True, done by the
+        # complete() method.
+        "completed": False,
+        # BaseNode instances do not have a name, except those which are
+        # also Name instances.
+        "_name": None,
+    }
+
+    # The values for _DEFAULTED_SLOTS, in order, given to new instances.
+    _slot_defaults = tuple(_own_slot_defaults.values())
+
+    def __init_subclass__(cls, **kwargs):
+        """Move class attributes named in _DEFAULTED_SLOTS to defaults.
+
+        A class attribute hides the slot of the same name in BaseNode so
+        instances could not be given their own value.  The default for
+        each name is found by the usual method resolution order.
+
+        """
+        super().__init_subclass__(**kwargs)
+        namespace = cls.__dict__
+        own_slot_defaults = {}
+        for name in _DEFAULTED_SLOTS:
+            if name in namespace:
+                own_slot_defaults[name] = namespace[name]
+                delattr(cls, name)
+        cls._own_slot_defaults = own_slot_defaults
+        defaults = []
+        for name in _DEFAULTED_SLOTS:
+            for class_ in cls.__mro__:
+                class_defaults = class_.__dict__.get("_own_slot_defaults")
+                if class_defaults is not None and name in class_defaults:
+                    defaults.append(class_defaults[name])
+                    break
+        cls._slot_defaults = tuple(defaults)
+
+    def _set_slot_defaults(self):
+        """Set attributes named in _DEFAULTED_SLOTS to class defaults."""
+        (
+            self._filter_type,
+            self._child_count,
+            self._precedence,
+            self.completed,
+            self._name,
+        ) = self._slot_defaults
 
     def __init__(self, match_=None, container=None):
         """Initialise node parent and children attributes."""
+        self._set_slot_defaults()
         self._children = []
         self.match_ = match_
         self._container = container
         container.cursor.children.append(self)
         self._parent = container.cursor
+        if container.limits is not None:
+            container.count_node()
         if container.function_body_cursor is not None:
             container.definitions[
                 container.function_body_cursor.name
@@ -168,17 +233,11 @@ class BaseNode:
         In most cases comparing len(children) with _child_count will do.
 
         """
-        return (
-            len(self.children)
-            - len(
-                [
-                    c
-                    for c in self.children
-                    if c.is_parameter and c.is_parameter_accepted_by_filter()
-                ]
-            )
-            > self._child_count
-        )
+        # Parameters accepted by the filter can only reduce the count so
+        # the children need not be examined while the node is filling.
+        if len(self.children) <= self._child_count:
+            return False
+        return self._filter_child_count() > self._child_count
 
     def full(self):
         """Return True if node has it's complement of children or more.
@@ -191,17 +250,21 @@ class BaseNode:
         In most cases comparing len(children) with _child_count will do.
 
         """
-        return (
-            len(self.children)
-            - len(
-                [
-                    c
-                    for c in self.children
-                    if c.is_parameter and c.is_parameter_accepted_by_filter()
-                ]
-            )
-            >= self._child_count
-        )
+        if len(self.children) < self._child_count:
+            return False
+        return self._filter_child_count() >= self._child_count
+
+    def _filter_child_count(self):
+        """Return number of children excluding parameters accepted by node.
+
+        See is_parameter_accepted_by_filter().
+
+        """
+        count = len(self.children)
+        for child in self.children:
+            if child.is_parameter and child.is_parameter_accepted_by_filter():
+                count -= 1
+        return count
 
     def _verify_children_and_set_own_types(self):
         """Do nothing: subclasses should override as necessary."""
@@ -218,7 +281,8 @@ class BaseNode:
         This method checks the object has not already been verified and
         calls _verify_children_and_set_own_types to do the task.
         """
-        verified = self.container.verified
+        container = self.container
+        verified = container.verified
         if self in verified:
             self.raise_nodeerror(
                 self.__class__.__name__.join("''"),
@@ -227,7 +291,10 @@ class BaseNode:
         verified.add(self)
         if set_node_completed:
             self.completed = True
-        self._verify_children_and_set_own_types()
+        if container.profile is None:
+            self._verify_children_and_set_own_types()
+        else:
+            container.profile.verify_node(self)
 
     # An isinstance solution is preferred.
     def _is_variable(self):
@@ -335,11 +402,100 @@ class BaseNode:
         """
         if trace is None:
             trace = []
+        trace.extend(self.iter_tree_trace())
+
+    def tree_depth(self):
+        """Return one more than number of ancestors of node."""
         depth = 0
         node = self
         while node:
             depth += 1
             node = node.parent
+        return depth
+
+    def parse_tree_trace_at_depth(self, trace, depth, binding=None):
+        """Populate trace with parse tree for node at depth in print format.
+
+        Trace is populated as by parse_tree_trace() but depth is given
+        rather than calculated from the ancestors of node.
+
+        Binding is None or a dict of names to be used in place of the
+        names of nodes in the tree: see tokenmap.SharedFunctionBody class.
+
+        """
+        trace.extend(self.iter_tree_trace(depth=depth, binding=binding))
+
+    def iter_tree(self):
+        """Yield (<depth>, <node>) for nodes in parse tree for node.
+
+        The nodes are yielded in the order given by parse_tree_node(),
+        depth first with each node before its children, without building
+        the whole list.
+
+        """
+        for depth, node, binding in self._walk_tree(self.tree_depth(), None):
+            yield depth, node
+
+    def iter_tree_trace(self, depth=None, binding=None):
+        """Yield parse tree trace str for nodes in parse tree for node.
+
+        The str are those put in trace by parse_tree_trace(), or by
+        parse_tree_trace_at_depth() if depth is not None.
+
+        """
+        if depth is None:
+            depth = self.tree_depth()
+        for depth, node, binding in self._walk_tree(depth, binding):
+            if binding and node._name in binding:
+                node = node._bound_copy(binding[node._name])
+            yield node._parse_tree_trace_line(depth)
+
+    def _walk_tree(self, depth, binding):
+        """Yield (<depth>, <node>, <binding>) for nodes in tree for node.
+
+        An explicit stack is used rather than recursion so the depth of
+        nesting in the query is not limited by Python's recursion limit.
+
+        """
+        stack = [(self, depth, binding)]
+        pop = stack.pop
+        push = stack.extend
+        while stack:
+            node, depth, binding = pop()
+            node, binding = node._tree_node_and_binding(binding)
+            yield depth, node, binding
+            if node._children:
+                depth += 1
+                push(
+                    (child, depth, binding)
+                    for child in reversed(node._children)
+                )
+
+    def _tree_node_and_binding(self, binding):
+        """Return (node, binding) to be reported in parse tree for node.
+
+        Subclasses which stand in for another node in the parse tree, like
+        tokenmap.SharedFunctionBody, override this method.
+
+        """
+        return self, binding
+
+    def _bound_copy(self, name):
+        """Return shallow copy of node with name in place of node's name.
+
+        The match of the copy is for name if node's match is for node's
+        name alone, as for the reserved variables in function calls.
+
+        """
+        node = copy.copy(self)
+        node._name = name
+        match_ = self.match_
+        if match_ is not None and match_.string == self._name:
+            node.match_ = match_.re.match(name)
+        return node
+
+    def _parse_tree_trace_line(self, depth):
+        """Return parse tree trace str for node at depth."""
         if self._is_variable() and self._name.startswith(
             constants.LOWER_CASE_CQL_PREFIX
         ):
@@ -392,19 +548,15 @@ class BaseNode:
         # docs.python.org/3.10/reference/lexical_analysis.html#f-strings
         # but the Idle I have colours everything within the quotes green.
         # Ah! See github.com/python/cpython/issues/73473.
-        trace.append(
-            " ".join(
-                (
-                    "{:>3}".format(depth),
-                    " " * depth,
-                    self.__class__.__name__,
-                    match_,
-                    " ".join(type_strings),
-                )
+        return " ".join(
+            (
+                "{:>3}".format(depth),
+                " " * depth,
+                self.__class__.__name__,
+                match_,
+                " ".join(type_strings),
             )
         )
-        for node in self._children:
-            node.parse_tree_trace(trace=trace)
 
     def print_parse_tree_trace(self):
         """Print the parse tree rooted at self.
@@ -426,14 +578,19 @@ class BaseNode:
         """
         if trace is None:
             trace = []
-        depth = 0
-        node = self
-        while node:
-            depth += 1
-            node = node.parent
-        trace.append((depth, self))
-        for node in self._children:
-            node.parse_tree_node(trace=trace)
+        trace.extend(self.iter_tree())
+
+    def parse_tree_node_at_depth(self, trace, depth):
+        """Populate trace with parse tree for node at depth.
+
+        Trace is populated as by parse_tree_node() but depth is given
+        rather than calculated from the ancestors of node.
+
+        """
+        trace.extend(
+            (depth, node)
+            for depth, node, binding in self._walk_tree(depth, None)
+        )
 
     # This method exists to allow BaseNode and CQLObject classes to be in
     # separate modules.
@@ -0,0 +1,292 @@
+# batchparser.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Parse all the *.cql files in directories using a pool of processes.
+
+The result for each file is written to standard output as a line of JSON
+with the keys:
+
+file: the path of the *.cql file.
+success: true if the query was parsed, false otherwise.
+error: null, or the message of the exception which stopped the parse,
+       prefixed by the exception name if not a basenode.NodeError.
+span: null, or the [start, end] span in the query of the token being
+      processed when the parse failed.
+nodes: number of nodes in the parse tree, or null if the parse failed.
+time: seconds spent parsing the query excluding reading the file.
+
+With the --all-errors option the parse continues after errors, see
+parser.parse_collecting_errors, and the results have the key:
+
+errors: list of {"error": message, "span": [start, end]} for each error
+        found, the first being the error and span values.
+
+Results are written in the order of the sorted file names, and each line
+is written as soon as the results of all earlier files are available.
+
+Usage is:
+
+python -m chessql.core.batchparser [--jobs N] [--recursive] [--all-errors]
+    [--version VERSION] directory ...
+
+The --version option accepts only the tokens of a CQL version, one of
+pattern.CQL_VERSIONS, rather than the tokens of all versions.
+
+The exit status is 0 if all queries were parsed, 1 otherwise.
+
+"""
+import argparse
+import concurrent.futures
+import functools
+import json
+import os
+import sys
+import time
+
+from . import basenode
+from . import parser
+from . import pattern
+
+# File name extensions of query files: as in parser.parse_command_line_query.
+QUERY_EXTENSIONS = frozenset((".cql", ".CQL"))
+
+# Number of files sent to a worker process at a time is the number of files
+# divided by number of jobs times this factor: to balance the cost of
+# interprocess communication against idle workers near the end.
+_CHUNKS_PER_JOB = 4
+
+
+def query_files(directories, recursive=False):
+    """Return sorted list of paths of query files in directories.
+
+    Sub-directories are searched if recursive is True.
+
+    """
+    paths = []
+    for directory in directories:
+        if recursive:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames.sort()
+                paths.extend(
+                    os.path.join(dirpath, name)
+                    for name in filenames
+                    if os.path.splitext(name)[-1] in QUERY_EXTENSIONS
+                )
+        else:
+            paths.extend(
+                entry.path
+                for entry in os.scandir(directory)
+                if entry.is_file()
+                and os.path.splitext(entry.name)[-1] in QUERY_EXTENSIONS
+            )
+    return sorted(paths)
+
+
+def parse_file(path, all_errors=False, version=None):
+    """Return dict of result of parsing query in file at path.
+
+    The parse failure, or the failure to read path, is reported in the
+    returned dict rather than raised.  The all_errors and version
+    arguments are as for parse_query().
+
+    """
+    result = {"file": path}
+    try:
+        with open(path, mode="r", encoding="utf-8") as queryfile:
+            string = queryfile.read()
+    except (OSError, UnicodeDecodeError) as exc:
+        result.update(
+            success=False, error=str(exc), span=None, nodes=None, time=None
+        )
+        if all_errors:
+            result["errors"] = [{"error": str(exc), "span": None}]
+        return result
+    result.update(
+        parse_query(string, version=version, all_errors=all_errors)[0]
+    )
+    return result
+
+
+def parse_query(string, version=None, limits=None, all_errors=False):
+    """Return (dict of result, QueryContainer) for query in string.
+
+    The dict has the keys of the parse_file() dict except 'file', and the
+    QueryContainer is None if the parse failed.  The parse failure is
+    reported in the returned dict rather than raised.
+
+    The version and limits arguments are as for parser.parse(), and a
+    pattern.PatternError is raised if version is not known.  A limit
+    exceeded is reported as a failed parse.
+
+    If all_errors is True the errors found by
+    parser.parse_collecting_errors() are in the dict's 'errors' list.
+
+    """
+    if all_errors:
+        return _parse_query_collecting_errors(string, version, limits)
+    result = {
+        "success": False,
+        "error": None,
+        "span": None,
+        "nodes": None,
+        "time": None,
+    }
+    # An unknown version is raised, not reported as a failed parse.
+    if version is not None:
+        pattern.version_element_indices(version)
+    start = time.perf_counter()
+    try:
+        container = parser.parse(string, version=version, limits=limits)
+    except basenode.NodeError as exc:
+        result["time"] = time.perf_counter() - start
+        result["error"] = str(exc)
+        if getattr(exc, "span", None) is not None:
+            result["span"] = list(exc.span)
+        return result, None
+    # Some invalid queries cause exceptions other than NodeError.  These
+    # are reported like NodeError, with the exception name, so one query
+    # does not stop the parsing of all the others.
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        result["time"] = time.perf_counter() - start
+        result["error"] = ": ".join((exc.__class__.__name__, str(exc)))
+        if getattr(exc, "span", None) is not None:
+            result["span"] = list(exc.span)
+        return result, None
+    result["time"] = time.perf_counter() - start
+    nodes = []
+    container.parse_tree_node(trace=nodes)
+    result["success"] = True
+    result["nodes"] = len(nodes)
+    return result, container
+
+
+def _parse_query_collecting_errors(string, version, limits):
+    """Return parse_query() result collecting all errors in string."""
+    start = time.perf_counter()
+    container, errors = parser.parse_collecting_errors(
+        string, version=version, limits=limits
+    )
+    result = {
+        "success": not errors,
+        "error": None,
+        "span": None,
+        "nodes": None,
+        "time": time.perf_counter() - start,
+        "errors": errors,
+    }
+    if errors:
+        result["error"] = errors[0]["error"]
+        result["span"] = errors[0]["span"]
+        return result, None
+    nodes = []
+    container.parse_tree_node(trace=nodes)
+    result["nodes"] = len(nodes)
+    return result, container
+
+
+def parse_files(paths, jobs=None, all_errors=False, version=None):
+    """Yield parse_file(path) result for each path in paths in order.
+
+    The files are shared between jobs processes, default os.cpu_count(),
+    unless jobs is 1 when the files are parsed in this process.  The
+    all_errors and version arguments are as for parse_query().
+
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be greater than zero")
+    parse = functools.partial(
+        parse_file, all_errors=all_errors, version=version
+    )
+    if jobs == 1:
+        yield from map(parse, paths)
+        return
+    paths = list(paths)
+    chunksize = max(1, len(paths) // (jobs * _CHUNKS_PER_JOB))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(parse, paths, chunksize=chunksize)
+
+
+def _positive_int(value):
+    """Return int(value) if greater than zero or raise ArgumentTypeError."""
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            value.join(("'", "' is not an integer"))
+        ) from exc
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            value.join(("'", "' is not greater than zero"))
+        )
+    return number
+
+
+def main(argv=None, output=None):
+    """Write JSON line of result for each query file and return exit status.
+
+    argv defaults to the command line arguments and output defaults to
+    sys.stdout.
+
+    """
+    argumentparser = argparse.ArgumentParser(
+        prog="python -m chessql.core.batchparser",
+        description="Parse the *.cql files in directories.",
+    )
+    argumentparser.add_argument(
+        "directories",
+        nargs="+",
+        metavar="directory",
+        help="directory containing *.cql files",
+    )
+    argumentparser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="number of processes parsing files (default CPU count)",
+    )
+    argumentparser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="include *.cql files in sub-directories",
+    )
+    argumentparser.add_argument(
+        "-a",
+        "--all-errors",
+        action="store_true",
+        help="report all errors in each query rather than the first",
+    )
+    argumentparser.add_argument(
+        "-V",
+        "--version",
+        choices=pattern.CQL_VERSIONS,
+        default=None,
+        help="accept only the tokens of this CQL version (default all)",
+    )
+    arguments = argumentparser.parse_args(argv)
+    if output is None:
+        output = sys.stdout
+    for directory in arguments.directories:
+        if not os.path.isdir(directory):
+            argumentparser.error(directory.join(("'", "' is not a directory")))
+    status = 0
+    for result in parse_files(
+        query_files(arguments.directories, recursive=arguments.recursive),
+        jobs=arguments.jobs,
+        all_errors=arguments.all_errors,
+        version=arguments.version,
+    ):
+        if not result["success"]:
+            status = 1
+        output.write(json.dumps(result))
+        output.write("\n")
+        output.flush()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+# compact.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Replace the re.Match instances kept by a parsed query with small records.
+
+Each node refers to the re.Match instance which created it.  A re.Match
+keeps the whole query string searched and the state of every group in
+the pattern, several kilobytes for the pattern.cql_re pattern, which is
+far more than needed once the query is parsed.
+
+The compact_container function replaces the re.Match instances kept by
+the nodes, the whitespace and parameter nodes, and the function
+definitions, of a QueryContainer with TokenMatch instances.  A
+TokenMatch keeps the span and text of the match and the spans of the
+groups which took part in the match, and provides the parts of the
+re.Match interface used by the node classes after parsing.  The
+QueryContainer can be pickled once the re.Match instances are gone.
+
+A compacted QueryContainer cannot be used to continue parsing a query
+because the nodes no longer have access to the query string.
+
+"""
+import itertools
+import operator
+import re
+import sys
+
+from . import cqltypes
+from . import lexer
+from . import pattern
+from . import tokenmap
+
+
+class TokenMatch:
+    """Provide the re.Match interface used by nodes without the string.
+
+    The spans of the groups, except group 0, which took part in the match
+    are kept in a flat tuple of (index, start, end) triples.
+
+    The string attribute is the matched text if the match is of the whole
+    string searched, as for the names of reserved variables in function
+    calls, or None otherwise because the string searched is not kept.
+    """
+
+    __slots__ = ("re", "string", "lastindex", "_start", "_text", "_spans")
+
+    def __init__(self, regex, string, lastindex, start, text, spans):
+        """Set details of match of regex for text at start."""
+        self.re = regex
+        self.string = string
+        self.lastindex = lastindex
+        self._start = start
+        self._text = text
+        self._spans = spans
+
+    def __repr__(self):
+        """Return str like repr of re.Match instance."""
+        return "".join(
+            (
+                "<",
+                self.__class__.__name__,
+                " object; span=",
+                str(self.span()),
+                ", match=",
+                repr(self._text),
+                ">",
+            )
+        )
+
+    def __getitem__(self, group):
+        """Return self.group(group)."""
+        return self.group(group)
+
+    @property
+    def lastgroup(self):
+        """Return name of last matched group or None."""
+        for name, index in self.re.groupindex.items():
+            if index == self.lastindex:
+                return name
+        return None
+
+    def _index(self, group):
+        """Return index of group, which may be a group name."""
+        if isinstance(group, str):
+            try:
+                return self.re.groupindex[group]
+            except KeyError as exc:
+                raise IndexError("no such group") from exc
+        if not 0 <= group <= self.re.groups:
+            raise IndexError("no such group")
+        return group
+
+    def _span(self, index):
+        """Return (start, end) of group index or None if not matched."""
+        if index == 0:
+            return self._start, self._start + len(self._text)
+        spans = self._spans
+        for item in range(0, len(spans), 3):
+            if spans[item] == index:
+                return spans[item + 1], spans[item + 2]
+        return None
+
+    def span(self, group=0):
+        """Return (start, end) of group, (-1, -1) if not matched."""
+        span = self._span(self._index(group))
+        if span is None:
+            return -1, -1
+        return span
+
+    def start(self, group=0):
+        """Return start of group, -1 if not matched."""
+        return self.span(group)[0]
+
+    def end(self, group=0):
+        """Return end of group, -1 if not matched."""
+        return self.span(group)[1]
+
+    def _group(self, group, default=None):
+        """Return str matched by group or default if not matched."""
+        span = self._span(self._index(group))
+        if span is None:
+            return default
+        start = self._start
+        # pycodestyle E203 whitespace before ':'.
+        # black insists on " : " format.
+        return self._text[span[0] - start : span[1] - start]
+
+    def group(self, *groups):
+        """Return str, or tuple of str, matched by groups."""
+        if not groups:
+            return self._text
+        if len(groups) == 1:
+            return self._group(groups[0])
+        return tuple(self._group(group) for group in groups)
+
+    def groups(self, default=None):
+        """Return tuple of str matched by all groups except group 0."""
+        return tuple(
+            self._group(index, default=default)
+            for index in range(1, self.re.groups + 1)
+        )
+
+    def groupdict(self, default=None):
+        """Return dict of str matched by named groups keyed by name."""
+        return {
+            name: self._group(index, default=default)
+            for name, index in self.re.groupindex.items()
+        }
+
+
+def _matched_groups(match_):
+    """Return iterable of indices of groups, except 0, matched by match_.
+
+    The groups of a pattern.cql_re match are the named group giving the
+    token name and the group immediately before it, if that is the group
+    enclosing the token, so only the groups next to match_.lastindex are
+    examined.  See pattern.map_group_index_to_token_name function.
+
+    """
+    regex = lexer.cql_regex(match_.re)
+    lastindex = match_.lastindex
+    if regex is pattern.cql_re and lastindex is not None:
+        return [
+            index
+            for index in range(
+                max(1, lastindex - 1), min(regex.groups, lastindex + 1) + 1
+            )
+            if match_.start(index) != -1
+        ]
+    return itertools.compress(
+        itertools.count(1),
+        map(operator.is_not, match_.groups(), itertools.repeat(None)),
+    )
+
+
+def token_match(match_):
+    """Return TokenMatch instance equivalent to re.Match match_."""
+    span = match_.span
+    spans = []
+    for index in _matched_groups(match_):
+        spans.extend((index,) + span(index))
+    text = sys.intern(match_.group())
+    start = match_.start()
+    return TokenMatch(
+        lexer.cql_regex(match_.re),
+        text if start == 0 and len(text) == len(match_.string) else None,
+        match_.lastindex,
+        start,
+        text,
+        tuple(spans),
+    )
+
+
+def _compact(match_, compacted):
+    """Return TokenMatch for match_ using and updating compacted dict.
+
+    The TokenMatch for an re.Match is created once so nodes which share
+    an re.Match, as the nodes of function bodies do, share the TokenMatch.
+
+    """
+    if not isinstance(match_, re.Match):
+        return match_
+    key = id(match_)
+    if key not in compacted:
+        # Keep match_ alive so the id is not reused while compacting.
+        compacted[key] = (token_match(match_), match_)
+    return compacted[key][0]
+
+
+def compact_container(container):
+    """Replace re.Match instances kept by container with TokenMatch."""
+    compacted = {}
+    # The nodes of function definitions, and of function call arguments
+    # which are variables, are not in the tree.  They are reached from the
+    # verified nodes by their parent and children links.
+    nodes = [container]
+    nodes.extend(container.whitespace)
+    nodes.extend(container.verified)
+    visited = {id(None)}
+    while nodes:
+        node = nodes.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        node.match_ = _compact(node.match_, compacted)
+        nodes.append(node.parent)
+        # The body of a SharedFunctionBody is elsewhere in the tree.
+        if not isinstance(node, tokenmap.SharedFunctionBody):
+            nodes.extend(node.children)
+    for parameter in container.parameters:
+        parameter.match_ = _compact(parameter.match_, compacted)
+    container.current_token = _compact(container.current_token, compacted)
+    for definition in container.definitions.values():
+        if not isinstance(definition, cqltypes.Function):
+            continue
+        template = definition.template
+        body = definition.body
+        body[:] = [_compact(match_, compacted) for match_ in body]
+        if template is not None:
+            definition.template = tuple(
+                (class_, _compact(match_, compacted))
+                for class_, match_ in template
+            )
@@ -0,0 +1,266 @@
+# costestimate.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Estimate the relative cost of evaluating a parsed query.
+
+The estimate is derived from the node tree of a QueryContainer, using only
+the classes of the nodes and their place in the tree, so it is available
+as soon as parser.parse() returns and does not need a game to evaluate.
+
+Each node has a base cost, the work done by the node itself in a position,
+and a multiplier applied to the cost of its children.  The cost of a node
+is its base cost plus the cost of its children times the multiplier.
+Filters which search the game, like line, path, and find, multiply the
+cost of their children by POSITIONS, and echo, which compares pairs of
+positions, by POSITIONS squared; transform filters, like flip and
+rotate45, by the number of transforms they try; and the square and piece
+iterators by the number of squares or pieces.  So nested filters of these
+kinds multiply the cost of the filters inside them.  Filters which need
+move generation, like legal, countmoves, and mate, have a higher base
+cost than piece designators and the header filters like player and
+result.
+
+The costs are relative: they are useful to compare queries, or to choose
+how to schedule, shard, and set timeouts for queries, but are not times.
+
+"""
+import json
+
+from . import cql
+from . import filters
+from . import querycontainer
+from . import structure
+
+# Assumed number of positions in a game, searched by filters like line.
+POSITIONS = 100
+
+# Number of squares tried by the square iterators and the shift filter.
+SQUARES = 64
+
+# Assumed number of pieces tried by the piece iterators.
+PIECES = 32
+
+# Assumed number of iterations of the loop and while filters.
+ITERATIONS = 10
+
+# Queries with lower total cost are 'cheap'.
+CHEAP_LIMIT = POSITIONS
+
+# Queries with this total cost or higher are 'expensive'.
+EXPENSIVE_LIMIT = POSITIONS * POSITIONS
+
+# The cost of nodes whose class, or the nearest class in its mro, is not
+# in BASE_COSTS.
+DEFAULT_BASE_COST = 1
+
+# Base costs of nodes by class, found by the nearest class in node's mro.
+BASE_COSTS = {
+    querycontainer.QueryContainer: 0,
+    cql.CQL: 0,
+    filters.BraceLeft: 0,
+    filters.ParenthesisLeft: 0,
+    filters.Function: 0,
+    filters.FunctionCall: 0,
+    filters.Dictionary: 0,
+    filters.Integer: 0,
+    filters.RangeInteger: 0,
+    filters.String: 0,
+    filters.ResultArgument: 0,
+    filters.Variable: 0,
+    filters.PieceVariable: 0,
+    structure.NoArgumentsParameter: 0,
+    structure.ParameterArgument: 0,
+    filters.Move: 2,
+    filters.Attacks: 4,
+    filters.AttackedBy: 4,
+    filters.AttackArrow: 4,
+    filters.AttackedArrow: 4,
+    filters.Between: 4,
+    filters.Ray: 4,
+    filters.XRay: 4,
+    filters.Pin: 4,
+    filters.Check: 4,
+    filters.Ancestor: 4,
+    filters.Descendant: 4,
+    filters.Distance: 4,
+    filters.LCA: 4,
+    filters._Legal: 20,  # pylint: disable=protected-access
+    filters.CountMoves: 20,
+    filters.Mate: 20,
+    filters.Stalemate: 20,
+    filters.IdealMate: 40,
+    filters.IdealStaleMate: 40,
+    filters.ModelMate: 40,
+    filters.ModelStalemate: 40,
+    filters.PureMate: 40,
+    filters.PureStalemate: 40,
+}
+
+# Multipliers of the cost of children by class, found by the nearest class
+# in node's mro.  Nodes whose class is not found have multiplier 1.
+MULTIPLIERS = {
+    filters.Line: POSITIONS,
+    filters.Path: POSITIONS,
+    filters.Echo: POSITIONS * POSITIONS,
+    filters.Find: POSITIONS,
+    filters.ConsecutiveMoves: POSITIONS,
+    filters.Flip: 8,
+    filters.Rotate45: 8,
+    filters.Rotate90: 4,
+    filters.FlipColor: 2,
+    filters.FlipHorizontal: 2,
+    filters.FlipVertical: 2,
+    filters.Shift: SQUARES,
+    filters.ShiftHorizontal: 8,
+    filters.ShiftVertical: 8,
+    filters.Square: SQUARES,
+    filters.SquareAll: SQUARES,
+    filters.ExistentialSquareIterator: SQUARES,
+    filters.UniversalSquareIterator: SQUARES,
+    filters.Piece: PIECES,
+    filters.PieceAll: PIECES,
+    filters.ExistentialPieceIterator: PIECES,
+    filters.UniversalPieceIterator: PIECES,
+    filters.Loop: ITERATIONS,
+    filters.While: ITERATIONS,
+}
+
+# The iterators evaluate their first child, the set iterated over, once:
+# the multiplier applies to the children from this index.
+_FIRST_MULTIPLIED_CHILD = {
+    filters.Square: 1,
+    filters.SquareAll: 1,
+    filters.ExistentialSquareIterator: 1,
+    filters.UniversalSquareIterator: 1,
+    filters.Piece: 1,
+    filters.PieceAll: 1,
+    filters.ExistentialPieceIterator: 1,
+    filters.UniversalPieceIterator: 1,
+}
+
+# The (base cost, multiplier, first multiplied child) of classes seen.
+_class_costs = {}
+
+
+def _lookup(table, class_, default):
+    """Return value in table for nearest class in class_ mro or default."""
+    for base in class_.__mro__:
+        if base in table:
+            return table[base]
+    return default
+
+
+def _costs_of_class(class_):
+    """Return (base cost, multiplier, first multiplied child) for class_."""
+    costs = _class_costs.get(class_)
+    if costs is None:
+        costs = (
+            _lookup(BASE_COSTS, class_, DEFAULT_BASE_COST),
+            _lookup(MULTIPLIERS, class_, 1),
+            _lookup(_FIRST_MULTIPLIED_CHILD, class_, 0),
+        )
+        _class_costs[class_] = costs
+    return costs
+
+
+class QueryCost:
+    """Estimated cost of a query and of each subtree of its node tree."""
+
+    __slots__ = ("_breakdown",)
+
+    def __init__(self, breakdown):
+        """Initialise with breakdown, a list of (depth, node, cost) tuples.
+
+        The tuples are in the order of the nodes in the node tree with the
+        QueryContainer first.
+
+        """
+        self._breakdown = breakdown
+
+    @property
+    def breakdown(self):
+        """Return self._breakdown."""
+        return self._breakdown
+
+    @property
+    def total(self):
+        """Return estimated cost of query."""
+        return self._breakdown[0][2]
+
+    @property
+    def category(self):
+        """Return 'cheap', 'moderate', or 'expensive' for total cost."""
+        total = self.total
+        if total < CHEAP_LIMIT:
+            return "cheap"
+        if total < EXPENSIVE_LIMIT:
+            return "moderate"
+        return "expensive"
+
+    @property
+    def subtrees(self):
+        """Return list of (node, cost) for the top level filters."""
+        return [
+            (node, cost) for depth, node, cost in self._breakdown if depth == 2
+        ]
+
+    def as_dict(self):
+        """Return dict of total cost, category, and breakdown by subtree.
+
+        The breakdown is nested dicts of class name, token text, span,
+        cost, and children for the nodes in the tree under the CQL node.
+
+        """
+        root = {"children": []}
+        stack = [root]
+        for depth, node, cost in self._breakdown[2:]:
+            del stack[depth - 1 :]
+            match_ = node.match_
+            subtree = {
+                "class": node.__class__.__name__,
+                "text": "" if match_ is None else match_.group(),
+                "span": None if match_ is None else list(match_.span()),
+                "cost": cost,
+                "children": [],
+            }
+            stack[-1]["children"].append(subtree)
+            stack.append(subtree)
+        return {
+            "total": self.total,
+            "category": self.category,
+            "subtrees": root["children"],
+        }
+
+    def to_json(self, **kwargs):
+        """Return as_dict() as JSON text: kwargs are passed to json.dumps."""
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+def estimate(container):
+    """Return QueryCost for the query parsed in container.
+
+    The container is a QueryContainer returned by parser.parse(), or any
+    of the ways of creating or restoring one such as persist.loads().
+
+    """
+    # The bodies of function calls are included, once for each call, so
+    # the estimate does not depend on sharing function bodies.
+    # pylint: disable=protected-access
+    breakdown = [
+        [depth, node, 0] for depth, node, _ in container._walk_tree(0, None)
+    ]
+
+    # Children follow their parent so the nodes are costed in reverse.
+    children = [[]]
+    for entry in reversed(breakdown):
+        depth = entry[0]
+        while len(children) <= depth + 1:
+            children.append([])
+        costs = children[depth + 1]
+        base, multiplier, first = _costs_of_class(entry[1].__class__)
+        costs.reverse()
+        entry[2] = base + sum(costs[:first]) + multiplier * sum(costs[first:])
+        costs.clear()
+        children[depth].append(entry[2])
+    return QueryCost([tuple(entry) for entry in breakdown])
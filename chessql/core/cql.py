@@ -14,6 +14,7 @@ import re
 
 from . import constants
 from . import parameters
+from . import pattern
 from . import structure
 
 _RANGE = r"(?:\s+\d+(?:\s+\d+)?)?"
@@ -61,6 +62,14 @@ _CQL_PARAMETERS = r")|(".join(
 
 _parameters_re = re.compile(_CQL_PARAMETERS)
 
+# Classes for _parameters_re matches keyed by match_.lastindex values.
+_class_from_group_index = {
+    index: parameters.class_from_token_name[name]
+    for index, name in pattern.map_group_index_to_token_name(
+        _parameters_re
+    ).items()
+}
+
 
 # Make CQL the implicit '{}' for the query.
 # May have a separate class for that when CQL parameters are handled.
@@ -68,6 +77,8 @@ _parameters_re = re.compile(_CQL_PARAMETERS)
 class CQL(structure.CompleteBlock):
     """Represent 'cql' parameters and implicit top level {} filter."""
 
+    __slots__ = ()
+
     _is_allowed_first_object_in_container = True
 
     def place_node_in_tree(self):
@@ -100,18 +111,7 @@ class CQL(structure.CompleteBlock):
         """
         container = self.container
         for token in _parameters_re.finditer(string):
-            classes = {
-                key: parameters.class_from_token_name[key]
-                # pylint R0801 duplicate code.  Ignored.
-                # See tokenmap.FunctionCallEnd.place_node_in_tree().
-                # Shortening the 'raise_...' function name enough would
-                # remove the pylint report after black reformatting.
-                for key, value in token.groupdict().items()
-                if value is not None
-            }
-            container.raise_if_not_single_match_groupdict_entry(token, classes)
-            for value in classes.values():
-                value(
-                    match_=token,
-                    container=container,
-                ).place_node_in_container_parameters()
+            _class_from_group_index[token.lastindex](
+                match_=token,
+                container=container,
+            ).place_node_in_container_parameters()
@@ -163,6 +163,11 @@ class Function(_Definition):
         self._parameters = None
         self._body = []
 
+        # The body prepared for replay at function calls, and the length
+        # of body when prepared.  Set by tokenmap module at first call.
+        self._template = None
+        self._template_body_length = None
+
     @property
     def parameters(self):
         """Return self._parameters."""
@@ -180,6 +185,19 @@ class Function(_Definition):
         """Return self._body."""
         return self._body
 
+    @property
+    def template(self):
+        """Return self._template if body has not changed, otherwise None."""
+        if self._template_body_length != len(self._body):
+            return None
+        return self._template
+
+    @template.setter
+    def template(self, value):
+        """Bind self._template to value prepared from current body."""
+        self._template = value
+        self._template_body_length = len(self._body)
+
 
 def function(name, container):
     """Define name in container as a Function.
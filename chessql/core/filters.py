@@ -30,6 +30,7 @@ from . import cql
 from . import structure
 from . import pattern
 from . import elements
+from . import lexer
 
 BLOCK_COMMENT = "block_comment"
 END_OF_LINE = "end_of_line"
@@ -123,6 +124,8 @@ class MoveParameterImpliesSet(structure.ParameterArgument):
     is refernced by classes and functions that are mentioned.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then adjust parent filter type as required."""
         super().place_node_in_tree()
@@ -144,6 +147,8 @@ class MoveParameterImpliesNumeric(structure.NoArgumentsParameter):
     is refernced by classes and functions that are mentioned.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then adjust parent filter type as required."""
         super().place_node_in_tree()
@@ -165,6 +170,8 @@ class RightCompoundPlace(structure.CQLObject):
     is refernced by classes and functions that are mentioned.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         r"""Override, move to whitespace and set cursor to parent.
 
@@ -225,6 +232,8 @@ class TransformFilterType(structure.CQLObject):
     is refernced by classes and functions that are mentioned.
     """
 
+    __slots__ = ()
+
     @property
     def filter_type(self):
         """Return filter type of last child if BraceLeft completed."""
@@ -254,6 +263,8 @@ class RepeatConstituent(structure.Complete):
     is refernced by classes and functions that are mentioned.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Override to place repeat operator in tree and set cursor to self.
 
@@ -302,6 +313,8 @@ class TypeDesignator(structure.NoArgumentsFilter):
     The '--' filter is a major part of the 'path' filter.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Override, verify parent and set target interrupt to False.
 
@@ -316,6 +329,8 @@ class TypeDesignator(structure.NoArgumentsFilter):
 class String(structure.NoArgumentsFilter):
     """Represent 'string' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -327,6 +342,8 @@ def is_documentation_parameter_accepted_by(node):
 class Documentation(structure.NoArgumentsParameter):
     """Represent 'documentation' parameter to 'sort' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_documentation_parameter_accepted_by(self.parent)
@@ -340,6 +357,8 @@ def is_implicit_search_parameter_accepted_by(node):
 class ImplicitSearchParameter(structure.NoArgumentsParameter):
     """Represent 'implicit search' parameter to 'implicit search' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_implicit_search_parameter_accepted_by(self.parent)
@@ -389,6 +408,8 @@ def string(match_=None, container=None):
 class EndCommentSymbol(structure.CQLObject):
     """Terminate '///' filter and following 'path' filters."""
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Verify no open compound filters after '///' in then delegate."""
         node = container.cursor
@@ -451,6 +472,8 @@ class EndCommentSymbol(structure.CQLObject):
 class EndPaths(structure.CQLObject):
     """Terminate all 'path' filters and the '///' filter if present."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         r"""Override, terminate all 'path' filters and remove from stack.
 
@@ -488,6 +511,8 @@ class EndPaths(structure.CQLObject):
                 break
             node = node.parent
         container.cursor = node.parent
+        # The completed delimiters not yet removed are not open.
+        container.pop_completed_delimiters()
         # Class instances for tokens treated as whitespace have no parent.
         del self.parent.children[-1]
         self.parent = None
@@ -496,6 +521,8 @@ class EndPaths(structure.CQLObject):
 class WhiteSpace(structure.Complete):
     """Store whitespace to account for all text."""
 
+    __slots__ = ()
+
     _is_allowed_first_object_in_container = True
 
     def place_node_in_tree(self):
@@ -509,6 +536,8 @@ class WhiteSpace(structure.Complete):
 class BlockComment(WhiteSpace):
     """Represent a '/*....*/' comment in a *.cql file."""
 
+    __slots__ = ()
+
 
 class LineComment(WhiteSpace):
     r"""Represent a '//.....\n' comment in a *.cql file.
@@ -517,6 +546,8 @@ class LineComment(WhiteSpace):
     but '///....\n' is a CommentSymbol (one of two CQL comment filters).
     """
 
+    __slots__ = ()
+
 
 def _path_or_comment_symbols_found(match_, container):
     """Return set of Path and CommentSymbol classes in ancestors."""
@@ -558,6 +589,8 @@ def line_comment(match_=None, container=None):
 class BraceRight(RightCompoundPlace):
     """Close BraceLeft and record as whitespace."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then verify cursor class is BraceLeft or Plus."""
         super().place_node_in_tree()
@@ -579,6 +612,8 @@ class BraceRight(RightCompoundPlace):
 class FunctionBodyRight(RightCompoundPlace):
     """Close FunctionBodyLeft and record input tokens for replay."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then decrement function_body_count and adjust cursor.
 
@@ -609,16 +644,23 @@ def brace_right(match_=None, container=None):
 
     BraceRight and FunctionBodyRight are the relevant classes.
 
+    The class is decided by the innermost open delimiter, the top of the
+    container's stack once completed delimiters are removed.  The loop
+    normally runs once: it moves past a delimiter only if full() is True
+    before the delimiter is closed, or if '}' is not relevant to that kind
+    of delimiter.
+
     """
-    # Start at container.cursor and move up the parent chain while node
-    # is complete.
-    # The first node which is not complete should be a FunctionBodyLeft or
+    # Look at the open delimiters, innermost first, ignoring any which are
+    # full.
+    # The first which is not full should be a FunctionBodyLeft or
     # BraceLeft instance: NodeError is raised if not.
     # For example in the sequence '{...consecutivemoves(x y)}' a completed
-    # ConsecutiveMoves instance will be at container.cursor and there may
-    # be others in the parent chain depending on the detail of '...'.
-    node = container.cursor
-    while node:
+    # ConsecutiveMoves instance may be in the open delimiters above the
+    # BraceLeft instance.
+    # The container keeps the '(', '{', and '[', nodes which are not yet
+    # closed so the parent chain of container.cursor is not searched.
+    for node in container.innermost_open_delimiters():
         if not node.full():
             if isinstance(node, BraceLeft):
                 if not node.children:
@@ -627,8 +669,10 @@ def brace_right(match_=None, container=None):
                         node.__class__.__name__,
                         "' '{' block must contain at least one filter",
                     )
+                container.close_open_delimiter(node)
                 return BraceRight(match_=match_, container=container)
             if isinstance(node, FunctionBodyLeft):
+                container.close_open_delimiter(node)
                 return FunctionBodyRight(match_=match_, container=container)
             if isinstance(node, ParenthesisLeft):
                 node.raise_nodeerror(
@@ -660,9 +704,8 @@ def brace_right(match_=None, container=None):
                     node.__class__.__name__,
                     "' cannot close parenthesized arguments with '}'",
                 )
-        node = node.parent
     container.raise_nodeerror(
-        "Unexpected ", str(node), " found while trying to match a '}'"
+        "Unexpected None found while trying to match a '}'"
     )
     # A pylint R1710 inconsistent-return-statements report indicates the
     # absence of this statement.
@@ -679,6 +722,8 @@ class WildcardPlus(RepeatConstituent):
     concatenation, and '+' as pattern repetition.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P20
 
 
@@ -692,6 +737,8 @@ class WildcardStar(RepeatConstituent):
     multiplication, and '*' as pattern repetition.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P20
 
 
@@ -705,6 +752,8 @@ class RegexRepeat(RepeatConstituent):
     use the '{2 3}' option.
     """
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Delegate then set details for this instance and add to tree."""
         super().__init__(match_=match_, container=container)
@@ -751,7 +800,8 @@ def regex_repeat(match_=None, container=None):
             return RegexRepeat(match_=match_, container=container)
         node = node.parent
     # Re-evaluation of the pattern match is necessary to get the expected
-    # characters in the match's group.
+    # characters in the match's group.  The lexer pattern for the first
+    # character gives the pattern.cql_re match without trying all elements.
     # Also re-evaluation of the pattern match is necessary with 'function'
     # definitions to prevent three repetitions of the 'BraceLeft Integer'
     # sequence when the function call is expanded from the original matched
@@ -764,15 +814,21 @@ def regex_repeat(match_=None, container=None):
         braceleft = BraceLeft
         braceright = BraceRight
     braceleft(
-        match_=pattern.cql_re.match(match_.string, start, start + 1),
+        match_=lexer.regex_for_character(
+            match_.string[start], version=container.version
+        ).match(match_.string, start, start + 1),
         container=container,
     ).place_node_in_tree()
     Integer(
-        match_=pattern.cql_re.match(match_.string, start + 1, end - 1),
+        match_=lexer.regex_for_character(
+            match_.string[start + 1], version=container.version
+        ).match(match_.string, start + 1, end - 1),
         container=container,
     ).place_node_in_tree()
     return braceright(
-        match_=pattern.cql_re.match(match_.string, end - 1, end),
+        match_=lexer.regex_for_character(
+            match_.string[end - 1], version=container.version
+        ).match(match_.string, end - 1, end),
         container=container,
     )
 
@@ -780,6 +836,8 @@ def regex_repeat(match_=None, container=None):
 class FunctionBodyLeft(structure.BlockLeft):
     """Represent '{' body of function filter definition."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then increment function_body_count.
 
@@ -793,12 +851,12 @@ class FunctionBodyLeft(structure.BlockLeft):
 class BraceLeft(structure.BlockLeft):
     """Represent '{' compound filter of type determined by children."""
 
+    __slots__ = ()
+
     @property
     def filter_type(self):
         """Return filter type of last child if BraceLeft completed."""
-        if self.completed:
-            return self.children[-1].filter_type
-        return super().filter_type
+        return _nested_block_filter_type(self)
 
     def is_left_brace_or_parenthesis(self):
         """Override and return True."""
@@ -818,6 +876,8 @@ def brace_left(match_=None, container=None):
 class TargetParenthesisLeft(structure.BlockLeft):
     """Represent '(' target conditions in '--' or '[x]' filter."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Place as child of '--' or '[x]' if possible."""
         node = self.container.cursor
@@ -826,6 +886,7 @@ class TargetParenthesisLeft(structure.BlockLeft):
                 node.children.append(self.parent.children.pop())
                 self.parent = node
                 self.container.cursor = self
+                self.container.push_open_delimiter(self)
                 return
             node = node.parent
         super().place_node_in_tree()
@@ -840,6 +901,8 @@ class LineConstituentParenthesisLeft(structure.BlockLeft):
     '<--' symbols allowed in the 'line' filter.
     """
 
+    __slots__ = ()
+
     def is_left_brace_or_parenthesis(self):
         """Override and return True."""
         return True
@@ -850,6 +913,8 @@ class LineConstituentParenthesisLeft(structure.BlockLeft):
 class ConstituentParenthesisLeft(structure.BlockLeft):
     """Represent '(' top level chain constituent in 'path' filter."""
 
+    __slots__ = ()
+
     def is_left_brace_or_parenthesis(self):
         """Override and return True."""
         return True
@@ -868,15 +933,15 @@ class ParenthesisLeft(structure.BlockLeft):
     See ConstituentParenthesisLeft for '(' as top level chain constituent.
     """
 
+    __slots__ = ()
+
     @property
     def filter_type(self):
         """Return filter type of last child if ParenthesisLeft completed.
 
         There will be only one child in the completed filter.
         """
-        if self.completed and len(self.children) == 1:
-            return self.children[-1].filter_type
-        return super().filter_type
+        return _nested_block_filter_type(self)
 
     def is_left_brace_or_parenthesis(self):
         """Override and return True."""
@@ -892,6 +957,26 @@ class ParenthesisLeft(structure.BlockLeft):
             )
 
 
+def _nested_block_filter_type(node):
+    """Return filter type of node, a BraceLeft or ParenthesisLeft instance.
+
+    A completed '{' or '(' has the filter type of its last child, which is
+    often another '{' or '('.  The chain is followed by a loop so deeply
+    nested blocks do not reach Python's recursion limit.
+
+    """
+    while True:
+        if isinstance(node, BraceLeft):
+            if not node.completed:
+                return node._filter_type
+        elif isinstance(node, ParenthesisLeft):
+            if not (node.completed and len(node.children) == 1):
+                return node._filter_type
+        else:
+            return node.filter_type
+        node = node.children[-1]
+
+
 # There need to be three kinds of '(' apart from parenthesized arguments.
 #   Precedence control.
 #   Chain consituents in 'path' filter.  'path (check)'.
@@ -941,6 +1026,8 @@ class LineConstituentParenthesisRight(RightCompoundPlace):
     '<--' symbols allowed in the 'line' filter.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then verify cursor class.
 
@@ -960,6 +1047,8 @@ class LineConstituentParenthesisRight(RightCompoundPlace):
 class ConstituentParenthesisRight(RightCompoundPlace):
     """Close ConstituentParenthesisLeft and record as whitespace."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then verify cursor class is ConstituentParenthesisLeft."""
         super().place_node_in_tree()
@@ -969,6 +1058,8 @@ class ConstituentParenthesisRight(RightCompoundPlace):
 class ParenthesisRight(RightCompoundPlace):
     """Close ParenthesisLeft and record as whitespace."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then verify cursor class is ParenthesisLeft."""
         super().place_node_in_tree()
@@ -981,6 +1072,8 @@ class ParenthesizedArgumentsEnd(RightCompoundPlace):
     ParenthesizedArgumentsEnd should not be instatiated itself.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then verify cursor class is ParenthesizedArguments.
 
@@ -997,6 +1090,8 @@ class ParenthesizedArgumentsEnd(RightCompoundPlace):
 class TargetConditionsEnd(structure.CQLObject):
     """Close TargetParenthesisLeft subclass and record as whitespace."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then set cursor to parent and collect ')' as whitespace.
 
@@ -1032,6 +1127,8 @@ def is_find_backward_parameter_accepted_by(node):
 class FindBackward(structure.NoArgumentsParameter):
     """Represent '<--' parameter to 'find' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_find_backward_parameter_accepted_by(self.parent)
@@ -1051,6 +1148,8 @@ class LineArrow(structure.CQLObject):
     in filters module.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P10
 
     def place_node_in_tree(self):
@@ -1137,6 +1236,8 @@ class ArrowBackward(LineArrow, structure.Argument):
     since it is allowed only in the 'line' filter.
     """
 
+    __slots__ = ()
+
 
 def arrow_backward(match_=None, container=None):
     """Return FindBackward or ArrowBackward instance."""
@@ -1159,28 +1260,38 @@ class ArrowForward(LineArrow, structure.Argument):
     since it is allowed only in the 'line' filter.
     """
 
+    __slots__ = ()
+
 
 class AfterEq(structure.ComparePosition, structure.InfixRight):
     """Represent '[>=]' (≽) position filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30  # From 'descendant'.
 
 
 class AfterNE(structure.ComparePosition, structure.InfixRight):
     """Represent '[>]' (≻) position filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30  # From 'descendant'
 
 
 class BeforeEq(structure.ComparePosition, structure.InfixRight):
     """Represent '[<=]' (≼) position filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30  # From 'ancestor'
 
 
 class BeforeNE(structure.ComparePosition, structure.InfixRight):
     """Represent '[<]' (≺) position filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30  # from 'ancestor'.
 
 
@@ -1193,6 +1304,8 @@ class TakeII(structure.DashOrTake):
     equivalent to 'a-h1-8'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Prevent other filters taking implicit arguments by precedence.
@@ -1220,6 +1333,8 @@ class TakeLI(structure.DashOrTake):
     G is not the RHS.  The RHS is the '.' filter, equivalent to 'a-h1-8'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Allow other filters to take lhs argument by precedence.
@@ -1252,6 +1367,8 @@ class TakeIR(structure.DashOrTake):
     and G is the RHS.  The LHS is the '.' filter, equivalent to 'a-h1-8'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Prevent other filters taking implicit lhs argument by precedence.
@@ -1279,6 +1396,8 @@ class TakeLR(structure.DashOrTake):
     the LHS and G is the RHS.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Allow other filters to take lhs and rhs argument by precedence.
@@ -1331,6 +1450,8 @@ class CommentSymbol(structure.BlockLeft):
     'path' filter which is terminated by a blank line.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     def __init__(self, match_=None, container=None):
@@ -1358,6 +1479,8 @@ class CommentSymbol(structure.BlockLeft):
 class AttackArrow(structure.MoveInfix):
     """Represent '->' (→) set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
     def _verify_children_and_set_own_types(self):
@@ -1375,6 +1498,8 @@ class AttackArrow(structure.MoveInfix):
 class AttackedArrow(structure.MoveInfix):
     """Represent '<-' (←) set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
     def _verify_children_and_set_own_types(self):
@@ -1401,6 +1526,8 @@ class DashII(structure.DashOrTake):
     equivalent to 'a-h1-8'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Prevent other filters taking implicit arguments by precedence.
@@ -1430,6 +1557,8 @@ class DashLI(structure.DashOrTake):
     G is not the RHS.  The RHS is the '.' filter, equivalent to 'a-h1-8'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Allow other filters to take lhs argument by precedence.
@@ -1464,6 +1593,8 @@ class DashIR(structure.DashOrTake):
     and G is the RHS.  The LHS is the '.' filter, equivalent to 'a-h1-8'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Prevent other filters taking implicit lhs argument by precedence.
@@ -1493,6 +1624,8 @@ class DashLR(structure.DashOrTake):
     LHS and G is the RHS.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Allow other filters to take lhs and rhs argument by precedence.
@@ -1550,6 +1683,8 @@ class RegexMatch(structure.InfixLeft):
     Both arguments of '~~' are quoted strings.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
     _precedence = cqltypes.Precedence.P220
 
@@ -1568,6 +1703,8 @@ class RegexCapturedGroup(structure.CQLObject):
     An example of the variable name is '\0'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -1577,30 +1714,40 @@ class RegexCapturedGroupIndex(structure.CQLObject):
     An example of the index variable name is '\-0'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class EmptySquares(structure.CQLObject):
     """Represent '[]' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class LE(structure.Compare, structure.InfixRight):
     """Represent '<=' ('≤') numeric filter or string filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P80
 
 
 class GE(structure.Compare, structure.InfixRight):
     """Represent '>=' ('≥') numeric filter or string filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P80
 
 
 class Eq(structure.CompareSet, structure.Compare, structure.InfixRight):
     """Represent '==' numeric filter or string filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P80
     _comparable_filter_types = (
         cqltypes.FilterType.SET
@@ -1613,6 +1760,8 @@ class Eq(structure.CompareSet, structure.Compare, structure.InfixRight):
 class NE(structure.CompareSet, structure.Compare, structure.InfixRight):
     """Represent '!=' ('≠') numeric filter or string filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P80
     _comparable_filter_types = (
         cqltypes.FilterType.SET
@@ -1624,6 +1773,8 @@ class NE(structure.CompareSet, structure.Compare, structure.InfixRight):
 class AssignPlus(structure.InfixLeft):
     """Represent '+=' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P90
 
@@ -1655,6 +1806,8 @@ class AssignPlus(structure.InfixLeft):
 class AssignMinus(structure.ModifyAssign, structure.InfixLeft):
     """Represent '-=' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P90
 
@@ -1662,6 +1815,8 @@ class AssignMinus(structure.ModifyAssign, structure.InfixLeft):
 class AssignDivide(structure.ModifyAssign, structure.InfixLeft):
     """Represent '/=' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P90
 
@@ -1669,6 +1824,8 @@ class AssignDivide(structure.ModifyAssign, structure.InfixLeft):
 class AssignMultiply(structure.ModifyAssign, structure.InfixLeft):
     """Represent '*=' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P90
 
@@ -1676,6 +1833,8 @@ class AssignMultiply(structure.ModifyAssign, structure.InfixLeft):
 class AssignModulus(structure.ModifyAssign, structure.InfixLeft):
     """Represent '%=' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P90
 
@@ -1683,6 +1842,8 @@ class AssignModulus(structure.ModifyAssign, structure.InfixLeft):
 class Abs(structure.Argument):
     """Represent 'abs' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P90
 
@@ -1706,6 +1867,8 @@ class All(structure.NoArgumentsParameter):
         square ('all' caught in SQUARE pattern)
     """
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_all_parameter_accepted_by(self.parent)
@@ -1728,6 +1891,8 @@ class Ancestor(structure.ParenthesizedArguments):
     instead.  It is called 'before_ne' here.
     """
 
+    __slots__ = ()
+
     # Deduced from '-parse' of following query,
     # v=ancestor(position 1 position 2)
     # w="er"
@@ -1751,6 +1916,8 @@ class Ancestor(structure.ParenthesizedArguments):
 class And(structure.InfixLeft):
     """Represent 'and' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P50
 
@@ -1758,6 +1925,8 @@ class And(structure.InfixLeft):
 class AnyDirection(structure.Argument):
     """Represent 'anydirection' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -1765,6 +1934,8 @@ class AnyDirection(structure.Argument):
 class AnyDirectionParameter(structure.DirectionParameter):
     """Represent 'anydirection' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def anydirection(match_=None, container=None):
     """Return Up or UpParameter instance."""
@@ -1776,6 +1947,8 @@ def anydirection(match_=None, container=None):
 class ASCII(structure.Argument):
     """Represent 'ascii' numeric filter or string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC | cqltypes.FilterType.STRING
     _precedence = cqltypes.Precedence.P100
 
@@ -1803,6 +1976,8 @@ class ASCII(structure.Argument):
 class Assert(structure.Argument):
     """Represent 'assert' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -1810,11 +1985,12 @@ class Assert(structure.Argument):
 class Atomic(structure.Complete, structure.VariableName):
     """Represent variable with 'atomic' prefix."""
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Delegate then register the variable name."""
         super().__init__(match_=match_, container=container)
-        groupdict = match_.groupdict()
-        self.name = groupdict["atomic"]
+        self.name = match_.group("atomic")
         self._register_variable_type(cqltypes.VariableType.ANY)
         self._set_persistence_type(
             cqltypes.PersistenceType.ATOMIC | cqltypes.PersistenceType.LOCAL,
@@ -1834,6 +2010,8 @@ class Atomic(structure.Complete, structure.VariableName):
 class AttackedBy(structure.InfixLeft):
     """Represent 'attackedby' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P190
 
@@ -1841,6 +2019,8 @@ class AttackedBy(structure.InfixLeft):
 class Attacks(structure.InfixLeft):
     """Represent 'attacks' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P190
 
@@ -1848,6 +2028,8 @@ class Attacks(structure.InfixLeft):
 class Between(structure.ParenthesizedArguments):
     """Represent 'between' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     # Between is only subclass of ParenthesizedArguments which overrides
     # _child_count: is it necessary?
@@ -1880,18 +2062,24 @@ class Between(structure.ParenthesizedArguments):
 class Black(structure.CQLObject):
     """Represent 'black' numeric filter with value -1."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class BTM(structure.NoArgumentsFilter):
     """Represent 'btm' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class Capture(MoveParameterImpliesSet):
     """Represent 'capture' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -1900,12 +2088,16 @@ class Capture(MoveParameterImpliesSet):
 class Castle(structure.NoArgumentsFilter):
     """Represent 'castle' logical filter or parameter to 'move' filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class CastleParameter(structure.NoArgumentsParameter):
     """Represent 'castle' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -1935,24 +2127,32 @@ def castle(match_=None, container=None):
 class Check(structure.NoArgumentsFilter):
     """Represent 'check' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class ChildParentheses(structure.ParenthesizedArguments):
     """Represent 'child' position filter with argument."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
 
 
 class Child(structure.NoArgumentsFilter):
     """Represent 'child' position filter without argument."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
 
 
 class ColorType(structure.Argument):
     """Represent 'colortype' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P150
 
@@ -1974,6 +2174,8 @@ class Comment(structure.Argument):
     next '-->' or '<--'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -1982,6 +2184,8 @@ class Comment(structure.Argument):
 class CommentParameter(structure.Argument):
     """Represent 'comment' filter immediately after 'move' filter."""
 
+    __slots__ = ()
+
     _is_parameter = True
     _filter_type = cqltypes.FilterType.LOGICAL
 
@@ -2014,6 +2218,8 @@ class CommentParentheses(structure.ParenthesizedArguments):
     next '-->' or '<--'.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -2022,6 +2228,8 @@ class CommentParentheses(structure.ParenthesizedArguments):
 class CommentParenthesesParameter(structure.ParenthesizedArguments):
     """Represent 'comment' filter immediately after 'move' filter."""
 
+    __slots__ = ()
+
     _is_parameter = True
     _filter_type = cqltypes.FilterType.LOGICAL
 
@@ -2044,12 +2252,16 @@ def comment_parentheses(match_=None, container=None):
 class ConnectedPawns(structure.NoArgumentsFilter):
     """Represent 'connectedpawns' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class ConsecutiveMoves(structure.ParenthesizedArguments):
     """Represent 'consecutivemoves' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
     def place_node_in_tree(self):
@@ -2136,6 +2348,8 @@ class Count(structure.NoArgumentsParameter):
     either the 'legal' or the 'pseudoleagal' is also present.
     """
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_count_parameter_accepted_by(self.parent)
@@ -2164,6 +2378,8 @@ class Count(structure.NoArgumentsParameter):
 class CountMoves(structure.Argument, structure.LeftParenthesisInfix):
     """Represent 'countmoves' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
     def is_countmoves(self):
@@ -2193,6 +2409,8 @@ class CountMoves(structure.Argument, structure.LeftParenthesisInfix):
 class CurrentMove(structure.Argument):
     """Represent 'currentmove' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     @property
@@ -2222,18 +2440,24 @@ class CurrentMove(structure.Argument):
 class CurrentPosition(structure.NoArgumentsFilter):
     """Represent 'currentposition' position filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
 
 
 class CurrentTransform(structure.NoArgumentsFilter):
     """Represent 'currenttransform' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class Dark(structure.Argument):
     """Represent 'dark' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -2243,18 +2467,24 @@ class Dark(structure.Argument):
 class Date(structure.ImplicitSearchFilter):
     """Represent 'date' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class Depth(structure.NoArgumentsFilter):
     """Represent 'depth' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class Descendant(structure.ParenthesizedArguments):
     """Represent 'descendant' numeric filter."""
 
+    __slots__ = ()
+
     # Deduced from '-parse' of following query,
     # v=descendant(position 2 position 1)
     # w="er"
@@ -2282,6 +2512,8 @@ class Descendant(structure.ParenthesizedArguments):
 class Diagonal(structure.Argument):
     """Represent 'diagonal' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -2289,6 +2521,8 @@ class Diagonal(structure.Argument):
 class DiagonalParameter(structure.DirectionParameter):
     """Represent 'diagonal' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def diagonal(match_=None, container=None):
     """Return Diagonal or DiagonalParameter instance."""
@@ -2311,6 +2545,8 @@ class Dictionary(structure.Complete, structure.DictionaryName):
     However 'a2' does indicate the key type is set filter.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _key_type = None
     _value_type = None
@@ -2321,8 +2557,8 @@ class Dictionary(structure.Complete, structure.DictionaryName):
 
         # 'dictionary <name>' or '<name>' caught by VARIABLE pattern when
         # <name> already defined as a dictionary.
-        groupdict = match_.groupdict()
-        self.name = groupdict["dictionary"] or groupdict["variable"]
+        group = match_.group
+        self.name = group("dictionary") or group("variable")
 
         self._raise_if_name_invalid(cqltypes.Dictionary)
         if self.name not in container.definitions:
@@ -2370,8 +2606,7 @@ class Dictionary(structure.Complete, structure.DictionaryName):
         super().place_node_in_tree()
         container = self.container
         cqltypes.dictionary(
-            self.match_.groupdict()["dictionary"]
-            or self.match_.groupdict()["variable"],
+            self.match_.group("dictionary") or self.match_.group("variable"),
             container,
         )
         # This test implies either Echo or Variable detection needs to be
@@ -2460,6 +2695,8 @@ class Dictionary(structure.Complete, structure.DictionaryName):
 class Distance(structure.ParenthesizedArguments):
     """Represent 'distance' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     # See Ancestor too.
     # Treated as 'distance (' not 'distance' then '(' and ... ')'.
@@ -2469,12 +2706,16 @@ class Distance(structure.ParenthesizedArguments):
 class DoubledPawns(structure.NoArgumentsFilter):
     """Represent 'doubledpawns' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class Down(structure.Argument):
     """Represent 'down' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -2482,6 +2723,8 @@ class Down(structure.Argument):
 class DownParameter(structure.DirectionParameter):
     """Represent 'down' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def down(match_=None, container=None):
     """Return Down or DownParameter instance."""
@@ -2511,6 +2754,8 @@ class Echo(structure.Argument):
     'position' filters cause 'echo' to be a 'logical' filter.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
     @property
@@ -2551,6 +2796,8 @@ class Echo(structure.Argument):
 class ECO(structure.ImplicitSearchFilter):
     """Represent 'eco' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -2570,6 +2817,8 @@ class ECO(structure.ImplicitSearchFilter):
 class Element(structure.MoveInfix):
     """Represent the '∊' set filter. (ASCII '[element]')."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET | cqltypes.FilterType.LOGICAL
 
     def _verify_children_and_set_own_types(self):
@@ -2598,6 +2847,8 @@ class Element(structure.MoveInfix):
 class Elo(structure.NoArgumentsFilter):
     """Represent 'elo', 'elo black, and 'elo white', numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
@@ -2610,6 +2861,8 @@ class Else(structure.Argument):
     'else' introduces the optional 'else alternative' part.
     """
 
+    __slots__ = ()
+
     _precedence = (
         cqltypes.Precedence.P30
     )  # Does this matter?  Reference is 'if/then/else'.
@@ -2654,12 +2907,16 @@ class Else(structure.Argument):
 class EnPassant(structure.NoArgumentsFilter):
     """Represent 'enpassant' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class EnPassantParameter(structure.NoArgumentsParameter):
     """Represent 'enpassant' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -2691,12 +2948,16 @@ def enpassant(match_=None, container=None):
 class EnPassantSquare(structure.NoArgumentsFilter):
     """Represent 'enpassantsquare' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class EnPassantSquareParameter(MoveParameterImpliesSet):
     """Represent 'enpassantsquare' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -2728,6 +2989,8 @@ def enpassantsquare(match_=None, container=None):
 class EventDate(structure.ImplicitSearchFilter):
     """Represent 'eventdate' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -2736,6 +2999,8 @@ class EventDate(structure.ImplicitSearchFilter):
 class Event(structure.ImplicitSearchFilter):
     """Represent 'event' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -2747,6 +3012,8 @@ class Event(structure.ImplicitSearchFilter):
 class False_(structure.NoArgumentsFilter):
     """Represent 'false' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -2756,6 +3023,8 @@ class False_(structure.NoArgumentsFilter):
 class FEN(structure.ImplicitSearchFilter):
     """Represent 'fen' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
     def _verify_children_and_set_own_types(self):
@@ -2837,6 +3106,8 @@ class FEN(structure.ImplicitSearchFilter):
 class File(structure.Argument):
     """Represent 'file' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P150
 
@@ -2857,6 +3128,8 @@ class Find(structure.Argument):
     The absence of both 'all' and a range make 'find' a position filter.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
     _precedence = cqltypes.Precedence.P30
 
@@ -2885,6 +3158,8 @@ def is_firstmatch_parameter_accepted_by(node):
 class FirstMatch(structure.NoArgumentsParameter):
     """Represent 'firstmatch' parameter to 'line' and 'path' filters."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_firstmatch_parameter_accepted_by(self.parent)
@@ -2894,6 +3169,8 @@ class FirstMatch(structure.NoArgumentsParameter):
 class FlipColor(TransformFilterType, structure.Argument):
     """Represent 'flipcolor' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
@@ -2901,6 +3178,8 @@ class FlipColor(TransformFilterType, structure.Argument):
 class FlipHorizontal(TransformFilterType, structure.Argument):
     """Represent 'fliphorizontal' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
@@ -2908,6 +3187,8 @@ class FlipHorizontal(TransformFilterType, structure.Argument):
 class FlipVertical(TransformFilterType, structure.Argument):
     """Represent 'flipvertical' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
@@ -2915,6 +3196,8 @@ class FlipVertical(TransformFilterType, structure.Argument):
 class Flip(TransformFilterType, structure.Argument):
     """Represent 'flip' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
@@ -2926,6 +3209,8 @@ def is_focus_capture_parameter_accepted_by(node):
 class FocusCapture(structure.ParameterArgument):
     """Represent 'focus capture' parameter of 'path' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_focus_capture_parameter_accepted_by(self.parent)
@@ -2939,6 +3224,8 @@ def is_focus_parameter_accepted_by(node):
 class Focus(structure.ParameterArgument):
     """Represent 'focus' parameter of 'path' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_focus_parameter_accepted_by(self.parent)
@@ -2955,13 +3242,15 @@ class ExistentialSquareVariable(structure.Complete, structure.VariableName):
     The value of an existential square variable is a Set filter.
     """
 
+    __slots__ = ()
+
     # Not in table of precedence: probably a typo so commented.
     # _precedence = cqltypes.Precedence.P30
 
     def __init__(self, match_=None, container=None):
         """Delegate then register set variable name for existence filter."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["existential_square_variable"]
+        self.name = match_.group("existential_square_variable")
         self._register_variable_type(cqltypes.VariableType.SET)
         self.set_variable_types(
             cqltypes.VariableType.SET, cqltypes.FilterType.SET
@@ -2977,6 +3266,8 @@ class ExistentialSquareVariable(structure.Complete, structure.VariableName):
 class ExistentialSquareIterator(structure.Argument):
     """Represent implied 'existential square iteration' filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _child_count = 2
 
@@ -3001,13 +3292,15 @@ class ExistentialPieceVariable(structure.Complete, structure.VariableName):
     The value of an existential piece variable is a Set filter.
     """
 
+    __slots__ = ()
+
     # Not in table of precedence: probably a typo so commented.
     # _precedence = cqltypes.Precedence.P30
 
     def __init__(self, match_=None, container=None):
         """Delegate then register piece variable name for existence filter."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["existential_piece_variable"]
+        self.name = match_.group("existential_piece_variable")
         self._register_variable_type(cqltypes.VariableType.PIECE)
         self.set_variable_types(
             cqltypes.VariableType.PIECE, cqltypes.FilterType.SET
@@ -3023,6 +3316,8 @@ class ExistentialPieceVariable(structure.Complete, structure.VariableName):
 class ExistentialPieceIterator(structure.Argument):
     """Represent implied 'existential piece iteration' filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _child_count = 2
 
@@ -3047,12 +3342,14 @@ class UniversalSquareVariable(structure.Complete, structure.VariableName):
     The value of a universal square variable is a Set filter.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
     def __init__(self, match_=None, container=None):
         """Delegate then register set variable name for universal filter."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["universal_square_variable"]
+        self.name = match_.group("universal_square_variable")
         self._register_variable_type(cqltypes.VariableType.SET)
         self.set_variable_types(
             cqltypes.VariableType.SET, cqltypes.FilterType.SET
@@ -3068,6 +3365,8 @@ class UniversalSquareVariable(structure.Complete, structure.VariableName):
 class UniversalSquareIterator(structure.Argument):
     """Represent implied 'universal square iteration' filter."""
 
+    __slots__ = ()
+
     _child_count = 2
 
     def place_node_in_tree(self):
@@ -3091,12 +3390,14 @@ class UniversalPieceVariable(structure.Complete, structure.VariableName):
     The value of a universal piece variable is a Set filter.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
     def __init__(self, match_=None, container=None):
         """Delegate then register piece variable name for universal filter."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["universal_piece_variable"]
+        self.name = match_.group("universal_piece_variable")
         self._register_variable_type(cqltypes.VariableType.PIECE)
         self.set_variable_types(
             cqltypes.VariableType.PIECE, cqltypes.FilterType.SET
@@ -3112,6 +3413,8 @@ class UniversalPieceVariable(structure.Complete, structure.VariableName):
 class UniversalPieceIterator(structure.Argument):
     """Represent implied 'universal piece iteration' filter."""
 
+    __slots__ = ()
+
     _child_count = 2
 
     def place_node_in_tree(self):
@@ -3127,6 +3430,8 @@ class UniversalPieceIterator(structure.Argument):
 class From(structure.NoArgumentsFilter):
     """Represent 'from' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
@@ -3142,6 +3447,8 @@ class FromParameter(MoveParameterImpliesSet):
     'pin from' and 'pin from from from' give a syntax error.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P200  # 'pin' filter only.
 
     def is_parameter_accepted_by_filter(self):
@@ -3167,6 +3474,8 @@ def from_(match_=None, container=None):
 class FromDefaultPinParameter(FromParameter):
     """Represent default 'from' parameter to 'pin' filter."""
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Initialise node parent and children attributes."""
         super().__init__(match_=match_, container=container)
@@ -3185,6 +3494,8 @@ class Function(structure.Name, structure.Argument):
     when evaluated as a function call.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
     def __init__(self, match_=None, container=None):
@@ -3228,6 +3539,8 @@ class FunctionCall(structure.Name, structure.ParenthesizedArguments):
     The filter type is the filter type of the compound filter argument.
     """
 
+    __slots__ = ("formal",)
+
     # See Ancestor too.
     # Treated as '<function> (' not '<function>' then '(' and ... ')'.
     # _precedence = cqltypes.Precedence.P30
@@ -3245,7 +3558,7 @@ class FunctionCall(structure.Name, structure.ParenthesizedArguments):
     def __init__(self, match_=None, container=None):
         """Delegate then register the function and parameter names."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["function_call"]
+        self.name = match_.group("function_call")
         self._raise_if_name_invalid(cqltypes.Function)
         self._raise_if_function_not_defined()
         self.formal = {}
@@ -3289,7 +3602,7 @@ def function_call(match_=None, container=None):
     at end of token.
 
     """
-    name = match_.groupdict()["function_call"]
+    name = match_.group("function_call")
     if isinstance(container.cursor, AssignPromotion):
         if container.function_body_cursor is not None:
             var = Variable(match_=match_, container=container)
@@ -3329,12 +3642,16 @@ class GameNumber(structure.NoArgumentsFilter):
     The 'gamenumber' keyword also appears in the parameter module.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class Horizontal(structure.Argument):
     """Represent 'horizontal' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -3342,6 +3659,8 @@ class Horizontal(structure.Argument):
 class HorizontalParameter(structure.DirectionParameter):
     """Represent 'horizontal' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def horizontal(match_=None, container=None):
     """Return Horizontal or HorizontalParameter instance."""
@@ -3353,12 +3672,16 @@ def horizontal(match_=None, container=None):
 class IdealMate(structure.NoArgumentsFilter):
     """Represent 'idealmate' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class IdealStaleMate(structure.NoArgumentsFilter):
     """Represent 'idealstalemate' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
@@ -3376,6 +3699,8 @@ class If(structure.Argument):
     At version 6.2 the 'then' keyword is deprecated.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
     @property
@@ -3424,24 +3749,32 @@ class If(structure.Argument):
 class IndexOf(structure.ParenthesizedArguments):
     """Represent 'indexof' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class InitialPosition(structure.NoArgumentsFilter):
     """Represent 'initialposition' position filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
 
 
 class Initial(structure.NoArgumentsFilter):
     """Represent 'initial' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class Int(structure.Argument):
     """Represent 'int' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P100
 
@@ -3449,6 +3782,8 @@ class Int(structure.Argument):
 class InAll(structure.NoArgumentsParameter):
     """Represent 'in all' parameter of 'echo' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Echo)
@@ -3457,6 +3792,8 @@ class InAll(structure.NoArgumentsParameter):
 class In(structure.InfixLeft):
     """Represent 'in' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P70
 
@@ -3472,6 +3809,8 @@ class In(structure.InfixLeft):
 class InParameter(structure.NoArgumentsParameter):
     """Represent ''in' parameter to 'piece' and 'square' filters."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P150
 
     def is_parameter_accepted_by_filter(self):
@@ -3497,16 +3836,22 @@ def in_(match_=None, container=None):
 class IsBound(structure.BindArgument):
     """Represent 'isbound' logical filter."""
 
+    __slots__ = ()
+
 
 class IsolatedPawns(structure.NoArgumentsFilter):
     """Represent 'isolatedpawns' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class IsUnbound(structure.BindArgument):
     """Represent 'isunbound' logical filter."""
 
+    __slots__ = ()
+
 
 def is_keepallbest_parameter_accepted_by(node):
     """Return True if node accepts keepallbest parameter."""
@@ -3516,6 +3861,8 @@ def is_keepallbest_parameter_accepted_by(node):
 class KeepAllBest(structure.NoArgumentsParameter):
     """Represent 'keepallbest' parameter of 'path' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_keepallbest_parameter_accepted_by(self.parent)
@@ -3524,6 +3871,8 @@ class KeepAllBest(structure.NoArgumentsParameter):
 class LastGameNumber(structure.NoArgumentsFilter):
     """Represent 'lastgamenumber' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
@@ -3538,6 +3887,8 @@ def is_lastposition_parameter_accepted_by(node):
 class LastPosition(structure.NoArgumentsParameter):
     """Represent 'lastposition' parameter to 'line' and 'path' filters."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_lastposition_parameter_accepted_by(self.parent)
@@ -3556,6 +3907,8 @@ class LastPosition(structure.NoArgumentsParameter):
 class LCA(structure.ParenthesizedArguments):
     """Represent 'lca' position filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
     # See Ancestor too.
     # Treated as 'lca (' not 'lca' then '(' and ... ')'.
@@ -3565,6 +3918,8 @@ class LCA(structure.ParenthesizedArguments):
 class Left(structure.Argument):
     """Represent 'left' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -3572,6 +3927,8 @@ class Left(structure.Argument):
 class LeftParameter(structure.DirectionParameter):
     """Represent 'left' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def left(match_=None, container=None):
     """Return Left or LeftParameter instance."""
@@ -3583,6 +3940,8 @@ def left(match_=None, container=None):
 class _Legal(structure.LeftParenthesisInfix):
     """Provide shared behaviour of Legal and Pseudolegal filters."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
     def _verify_children_and_set_own_types(self):
@@ -3615,10 +3974,14 @@ class _Legal(structure.LeftParenthesisInfix):
 class Legal(structure.Argument, _Legal):
     """Represent 'legal' set filter."""
 
+    __slots__ = ()
+
 
 class LegalParameter(MoveParameterImpliesNumeric):
     """Represent 'legal' parameter of 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -3648,6 +4011,8 @@ def legal(match_=None, container=None):
 class Light(structure.Argument):
     """Represent 'light' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -3655,6 +4020,8 @@ class Light(structure.Argument):
 class _LineOrMove(structure.CompleteParameterArguments):
     """Represent shared behaviour of 'line' and 'move' filters."""
 
+    __slots__ = ()
+
     def _raise_if_primary_and_secondary_parameter_present(self):
         """Raise NodeError if both 'primary' and 'secondary present."""
         if (
@@ -3676,6 +4043,8 @@ class _LineOrMove(structure.CompleteParameterArguments):
 class Line(_LineOrMove):
     """Represent 'line' numeric or position filter."""
 
+    __slots__ = ()
+
     # The 'lastposition' parameter changes the filter type to 'position'.
     _filter_type = cqltypes.FilterType.NUMERIC
     # CQL-6.1 describes '-->' and '<--' as symbols rather than parameters
@@ -3723,6 +4092,8 @@ class Local(structure.CQLObject):
     and appearance elsewhere is an error.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then raise NodeError because bare 'local' not allowed."""
         super().place_node_in_tree()
@@ -3732,6 +4103,8 @@ class Local(structure.CQLObject):
 class Loop(structure.Argument):
     """Represent 'loop' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P30
 
@@ -3739,6 +4112,8 @@ class Loop(structure.Argument):
 class LowerCase(structure.Argument):
     """Represent 'lowercase' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
     _precedence = cqltypes.Precedence.P120
 
@@ -3752,6 +4127,8 @@ class MainDiagonal(structure.Argument):
     'maindiagonal' is described in CQLi documentation.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -3765,6 +4142,8 @@ class MainDiagonalParameter(structure.DirectionParameter):
     'maindiagonal' is described in CQLi documentation.
     """
 
+    __slots__ = ()
+
 
 def main_diagonal(match_=None, container=None):
     """Return MainDiagonal or MainDiagonalParameter instance."""
@@ -3776,6 +4155,8 @@ def main_diagonal(match_=None, container=None):
 class MainLine(structure.NoArgumentsFilter):
     """Represent 'mainline' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -3787,6 +4168,8 @@ def mainline(match_=None, container=None):
 class MakeSquareParentheses(structure.ParenthesizedArguments):
     """Represent 'makesquare' set filter for parenthesized arguments."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     # See Ancestor too.
     # Treated as 'makesquare (' not 'makesquare' then '(' and ... ')'.
@@ -3806,6 +4189,8 @@ class MakeSquareParentheses(structure.ParenthesizedArguments):
 class MakeSquareString(structure.Argument):
     """Represent 'makesquare' set filter for string argument."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P90
 
@@ -3813,6 +4198,8 @@ class MakeSquareString(structure.Argument):
 class Mate(structure.NoArgumentsFilter):
     """Represent 'mate' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -3824,12 +4211,16 @@ def is_max_parameter_accepted_by(node):
 class Max(structure.MaxOrMin):
     """Represent 'max' numeric or string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC | cqltypes.FilterType.STRING
 
 
 class MaxParameter(structure.ParameterArgument):
     """Represent 'max' parameter of 'path' (⊢) filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_max_parameter_accepted_by(self.parent)
@@ -3857,18 +4248,24 @@ def max_(match_=None, container=None):
 class MessageParentheses(structure.ParenthesizedArguments):
     """Represent 'message' string filter with parentheses."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class Message(structure.Argument):
     """Represent 'message' string filter without parentheses."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class Min(structure.MaxOrMin):
     """Represent 'min' numeric or string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC | cqltypes.FilterType.STRING
 
 
@@ -3880,6 +4277,8 @@ def is_min_parameter_accepted_by(node):
 class MinParameter(structure.ParameterArgument):
     """Represent 'min' parameter of 'sort' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_min_parameter_accepted_by(self.parent)
@@ -3907,18 +4306,24 @@ def min_(match_=None, container=None):
 class ModelMate(structure.NoArgumentsFilter):
     """Represent 'modelmate' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class ModelStalemate(structure.NoArgumentsFilter):
     """Represent 'modelstalemate' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class MoveNumber(structure.NoArgumentsFilter):
     """Represent 'movenumber' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
@@ -3939,6 +4344,8 @@ class Move(structure.PrecedenceFromChild, _LineOrMove):
 
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     def place_node_in_tree(self):
@@ -3988,6 +4395,8 @@ def is_nestban_parameter_accepted_by(node):
 class NestBan(structure.NoArgumentsParameter):
     """Represent 'nestban' parameter to 'line' and 'path' filters."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_nestban_parameter_accepted_by(self.parent)
@@ -3996,6 +4405,8 @@ class NestBan(structure.NoArgumentsParameter):
 class Northeast(structure.Argument):
     """Represent 'northeast' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -4003,6 +4414,8 @@ class Northeast(structure.Argument):
 class NortheastParameter(structure.DirectionParameter):
     """Represent 'northeast' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def northeast(match_=None, container=None):
     """Return Northeast or NortheastParameter instance."""
@@ -4014,6 +4427,8 @@ def northeast(match_=None, container=None):
 class Northwest(structure.Argument):
     """Represent 'northwest' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -4021,6 +4436,8 @@ class Northwest(structure.Argument):
 class NorthwestParameter(structure.DirectionParameter):
     """Represent 'northwest' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def northwest(match_=None, container=None):
     """Return Northwest or NorthwestParameter instance."""
@@ -4037,6 +4454,8 @@ class NoTransform(structure.Argument):
     filter.
     """
 
+    __slots__ = ()
+
     def _verify_children_and_set_own_types(self):
         """Override, raise NodeError if children verification fails."""
         self.filter_type = self.children[-1].filter_type
@@ -4045,6 +4464,8 @@ class NoTransform(structure.Argument):
 class Not(structure.Argument):
     """Represent 'not' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P60
 
@@ -4052,12 +4473,16 @@ class Not(structure.Argument):
 class NullMove(structure.NoArgumentsFilter):
     """Represent 'nullmove' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class Null(structure.NoArgumentsParameter):
     """Represent 'null' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -4067,6 +4492,8 @@ class Null(structure.NoArgumentsParameter):
 class OOO(structure.NoArgumentsFilter):
     """Represent 'o-o-o' logical filter or parameter to 'move' filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -4074,6 +4501,8 @@ class OOO(structure.NoArgumentsFilter):
 class OOOParameter(structure.NoArgumentsParameter):
     """Represent 'o-o-o' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -4105,6 +4534,8 @@ def o_o_o(match_=None, container=None):
 class OO(structure.NoArgumentsFilter):
     """Represent 'o-o' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -4112,6 +4543,8 @@ class OO(structure.NoArgumentsFilter):
 class OOParameter(structure.NoArgumentsParameter):
     """Represent 'o-o' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -4148,6 +4581,8 @@ class OffDiagonal(structure.Argument):
     'offdiagonal' is described in CQLi documentation.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -4161,6 +4596,8 @@ class OffDiagonalParameter(structure.DirectionParameter):
     'offdiagonal' is described in CQLi documentation.
     """
 
+    __slots__ = ()
+
 
 def off_diagonal(match_=None, container=None):
     """Return OffDiagonal or OffDiagonalParameter instance."""
@@ -4174,12 +4611,16 @@ def off_diagonal(match_=None, container=None):
 class OriginalComment(structure.ImplicitSearchFilter):
     """Represent 'originalcomment' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class Orthogonal(structure.Argument):
     """Represent 'orthogonal' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -4187,6 +4628,8 @@ class Orthogonal(structure.Argument):
 class OrthogonalParameter(structure.DirectionParameter):
     """Represent 'orthogonal' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def orthogonal(match_=None, container=None):
     """Return Orthogonal or OrthogonalParameter instance."""
@@ -4198,6 +4641,8 @@ def orthogonal(match_=None, container=None):
 class Or(structure.InfixLeft):
     """Represent 'or' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _precedence = cqltypes.Precedence.P40
 
@@ -4205,18 +4650,24 @@ class Or(structure.InfixLeft):
 class Parent(structure.NoArgumentsFilter):
     """Represent 'parent' position filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
 
 
 class PassedPawns(structure.NoArgumentsFilter):
     """Represent 'passedpawns' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class PathCountUnfocused(structure.Complete):
     """Ignore experimental 'pathcountunfocused' filter at 6.2."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
     def place_node_in_tree(self):
@@ -4228,6 +4679,8 @@ class PathCountUnfocused(structure.Complete):
 class PathCount(structure.Complete):
     """Ignore experimental 'pathcount' filter at 6.2."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
     def place_node_in_tree(self):
@@ -4239,6 +4692,8 @@ class PathCount(structure.Complete):
 class PathLastPosition(structure.Complete):
     """Ignore experimental 'pathlastposition' filter at 6.2."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
 
     def place_node_in_tree(self):
@@ -4250,6 +4705,8 @@ class PathLastPosition(structure.Complete):
 class PathStart(structure.Complete):
     """Ignore experimental 'pathstart' filter at 6.2."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
 
     def place_node_in_tree(self):
@@ -4275,6 +4732,8 @@ class Path(structure.BlockLeft):
     filter which is terminated by a newline.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
     def _verify_children_and_set_own_types(self):
@@ -4332,11 +4791,12 @@ class PersistentQuiet(structure.Complete, structure.VariableName):
     filter.  The Position filter is included too because CQL-6.2 accepts it.
     """
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Delegate then register the variable name."""
         super().__init__(match_=match_, container=container)
-        groupdict = match_.groupdict()
-        self.name = groupdict["persistent_quiet"]
+        self.name = match_.group("persistent_quiet")
         self._register_variable_type(cqltypes.VariableType.ANY)
         self._set_persistence_type(
             cqltypes.PersistenceType.PERSISTENT
@@ -4358,11 +4818,12 @@ class Persistent(structure.Complete, structure.VariableName):
     filter.  The Position filter is included too because CQL-6.2 accepts it.
     """
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Delegate then register the variable name."""
         super().__init__(match_=match_, container=container)
-        groupdict = match_.groupdict()
-        self.name = groupdict["persistent"]
+        self.name = match_.group("persistent")
         self._register_variable_type(cqltypes.VariableType.ANY)
         self._set_persistence_type(cqltypes.PersistenceType.PERSISTENT)
 
@@ -4375,6 +4836,8 @@ class Persistent(structure.Complete, structure.VariableName):
 class PieceId(structure.Argument):
     """Represent 'pieceid' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P150
 
@@ -4387,6 +4850,8 @@ class PieceName(structure.Argument):
     must have a precedence greater than the comparison operators.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
     @property
@@ -4415,6 +4880,8 @@ def is_piecepath_parameter_accepted_by(node):
 class PiecePath(structure.NoArgumentsParameter):
     """Represent 'piecepath' parameter to 'path' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_piecepath_parameter_accepted_by(self.parent)
@@ -4428,13 +4895,15 @@ class Piece(structure.VariableName, structure.Argument):
     The value of a piece variable is a Set filter.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
     _child_count = 2
 
     def __init__(self, match_=None, container=None):
         """Delegate then register the set variable name for piece filter."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["piece"]
+        self.name = match_.group("piece")
         self._register_variable_type(cqltypes.VariableType.PIECE)
         self.set_variable_types(
             cqltypes.VariableType.PIECE, cqltypes.FilterType.SET
@@ -4450,13 +4919,15 @@ class PieceAll(structure.VariableName, structure.Argument):
     The value of a piece all variable is a Set filter.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
     _child_count = 2
 
     def __init__(self, match_=None, container=None):
         """Delegate then register set variable name for pieceall filter."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["piece"]
+        self.name = match_.group("piece")
         self._register_variable_type(cqltypes.VariableType.PIECE)
         self.set_variable_types(
             cqltypes.VariableType.PIECE, cqltypes.FilterType.SET
@@ -4477,6 +4948,8 @@ class PieceVariable(structure.Complete, structure.VariableName):
     The value of a piece variable is a Set filter.
     """
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Delegate then register the piece variable name."""
         super().__init__(match_=match_, container=container)
@@ -4485,8 +4958,8 @@ class PieceVariable(structure.Complete, structure.VariableName):
         # This is because piece variables are assigned by 'piece x =' or
         # on of the synonyms but referenced as 'v = x' for example.  In
         # particular (at CQL-6.2) 'v = piece x' is a syntax error.
-        groupdict = match_.groupdict()
-        self.name = groupdict["piece_variable"] or groupdict["variable"]
+        group = match_.group
+        self.name = group("piece_variable") or group("variable")
         self._register_variable_type(cqltypes.VariableType.PIECE)
         self.set_variable_types(
             cqltypes.VariableType.PIECE, cqltypes.FilterType.SET
@@ -4526,6 +4999,8 @@ class Pin(structure.PrecedenceFromChild, structure.CompleteParameterArguments):
     'from', 'to', and 'through', parameters with default filters.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
     def place_node_in_tree(self):
@@ -4578,24 +5053,32 @@ class Pin(structure.PrecedenceFromChild, structure.CompleteParameterArguments):
 class Player(structure.ImplicitSearchFilter):
     """Represent 'player', 'player black, and 'player white', string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class Ply(structure.NoArgumentsFilter):
     """Represent 'ply' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class PositionId(structure.NoArgumentsFilter):
     """Represent 'positionid' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class Position(structure.Argument):
     """Represent 'position' position filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.POSITION
     _precedence = cqltypes.Precedence.P90
 
@@ -4603,6 +5086,8 @@ class Position(structure.Argument):
 class Power(structure.Argument):
     """Represent 'power' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P150
 
@@ -4610,6 +5095,8 @@ class Power(structure.Argument):
 class Previous(structure.NoArgumentsParameter):
     """Represent 'previous' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -4623,12 +5110,16 @@ def is_primary_parameter_accepted_by(node):
 class Primary(structure.NoArgumentsFilter):
     """Represent 'primary' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class PrimaryParameter(structure.NoArgumentsParameter):
     """Represent 'primary' parameter to line, move, and path filters."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_primary_parameter_accepted_by(self.parent)
@@ -4670,6 +5161,8 @@ def primary(match_=None, container=None):
 class Promote(structure.ParameterArgument):
     """Represent 'promote' parameter to 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -4678,10 +5171,14 @@ class Promote(structure.ParameterArgument):
 class Pseudolegal(structure.Argument, _Legal):
     """Represent 'pseudolegal' set filter."""
 
+    __slots__ = ()
+
 
 class PseudolegalParameter(MoveParameterImpliesNumeric):
     """Represent 'pseudolegal' parameter of 'move' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, Move)
@@ -4711,12 +5208,16 @@ def pseudolegal(match_=None, container=None):
 class PureMate(structure.NoArgumentsFilter):
     """Represent 'puremate' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
 class PureStalemate(structure.NoArgumentsFilter):
     """Represent 'purestalemate' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
@@ -4747,6 +5248,8 @@ class Quiet(structure.NoArgumentsParameter):
     The 'quiet' keyword also appears in the parameter module.
     """
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_quiet_parameter_accepted_by(self.parent)
@@ -4755,6 +5258,8 @@ class Quiet(structure.NoArgumentsParameter):
 class Rank(structure.Argument):
     """Represent 'rank' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P150
 
@@ -4770,6 +5275,8 @@ class Ray(structure.ParenthesizedArguments):
     checking for duplicates.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
     def __init__(self, match_=None, container=None):
@@ -4804,6 +5311,8 @@ class ReadFile(structure.Argument):
     must have a precedence greater than the comparison operators.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
     @property
@@ -4827,6 +5336,8 @@ class ReadFile(structure.Argument):
 class RemoveComment(structure.NoArgumentsFilter):
     """Represent 'removecomment' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -4840,6 +5351,8 @@ class Result(structure.Argument):
     must have a precedence greater than the comparison operators.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     @property
@@ -4883,6 +5396,8 @@ class Result(structure.Argument):
 class ReverseColor(TransformFilterType, structure.Argument):
     """Represent 'reversecolor' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
     # CQL documentation for reversecolor does not say a count parameter is
@@ -4895,6 +5410,8 @@ class ReverseColor(TransformFilterType, structure.Argument):
 class Right(structure.Argument):
     """Represent 'right' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -4902,6 +5419,8 @@ class Right(structure.Argument):
 class RightParameter(structure.DirectionParameter):
     """Represent 'right' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def right(match_=None, container=None):
     """Return Right or RightParameter instance."""
@@ -4914,6 +5433,8 @@ def right(match_=None, container=None):
 class Rotate45(TransformFilterType, structure.Argument):
     """Represent 'rotate45' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
     def _verify_children_and_set_own_types(self):
@@ -4984,18 +5505,24 @@ class Rotate45(TransformFilterType, structure.Argument):
 class Rotate90(TransformFilterType, structure.Argument):
     """Represent 'rotate90' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
 class Secondary(structure.NoArgumentsFilter):
     """Represent 'secondary' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class SecondaryParameter(structure.NoArgumentsParameter):
     """Represent 'secondary' parameter to line, and move, filters."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return isinstance(self.parent, (Line, Move, Path))
@@ -5032,6 +5559,8 @@ def secondary(match_=None, container=None):
 class SetTag(structure.ParenthesizedArguments):
     """Represent 'settag' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     def _verify_children_and_set_own_types(self):
@@ -5049,6 +5578,8 @@ class SetTag(structure.ParenthesizedArguments):
 class ShiftHorizontal(TransformFilterType, structure.Argument):
     """Represent 'shifthorizontal' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
@@ -5056,6 +5587,8 @@ class ShiftHorizontal(TransformFilterType, structure.Argument):
 class ShiftVertical(TransformFilterType, structure.Argument):
     """Represent 'shiftvertical' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
@@ -5078,18 +5611,24 @@ class ShiftVertical(TransformFilterType, structure.Argument):
 class Shift(TransformFilterType, structure.Argument):
     """Represent 'shift' filter of all types."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
 
 
 class SideToMove(structure.NoArgumentsFilter):
     """Represent 'sidetomove' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class SingleColor(structure.NoArgumentsParameter):
     """Represent 'singlecolor' parameter to 'line' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return (
@@ -5103,6 +5642,8 @@ class SingleColor(structure.NoArgumentsParameter):
 class Site(structure.ImplicitSearchFilter):
     """Represent 'site' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -5113,6 +5654,8 @@ class Sort(structure.Argument):
     name of the pattern which spots quoted strings in a *.cql file.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC | cqltypes.FilterType.STRING
     _accepted_parameters = frozenset(("min", "string"))
     _precedence = cqltypes.Precedence.P30
@@ -5142,6 +5685,8 @@ def sort(match_=None, container=None):
 class Southeast(structure.Argument):
     """Represent 'southeast' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -5149,6 +5694,8 @@ class Southeast(structure.Argument):
 class SoutheastParameter(structure.DirectionParameter):
     """Represent 'southeast' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def southeast(match_=None, container=None):
     """Return Southeast or SoutheastParameter instance."""
@@ -5160,6 +5707,8 @@ def southeast(match_=None, container=None):
 class Southwest(structure.Argument):
     """Represent 'southwest' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -5167,6 +5716,8 @@ class Southwest(structure.Argument):
 class SouthwestParameter(structure.DirectionParameter):
     """Represent 'southwest' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def southwest(match_=None, container=None):
     """Return Southwest or SouthwestParameter instance."""
@@ -5178,6 +5729,8 @@ def southwest(match_=None, container=None):
 class Sqrt(structure.Argument):
     """Represent 'sqrt' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P90
 
@@ -5190,6 +5743,8 @@ class Square(structure.SquareIn):
     The value of a square variable is a Set filter.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
@@ -5201,6 +5756,8 @@ class SquareAll(structure.SquareIn):
     The value of a square all variable is a Logical filter.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -5214,18 +5771,24 @@ def square(match_=None, container=None):
 class Stalemate(structure.NoArgumentsFilter):
     """Represent 'stalemate' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class StrParentheses(structure.ParenthesizedArguments):
     """Represent 'str' string filter with parentheses."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class Str(structure.Argument):
     """Represent 'str' string filter without parentheses."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
     def _verify_children_and_set_own_types(self):
@@ -5242,6 +5805,8 @@ class Tag(structure.Argument):
     must have a precedence greater than the comparison operators.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
     @property
@@ -5265,6 +5830,8 @@ class Tag(structure.Argument):
 class Terminal(structure.NoArgumentsFilter):
     """Represent 'terminal' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -5276,6 +5843,8 @@ class Then(structure.Complete):
     At version 6.2 the 'then' keyword is deprecated.
     """
 
+    __slots__ = ()
+
     _precedence = (
         cqltypes.Precedence.P30
     )  # Does this matter?  Reference is 'if/then/else'.
@@ -5339,6 +5908,8 @@ def is_through_parameter_accepted_by(node):
 class Through(structure.ParameterArgument):
     """Represent 'through' parameter to 'pin' filter."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P200
 
     def is_parameter_accepted_by_filter(self):
@@ -5349,6 +5920,8 @@ class Through(structure.ParameterArgument):
 class ThroughDefaultPinParameter(Through):
     """Represent default 'through' parameter to 'pin' filter."""
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Initialise node parent and children attributes."""
         super().__init__(match_=match_, container=container)
@@ -5368,6 +5941,8 @@ def is_title_parameter_accepted_by(node):
 class Title(structure.ParameterArgument):
     """Represent 'title' parameter to 'path' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_title_parameter_accepted_by(self.parent)
@@ -5376,6 +5951,8 @@ class Title(structure.ParameterArgument):
 class To(structure.NoArgumentsFilter):
     """Represent 'to' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
 
@@ -5391,6 +5968,8 @@ class ToParameter(MoveParameterImpliesSet):
     'pin to to from' give a syntax error.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P200  # 'pin' filter only.
 
     def is_parameter_accepted_by_filter(self):
@@ -5415,6 +5994,8 @@ def to(match_=None, container=None):
 class ToDefaultPinParameter(ToParameter):
     """Represent default 'to' parameter to 'pin' filter."""
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Initialise node parent and children attributes."""
         super().__init__(match_=match_, container=container)
@@ -5434,12 +6015,16 @@ class ToDefaultPinParameter(ToParameter):
 class True_(structure.NoArgumentsFilter):
     """Represent 'true' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class Try(structure.NoArgumentsFilter):
     """Represent 'try' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -5451,6 +6036,8 @@ class TypeName(structure.Argument):
     must have a precedence greater than the comparison operators.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
     @property
@@ -5474,6 +6061,8 @@ class TypeName(structure.Argument):
 class Type(structure.Argument):
     """Represent 'type' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P150
 
@@ -5485,6 +6074,8 @@ class Unbind(structure.BindArgument):
     dictionary entry, but does not affect the variable or dictionary type.
     """
 
+    __slots__ = ()
+
     def _verify_children_and_set_own_types(self):
         """Override, raise NodeError if children verification fails."""
         subject = self.children[0]
@@ -5518,6 +6109,8 @@ class Unbind(structure.BindArgument):
 class UpperCase(structure.Argument):
     """Represent 'uppercase' string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
     _precedence = cqltypes.Precedence.P120
 
@@ -5525,6 +6118,8 @@ class UpperCase(structure.Argument):
 class Up(structure.Argument):
     """Represent 'up' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -5532,6 +6127,8 @@ class Up(structure.Argument):
 class UpParameter(structure.DirectionParameter):
     """Represent 'up' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def up(match_=None, container=None):
     """Return Up or UpParameter instance."""
@@ -5543,6 +6140,8 @@ def up(match_=None, container=None):
 class Variation(structure.NoArgumentsFilter):
     """Represent 'variation' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
@@ -5559,6 +6158,8 @@ def is_verbose_parameter_accepted_by(node):
 class Verbose(structure.NoArgumentsParameter):
     """Represent 'verbose' parameter of 'path' filter."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_verbose_parameter_accepted_by(self.parent)
@@ -5567,6 +6168,8 @@ class Verbose(structure.NoArgumentsParameter):
 class Vertical(structure.Argument):
     """Represent 'vertical' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P210
 
@@ -5574,6 +6177,8 @@ class Vertical(structure.Argument):
 class VerticalParameter(structure.DirectionParameter):
     """Represent 'vertical' transform filter direction parameter."""
 
+    __slots__ = ()
+
 
 def vertical(match_=None, container=None):
     """Return Vertical or VerticalParameter instance."""
@@ -5585,12 +6190,16 @@ def vertical(match_=None, container=None):
 class VirtualMainLine(structure.NoArgumentsFilter):
     """Represent 'virtualmainline' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class While(structure.ParenthesizedArguments):
     """Represent 'while' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
     _child_count = 2
 
@@ -5616,12 +6225,16 @@ class While(structure.ParenthesizedArguments):
 class White(structure.CQLObject):
     """Represent 'white' numeric filter with value 1."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class WriteFile(structure.ParenthesizedArguments):
     """Represent 'writefile' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     def _verify_children_and_set_own_types(self):
@@ -5638,12 +6251,16 @@ class WriteFile(structure.ParenthesizedArguments):
 class WTM(structure.NoArgumentsFilter):
     """Represent 'wtm' logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class XRay(structure.ParenthesizedArguments):
     """Represent 'xray' set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
     def _verify_children_and_set_own_types(self):
@@ -5660,6 +6277,8 @@ class XRay(structure.ParenthesizedArguments):
 class Year(structure.NoArgumentsFilter):
     """Represent 'year' numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
@@ -5674,6 +6293,8 @@ class PieceDesignator(structure.NoArgumentsFilter):
     opposite corners 'c4' and 'e6'.  There are other ecceptable forms.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
 
     def __init__(self, match_=None, container=None):
@@ -5712,6 +6333,8 @@ class ResultArgument(structure.NoArgumentsFilter):
     Value is '1-0', '0-1', or '1/2-1/2'.
     """
 
+    __slots__ = ()
+
 
 def is_range_parameter_accepted_by(node):
     """Return True if node accepts range parameter."""
@@ -5746,6 +6369,8 @@ def is_range_parameter_accepted_by(node):
 class RangeInteger(structure.Complete):
     """Represent a positive or negative integer of a range parameter."""
 
+    __slots__ = ()
+
     _is_parameter = True
 
     def is_parameter_accepted_by_filter(self):
@@ -5761,6 +6386,8 @@ class RangeInteger(structure.Complete):
 class Integer(structure.Complete):
     """Represent a positive or negative integer numeric set."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
     def place_node_in_tree(self):
@@ -5832,12 +6459,14 @@ class RangeVariable(structure.Complete, structure.VariableName):
     'v=int "4" z=k up v z' and 'v=#k z=k up v z' are accepted.
     """
 
+    __slots__ = ()
+
     _is_parameter = True
 
     def __init__(self, match_=None, container=None):
         """Delegate then register the variable name."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["variable"]
+        self.name = match_.group("variable")
         self._register_variable_type(cqltypes.VariableType.NUMERIC)
         self.set_variable_types(
             cqltypes.VariableType.NUMERIC, cqltypes.FilterType.NUMERIC
@@ -5871,19 +6500,21 @@ class Variable(structure.Complete, structure.VariableName):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Delegate then register the variable name."""
         super().__init__(match_=match_, container=container)
-        groupdict = match_.groupdict()
+        group = match_.group
         # The "variable" reference must be first to allow for variables
         # defined by 'echo' pattern.
         # The 'function_call' reference is needed because 'T(' in '--=T(R)'
         # is seen as a function call by pattern matching and has to be
         # diverted if the '=' was seen as an 'AssignPromotion' instance.
         self.name = (
-            groupdict["variable"]
-            or groupdict["variable_assign"]
-            or groupdict["function_call"]
+            group("variable")
+            or group("variable_assign")
+            or group("function_call")
         )
         self._register_variable_type(cqltypes.VariableType.ANY)
         self._set_persistence_type(cqltypes.PersistenceType.LOCAL)
@@ -5908,13 +6539,15 @@ class BindName(structure.Complete, structure.Name):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, match_=None, container=None):
         """Delegate then register the variable name."""
         super().__init__(match_=match_, container=container)
-        groupdict = match_.groupdict()
+        group = match_.group
         # The "variable" reference must be first to allow for variables
         # defined by 'echo' pattern.
-        self.name = groupdict["variable"] or groupdict["variable_assign"]
+        self.name = group("variable") or group("variable_assign")
 
     def place_node_in_tree(self):
         """Delegate then set cursor to self."""
@@ -5954,7 +6587,7 @@ def variable(match_=None, container=None):
     square, and plain variable, cases.
 
     """
-    name = match_.groupdict()["variable"]
+    name = match_.group("variable")
     definitions = container.definitions
     if name in definitions:
         definition_type = definitions[name].definition_type
@@ -5991,7 +6624,7 @@ def variable_assign(match_=None, container=None):
 
     """
     definitions = container.definitions
-    name = match_.groupdict()["variable_assign"]
+    name = match_.group("variable_assign")
     if name in definitions:
         definition_type = definitions[name].definition_type
         if definition_type is not cqltypes.DefinitionType.VARIABLE:
@@ -6023,6 +6656,8 @@ def variable_assign(match_=None, container=None):
 class Backslash(structure.CQLObject):
     r"""Represent escaped strings '\\', '\"', '\n', '\r', and '\t'."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -6040,6 +6675,8 @@ class AnySquare(PieceDesignator):
     In CQL() parameters it appears in file names unprotected by quotes.
     """
 
+    __slots__ = ()
+
     def get_match_text(self):
         """Override and return '.', ASCII form of 'any square' filter."""
         return "."
@@ -6057,6 +6694,8 @@ class AnyPiece(PieceDesignator):
     'from' parameters if these parameters are not explicit.
     """
 
+    __slots__ = ()
+
     def get_match_text(self):
         """Override and return '[Aa]', ASCII form of 'any piece' filter."""
         return "[Aa]"
@@ -6074,6 +6713,8 @@ class AnyKing(PieceDesignator):
     if this parameter is not explicit.
     """
 
+    __slots__ = ()
+
     def get_match_text(self):
         """Override and return '[Kk]', ASCII form of 'either king' filter."""
         return "[Kk]"
@@ -6098,12 +6739,19 @@ class AnyKing(PieceDesignator):
 class BracketLeft(structure.CompleteBlock, structure.InfixLeft):
     """Represent '[' which starts a string index operator."""
 
+    __slots__ = ()
+
     # Do not override _child_count even though '[a:b:c]' is a possible
     # extension.  '[' is ended by ']' as indicated by the override of
     # complete() and full().
 
     _precedence = cqltypes.Precedence.P220
 
+    def place_node_in_tree(self):
+        """Delegate then note self is open."""
+        super().place_node_in_tree()
+        self.container.push_open_delimiter(self)
+
     @property
     def filter_type(self):
         """Return filter_type from variable's entry in definitions."""
@@ -6194,6 +6842,8 @@ def bracket_left(match_=None, container=None):
 class BracketRight(RightCompoundPlace):
     """Close BracketLeft and record as whitespace."""
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then verify cursor is a BracketLeft instance."""
         super().place_node_in_tree()
@@ -6250,6 +6900,8 @@ def bracket_right(match_=None, container=None):
 class Colon(structure.InfixRight):
     """Represent ':' filter between a position filter and a filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.ANY
     _precedence = cqltypes.Precedence.P230  # Reference says ':', no context.
 
@@ -6299,6 +6951,8 @@ class ColonStringIndex(structure.CQLObject):
     '-output' and '-parse'.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P220  # Reference says ':', no context.
 
     def place_node_in_tree(self):
@@ -6327,6 +6981,8 @@ class Intersection(structure.InfixLeft):
     Intersection itself is a Set filter.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P170
 
@@ -6353,16 +7009,20 @@ class Intersection(structure.InfixLeft):
 class LT(structure.Compare, structure.InfixRight):
     """Represent '>' numeric or string filter between two filters."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P80
 
 
 class GT(structure.Compare, structure.InfixRight):
     """Represent '>' numeric or string filter between two filters."""
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P80
 
 
-def _lookahead(match_, token_names):
+def _lookahead(match_, container, token_names):
     """Return True if first token found beyond match_ is in token_names.
 
     If no tokens are found beyond match_ return True.
@@ -6371,14 +7031,13 @@ def _lookahead(match_, token_names):
     arithmetic operator.
 
     """
-    for token in pattern.cql_re.finditer(match_.string, match_.end()):
-        tokens = {
-            key
-            for key, value in token.groupdict().items()
-            if value is not None and key not in _ALL_WHITESPACE
-        }
-        if tokens:
-            return token_names & tokens
+    cql_token_names = pattern.cql_token_names
+    for token in lexer.finditer(
+        match_.string, match_.end(), version=container.version
+    ):
+        name = cql_token_names[token.lastindex]
+        if name not in _ALL_WHITESPACE:
+            return name in token_names
     return True
 
 
@@ -6401,7 +7060,7 @@ def _is_repeat_0_or_1_to_many(match_, container, filter_types):
             break  # return True
         if isinstance(node, LineArrow):
             if container.cursor.filter_type in filter_types:
-                return _lookahead(match_, _ARROWS | _BLOCK_ENDS)
+                return _lookahead(match_, container, _ARROWS | _BLOCK_ENDS)
             break  # return True
         if not node.full():
             if isinstance(node, (Path, ConstituentParenthesisLeft)):
@@ -6410,7 +7069,7 @@ def _is_repeat_0_or_1_to_many(match_, container, filter_types):
                 return False
             if container.cursor.filter_type is not cqltypes.FilterType.NUMERIC:
                 break  # return True
-            return _lookahead(match_, _ARROWS)
+            return _lookahead(match_, container, _ARROWS)
         node = node.parent
     # Avoid pylint R0911 too-many-return-statements with 'break'.
     return True
@@ -6423,12 +7082,16 @@ class PlusRepeat(RepeatConstituent):
     The 'path' and 'line' filters use constituent filters.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P20
 
 
 class Plus(structure.Numeric):
     """Represent '+' filter between two numeric or string filters."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC | cqltypes.FilterType.STRING
     _precedence = cqltypes.Precedence.P110
 
@@ -6462,12 +7125,16 @@ class StarRepeat(RepeatConstituent):
     The 'path' and 'line' filters use constituent filters.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P20
 
 
 class Star(structure.Numeric):
     """Represent '*' filter between two numeric filters."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P140
 
@@ -6484,6 +7151,8 @@ def star(match_=None, container=None):
 class Modulus(structure.Numeric):
     """Represent '%' filter between two numeric filters."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P140
 
@@ -6491,6 +7160,8 @@ class Modulus(structure.Numeric):
 class Divide(structure.Numeric):
     """Represent '/' filter between two numeric filters."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P140
 
@@ -6498,6 +7169,8 @@ class Divide(structure.Numeric):
 class Minus(structure.Numeric):
     """Represent '-' filter between two numeric filters, eg '1 + 2'."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P110
 
@@ -6505,6 +7178,8 @@ class Minus(structure.Numeric):
 class UnaryMinus(structure.Argument):
     """Represent '-' filter before a numeric filter, eg 'v = -1'."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P130
 
@@ -6540,6 +7215,8 @@ def minus(match_=None, container=None):
 class Complement(structure.Argument):
     """Represent '~' filter on a set filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P180
 
@@ -6555,6 +7232,8 @@ class Complement(structure.Argument):
 class Union(structure.InfixLeft):
     """Represent '|' filter between two set filters."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.SET
     _precedence = cqltypes.Precedence.P160
 
@@ -6585,6 +7264,8 @@ class Assign(structure.InfixLeft):
     filter, from '=', not a Set filter, from 'k', here.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # '=' has the same precedence as 'find', and others, according to CQLi
@@ -6744,6 +7425,8 @@ class AssignIf(structure.MoveInfix):
     RHS must be a set filter.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # '=?' has the same precedence as '+=', and others including all the
@@ -6818,6 +7501,8 @@ class AssignPromotion(structure.Argument):
     two are patterns, in a regular expression.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Verify and apply node to tree then set cursor to self."""
         # This tests the situation if the following parent relationships
@@ -6890,10 +7575,14 @@ class RepeatZeroOrOne(RepeatConstituent):
     Constituent is an element of the 'line' and 'path' filters.
     """
 
+    __slots__ = ()
+
 
 class CountFilter(structure.Argument):
     """Represent '#' numeric filter which is size of a set or string filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
     _precedence = cqltypes.Precedence.P100
 
@@ -6912,6 +7601,8 @@ class AnythingElse(structure.CQLObject):
     This construct also occurs in parameters module.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then raise NodeError for unexpected token."""
         super().place_node_in_tree()
@@ -6920,12 +7611,26 @@ class AnythingElse(structure.CQLObject):
         )
 
 
+class UnassignedVariableError(basenode.NodeError):
+    """Exception raised at end of query for a variable not yet assigned.
+
+    The match_ attribute is the re.Match of the variable's token.
+    """
+
+    def __init__(self, message, match_):
+        """Note match_ of variable named in message."""
+        super().__init__(message)
+        self.match_ = match_
+
+
 class EndOfStream(structure.Complete):
     """Represent end of str containing CQL statement.
 
     The 'end of stream' construct also appears in the parameter module.
     """
 
+    __slots__ = ()
+
     _is_allowed_first_object_in_container = True
 
     def place_node_in_tree(self):
@@ -6944,6 +7649,8 @@ class EndOfStream(structure.Complete):
             self.parent, (querycontainer.QueryContainer, cql.CQL)
         ):
             self.raise_nodeerror("Unexpected end of statement found")
+        # The completed delimiters not yet removed are not open.
+        self.container.pop_completed_delimiters()
         # This copes with simple non-filter text in a query which is seen
         # as variable names, like 'cql(<stuff>) some thing'.
         # The general case of an unassigned variable hidden in a query is
@@ -6953,10 +7660,15 @@ class EndOfStream(structure.Complete):
                 isinstance(child, Variable)
                 and child.filter_type is cqltypes.FilterType.ANY
             ):
-                self.raise_nodeerror(
-                    "Variable ",
-                    child.name.join("''"),
-                    " has not been assigned",
+                raise UnassignedVariableError(
+                    "".join(
+                        (
+                            "Variable ",
+                            child.name.join("''"),
+                            " has not been assigned",
+                        )
+                    ),
+                    child.match_,
                 )
         self.parent = None
 
@@ -0,0 +1,193 @@
+# fingerprint.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Canonical form and fingerprint of a parsed query.
+
+Queries which differ only in whitespace, comments, the unicode or ASCII
+spelling of symbols, or the names of user variables, functions, and
+dictionaries, have the same canonical form and fingerprint.
+
+The canonical form is built from the node tree of a QueryContainer: one
+line per node giving the node's depth, class, and token text.  The text
+is normalized: unicode symbols are replaced by their ASCII spelling, the
+whitespace is reduced to single spaces between words, and the names in
+the container's definitions are replaced by names numbered in order of
+first appearance in the tree.  The container's whitespace property, the
+whitespace and comments, is ignored.
+
+The bodies of function definitions are in the canonical form because the
+Function node is not followed by the body in the node tree.
+
+The fingerprint is the SHA-256 hex digest of the canonical form, suitable
+for identifying duplicate queries and as the key of caches of results
+shared by equivalent queries.
+
+"""
+import hashlib
+import re
+
+from . import cqltypes
+from . import filters
+
+# Identify the canonical form: change when the canonical form changes so
+# fingerprints from different forms do not match.
+_FORMAT = "chessql.fingerprint.1"
+
+# The ASCII spellings of the unicode symbols accepted in queries: see the
+# definitions in the elements module.
+_ASCII_SYMBOLS = str.maketrans(
+    {
+        "≽": "[>=]",
+        "≼": "[<=]",
+        "≻": "[>]",
+        "≺": "[<]",
+        "≤": "<=",
+        "≥": ">=",
+        "≠": "!=",
+        "→": "->",
+        "←": "<-",
+        "―": "-",
+        "×": "[x]",
+        "▦": ".",
+        "□": "_",
+        "∩": "&",
+        "∪": "|",
+        "∙": "currentposition",
+        "✵": "flip",
+        "⬓": "flipcolor",
+        "◭": "[Aa]",
+        "∊": "[element]",
+        "◎": "focus ",
+        "∀": "[forall]",
+        "⊢": "path",
+        "△": "A",
+        "♔": "K",
+        "♕": "Q",
+        "♖": "R",
+        "♗": "B",
+        "♘": "N",
+        "♙": "P",
+        "▲": "a",
+        "♚": "k",
+        "♛": "q",
+        "♜": "r",
+        "♝": "b",
+        "♞": "n",
+        "♟": "p",
+    }
+)
+
+# Split token text into quoted strings, kept as written, and other text.
+_string_re = re.compile(r'("[^"]*")')
+
+# Whitespace next to a character which cannot be in a name.
+_inner_space_re = re.compile(r"\s+(?=[^\w$\s])|(?<=[^\w$\s])\s+")
+
+# Whitespace between names.
+_space_re = re.compile(r"\s+")
+
+# Names in token text.
+_name_re = re.compile(r"[\w$]+")
+
+# Prefixes of the canonical names by definition type.
+_NAME_PREFIXES = {
+    cqltypes.DefinitionType.DICTIONARY: "d",
+    cqltypes.DefinitionType.FUNCTION: "f",
+    cqltypes.DefinitionType.VARIABLE: "v",
+}
+
+
+class _Names:
+    """Map the names of definitions to canonical names."""
+
+    def __init__(self, definitions):
+        """Initialise with no names mapped."""
+        self._definitions = definitions
+        self._names = {}
+        self._counts = dict.fromkeys(_NAME_PREFIXES.values(), 0)
+
+    def canonical(self, name):
+        """Return canonical name for name, allocating one if necessary."""
+        canonical = self._names.get(name)
+        if canonical is None:
+            definition = self._definitions.get(name)
+            if definition is None:
+                prefix = "v"
+            else:
+                prefix = _NAME_PREFIXES[definition.definition_type]
+            self._counts[prefix] += 1
+            canonical = prefix + str(self._counts[prefix])
+            self._names[name] = canonical
+        return canonical
+
+    def text(self, text, names):
+        """Return canonical text of token text.
+
+        Outside quoted strings the unicode symbols are replaced by their
+        ASCII spelling, whitespace is removed next to symbols and reduced
+        to a single space between names, and the names in names are
+        replaced by canonical names.
+
+        """
+        parts = _string_re.split(text)
+        for index in range(0, len(parts), 2):
+            part = parts[index].translate(_ASCII_SYMBOLS)
+            part = _space_re.sub(" ", _inner_space_re.sub("", part)).strip()
+            parts[index] = _name_re.sub(
+                lambda match_: (
+                    self.canonical(match_.group())
+                    if match_.group() in names
+                    else match_.group()
+                ),
+                part,
+            )
+        return "".join(parts)
+
+
+def canonical_form(container):
+    """Return the canonical form, a str, of the query parsed in container.
+
+    The container is a QueryContainer returned by parser.parse(), or any
+    of the ways of creating or restoring one such as persist.loads().
+
+    """
+    definitions = container.definitions
+    names = _Names(definitions)
+    lines = []
+    # The bound names of tokenmap.SharedFunctionBody nodes are used so the
+    # form does not depend on sharing.
+    # pylint: disable=protected-access
+    for depth, node, binding in container._walk_tree(0, None):
+        if binding and node.name in binding:
+            node = node._bound_copy(binding[node.name])
+        # The parameters of functions not called are not in definitions.
+        known = definitions
+        if isinstance(node, filters.Function):
+            definition = definitions[node.name]
+            known = definitions.keys() | set(definition.parameters or ())
+        match_ = node.match_
+        text = "" if match_ is None else names.text(match_.group(), known)
+        line = " ".join((str(depth), node.__class__.__name__))
+        lines.append(" ".join((line, text)) if text else line)
+        if known is not definitions:
+            texts = (
+                names.text(token.group(), known) for token in definition.body
+            )
+            lines.append(
+                "".join(
+                    (
+                        str(depth + 1),
+                        " body ",
+                        " ".join(body for body in texts if body),
+                    )
+                )
+            )
+    return "\n".join(lines)
+
+
+def fingerprint(container):
+    """Return the SHA-256 hex digest of canonical_form(container)."""
+    return hashlib.sha256(
+        "\x00".join((_FORMAT, canonical_form(container))).encode("utf-8")
+    ).hexdigest()
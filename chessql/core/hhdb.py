@@ -244,228 +244,304 @@ _AWARD_KEYWORDS = frozenset(
 class HHdbCook(structure.CQLObject):
     """Represent '"<cook>"' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbEG(structure.CQLObject):
     """Represent '"<eg>"' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbMain(structure.CQLObject):
     """Represent '"<main>"' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbMinorDual(structure.CQLObject):
     """Represent '"<minor_dual>"' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbOr(structure.CQLObject):
     """Represent '"<or>"' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbMainline(structure.CQLObject):
     """Represent 'mainline' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbVariation(structure.CQLObject):
     """Represent 'variation' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbCooked(structure.CQLObject):
     """Represent 'cooked' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbDual(structure.CQLObject):
     """Represent 'dual' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbSound(structure.CQLObject):
     """Represent 'sound' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbUnsound(structure.CQLObject):
     """Represent 'unsound' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbCorrection(structure.CQLObject):
     """Represent 'correction' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbModification(structure.CQLObject):
     """Represent 'modification' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbCorrectedSolution(structure.CQLObject):
     """Represent 'corrected_solution' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbVersion(structure.CQLObject):
     """Represent 'version' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbAnticipation(structure.CQLObject):
     """Represent 'anticipation' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbColorsReversed(structure.CQLObject):
     """Represent 'colors_reversed' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbTooManyComposers(structure.CQLObject):
     """Represent 'too_many_composers' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbPosthumous(structure.CQLObject):
     """Represent 'posthumous' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbTheoreticalEnding(structure.CQLObject):
     """Represent 'theoretical_ending' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbThemeTourney(structure.CQLObject):
     """Represent 'theme_tourney' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbTwin(structure.CQLObject):
     """Represent 'twin' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbDualAtMove1(structure.CQLObject):
     """Represent 'dual_at_move_1' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbDualAfterMove1(structure.CQLObject):
     """Represent 'dual_after_move_1' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbWhiteFails(structure.CQLObject):
     """Represent 'white_fails' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbWhiteWinsInDraw(structure.CQLObject):
     """Represent 'white_wins_in_draw' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbUnreachable(structure.CQLObject):
     """Represent 'unreachable' Logical filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
 
 class HHdbEGDiagram(structure.ImplicitSearchFilter):
     """Represent 'egdiagram' Numeric filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
 
 class HHdbComposer(structure.ImplicitSearchFilter):
     """Represent 'composer' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbDiagram(structure.ImplicitSearchFilter):
     """Represent 'diagram' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbFirstcomment(structure.ImplicitSearchFilter):
     """Represent 'firstcomment' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbGBR(structure.ImplicitSearchFilter):
     """Represent 'gbr' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbGBRKings(structure.ImplicitSearchFilter):
     """Represent 'gbr kings' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbGBRMaterial(structure.ImplicitSearchFilter):
     """Represent 'gbr material' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbGBRPawns(structure.ImplicitSearchFilter):
     """Represent 'gbr pawns' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbGBRPieces(structure.ImplicitSearchFilter):
     """Represent 'gbr pieces' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbSearch(structure.ImplicitSearchFilter):
     """Represent 'search' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
 class HHdbStipulation(structure.ImplicitSearchFilter):
     """Represent 'stipulation' String filter."""
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.STRING
 
 
@@ -485,6 +561,8 @@ class HHdbAward(structure.ImplicitSearchFilter):
     identical to those in CQL for awards.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.NUMERIC
 
     def is_max(self):
@@ -0,0 +1,410 @@
+# lexer.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Find the tokens in a CQL statement faster than pattern.cql_re.finditer.
+
+The pattern.cql_re pattern is an alternation of the elements in the
+pattern.CQL_ELEMENTS tuple, tried in order at each position.  Most of the
+elements fail on the first character at the position, but about 260 of
+them are tried before an identifier or piece designator is recognised.
+
+The finditer function in this module looks at the character at the
+position first.  Each element of pattern.CQL_ELEMENTS is analysed once to
+find the characters which can start a match of the element, and for each
+set of elements which can match at a character a pattern is compiled
+where each run of the other elements is replaced by an assertion which
+always fails followed by the groups of the elements in the run.  The
+groups of a match are the groups of the pattern.cql_re match at the
+position: only the 're' and 'pos' attributes of the re.Match instances
+differ.
+
+The version argument of finditer restricts the elements to those of a
+CQL version in pattern.CQL_VERSIONS: the other elements are disabled in
+the same way.
+
+The cql_regex function gives pattern.cql_re for the patterns compiled
+by this module so the matches can be saved with the pattern.cql_re
+pattern.
+
+The pattern.cql_re pattern is used at a position where the elements
+which can match are not found, as happens if a match is an empty string
+before the end of the string.
+
+"""
+import re
+import threading
+
+# The sre_parse module is deprecated from Python 3.11 where the re._parser
+# module is equivalent.
+try:
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+from . import pattern
+
+# Patterns for the character categories which may start an element.
+_CATEGORY_RE = {
+    "CATEGORY_DIGIT": re.compile(r"\d"),
+    "CATEGORY_NOT_DIGIT": re.compile(r"\D"),
+    "CATEGORY_SPACE": re.compile(r"\s"),
+    "CATEGORY_NOT_SPACE": re.compile(r"\S"),
+    "CATEGORY_WORD": re.compile(r"\w"),
+    "CATEGORY_NOT_WORD": re.compile(r"\W"),
+}
+
+# Operators which do not consume characters.
+_ZERO_WIDTH_OPERATORS = frozenset(("AT", "ASSERT", "ASSERT_NOT"))
+
+# Operators which repeat their subpattern.
+_REPEAT_OPERATORS = frozenset(
+    ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+)
+
+# Replaces a run of elements which cannot match at a position.
+_FAIL = r"(?!)"
+
+# The (<can match empty string>, <first character tests>) tuples for each
+# element of pattern.CQL_ELEMENTS, and the groups of the element for
+# patterns where the element cannot match.
+_elements = []
+
+# The compiled patterns keyed by frozenset of indices of elements which
+# can match.
+_regex_by_elements = {}
+
+# The dicts of compiled patterns keyed by the character at the position,
+# keyed by CQL version.  The empty string is the key for the end of string
+# and None is the key for all versions.
+_regex_by_character = {}
+
+# The indices of elements accepted at each CQL version keyed by version.
+_indices_by_version = {}
+
+# The ids of the compiled patterns in _regex_by_elements.
+_regex_ids = set()
+
+# Guard adding to the caches above so concurrent parses in threads do not
+# compile a pattern twice: the functions which add to the caches are called
+# with _lock held.  The caches are read without the lock and nothing is
+# removed from them.
+_lock = threading.Lock()
+
+
+class LexerError(Exception):
+    """Exception raised if a pattern does not have pattern.cql_re groups."""
+
+
+class _Characters:
+    """Test if a character is in a '[...]' set of an element."""
+
+    __slots__ = ("_negate", "_literals", "_ranges", "_categories")
+
+    def __init__(self, negate, literals, ranges, categories):
+        """Note the characters in the set."""
+        self._negate = negate
+        self._literals = literals
+        self._ranges = ranges
+        self._categories = categories
+
+    def __call__(self, character):
+        """Return True if character is in the set."""
+        found = (
+            character in self._literals
+            or any(low <= character <= high for low, high in self._ranges)
+            or any(match(character) for match in self._categories)
+        )
+        return found is not self._negate
+
+
+def _characters(items):
+    """Return _Characters instance for IN items, or None if any character.
+
+    None means the items were not understood so any character may match.
+
+    """
+    negate = False
+    literals = set()
+    ranges = []
+    categories = []
+    for operator, value in items:
+        name = operator.name
+        if name == "NEGATE":
+            negate = True
+        elif name == "LITERAL":
+            literals.add(chr(value))
+        elif name == "RANGE":
+            ranges.append((chr(value[0]), chr(value[1])))
+        elif name == "CATEGORY" and value.name in _CATEGORY_RE:
+            categories.append(_CATEGORY_RE[value.name].match)
+        else:
+            return None
+    return _Characters(negate, frozenset(literals), ranges, categories)
+
+
+def _first_characters(items):
+    """Return (<can match empty string>, tests) for parsed pattern items.
+
+    Tests is a list of functions which return True for the characters
+    which can start a match, or None if any character can start a match.
+    Anything not understood means any character, or the empty string, can
+    start a match.
+
+    """
+    tests = []
+    for operator, value in items:
+        name = operator.name
+        if name in _ZERO_WIDTH_OPERATORS:
+            continue
+        if name == "LITERAL":
+            tests.append(chr(value).__eq__)
+            return False, tests
+        if name == "NOT_LITERAL":
+            tests.append(chr(value).__ne__)
+            return False, tests
+        if name == "IN":
+            test = _characters(value)
+            if test is None:
+                return True, None
+            tests.append(test)
+            return False, tests
+        if name == "SUBPATTERN":
+            if value[1] & re.IGNORECASE:
+                return True, None
+            subpatterns = (value[-1],)
+            minimum = 1
+        elif name == "ATOMIC_GROUP":
+            subpatterns = (value,)
+            minimum = 1
+        elif name == "BRANCH":
+            subpatterns = value[1]
+            minimum = 1
+        elif name in _REPEAT_OPERATORS:
+            subpatterns = (value[2],)
+            minimum = value[0]
+        else:
+            return True, None
+        empty = False
+        for subpattern in subpatterns:
+            subpattern_empty, subpattern_tests = _first_characters(subpattern)
+            if subpattern_tests is None:
+                return True, None
+            tests.extend(subpattern_tests)
+            empty = empty or subpattern_empty
+        if minimum and not empty:
+            return False, tests
+    return True, tests
+
+
+def _groups(parsed):
+    """Return text which matches the empty string with the groups of parsed.
+
+    The groups are given in the order of their numbers, without nesting,
+    so the group numbers in a pattern are not changed by the replacement.
+    The group enclosing the element in pattern.cql_re is included.
+
+    """
+    state = parsed.state
+    names = {index: name for name, index in state.groupdict.items()}
+    return "".join(
+        "(?P<" + names[index] + ">)" if index in names else "()"
+        for index in range(1, state.groups)
+    )
+
+
+def _analyse_elements():
+    """Populate _elements from pattern.CQL_ELEMENTS if not done already.
+
+    The caller must hold _lock.
+
+    """
+    if _elements:
+        return
+    analysed = []
+    for element in pattern.CQL_ELEMENTS:
+        parsed = sre_parse.parse("(" + element + ")")
+        if parsed.state.flags & re.IGNORECASE:
+            empty, tests = True, None
+        else:
+            empty, tests = _first_characters(parsed)
+        analysed.append((empty, tests, _groups(parsed)))
+    _elements.extend(analysed)
+
+
+def _element_can_start_with(character, empty, tests):
+    """Return True if element can match at character.
+
+    The empty string for character means the end of the string.
+
+    """
+    if empty or tests is None:
+        return True
+    if not character:
+        return False
+    return any(test(character) for test in tests)
+
+
+def _compile(indices):
+    """Return pattern with elements not in indices disabled.
+
+    Each run of disabled elements is replaced by one alternative which
+    always fails, followed by the groups of the elements in the run, so
+    the regular expression engine does not try each disabled element.
+
+    """
+    alternatives = []
+    disabled = []
+    for index, element in enumerate(pattern.CQL_ELEMENTS):
+        if index not in indices:
+            disabled.append(_elements[index][-1])
+            continue
+        if disabled:
+            alternatives.append(_FAIL + "".join(disabled))
+            disabled.clear()
+        alternatives.append("(" + element + ")")
+    if disabled:
+        alternatives.append(_FAIL + "".join(disabled))
+    regex = re.compile("|".join(alternatives))
+    names = pattern.cql_token_names
+    if (
+        regex.groups != len(names)
+        or len(regex.groupindex) != len(set(names.values()))
+        or any(
+            names[index] != name for name, index in regex.groupindex.items()
+        )
+    ):
+        raise LexerError(
+            "".join(
+                (
+                    "Pattern for elements ",
+                    str(sorted(indices)),
+                    " does not have the same groups as cql_re",
+                )
+            )
+        )
+    return regex
+
+
+def _version_indices(version):
+    """Return frozenset of indices of elements accepted at version.
+
+    None means all versions.  The caller must hold _lock.
+
+    """
+    indices = _indices_by_version.get(version)
+    if indices is None:
+        if version is None:
+            indices = frozenset(range(len(pattern.CQL_ELEMENTS)))
+        else:
+            indices = pattern.version_element_indices(version)
+        _indices_by_version[version] = indices
+    return indices
+
+
+def _regex(indices):
+    """Return pattern for elements in indices, compiling it if needed.
+
+    The caller must hold _lock.
+
+    """
+    regex = _regex_by_elements.get(indices)
+    if regex is None:
+        regex = _compile(indices)
+        _regex_by_elements[indices] = regex
+        _regex_ids.add(id(regex))
+    return regex
+
+
+def version_regex(version=None):
+    """Return pattern for elements accepted at CQL version.
+
+    The pattern is pattern.cql_re if version is None.
+
+    """
+    if version is None:
+        return pattern.cql_re
+    with _lock:
+        _analyse_elements()
+        return _regex(_version_indices(version))
+
+
+def regex_for_character(character, version=None):
+    """Return pattern for a match starting at character at CQL version.
+
+    The empty string for character means the end of the string, and None
+    for version means all versions.
+
+    """
+    regex_by_character = _regex_by_character.get(version)
+    if regex_by_character is not None:
+        regex = regex_by_character.get(character)
+        if regex is not None:
+            return regex
+    with _lock:
+        accepted = _version_indices(version)
+        regex_by_character = _regex_by_character.setdefault(version, {})
+        regex = regex_by_character.get(character)
+        if regex is not None:
+            return regex
+        _analyse_elements()
+        regex = _regex(
+            frozenset(
+                index
+                for index, (empty, tests, disabled) in enumerate(_elements)
+                if index in accepted
+                and _element_can_start_with(character, empty, tests)
+            )
+        )
+        regex_by_character[character] = regex
+    return regex
+
+
+def cql_regex(regex):
+    """Return pattern.cql_re if regex was compiled here, otherwise regex."""
+    if id(regex) in _regex_ids:
+        return pattern.cql_re
+    return regex
+
+
+def finditer(string, pos=0, endpos=None, version=None):
+    """Yield re.Match for tokens in string like pattern.cql_re.finditer.
+
+    The matches are for the patterns compiled by regex_for_character so
+    the 're' attribute is not pattern.cql_re, and the 'pos' attribute is
+    the start of the match rather than the pos argument.
+
+    Only the elements accepted at CQL version are matched, or all elements
+    if version is None.
+
+    """
+    # Limit pos and endpos to the string as re.Pattern.finditer does.
+    length = len(string)
+    pos = min(max(pos, 0), length)
+    if endpos is None:
+        endpos = length
+    endpos = min(max(endpos, 0), length)
+    regex_by_character = _regex_by_character.get(version)
+    if regex_by_character is None:
+        regex_for_character("", version=version)
+        regex_by_character = _regex_by_character[version]
+    while pos <= endpos:
+        character = string[pos] if pos < endpos else ""
+        regex = regex_by_character.get(character)
+        if regex is None:
+            regex = regex_for_character(character, version=version)
+        match_ = regex.match(string, pos, endpos)
+        if match_ is None:
+            match_ = version_regex(version).search(string, pos, endpos)
+            if match_ is None:
+                return
+        yield match_
+        start, pos = match_.span()
+        if start == pos:
+            # An empty match: the next match must not be empty at pos.
+            # Let the version's pattern apply the rule.
+            if pos < endpos:
+                tokens = version_regex(version).finditer(string, pos, endpos)
+                next(tokens)
+                yield from tokens
+            return
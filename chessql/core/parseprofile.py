@@ -0,0 +1,157 @@
+# parseprofile.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Record the time spent in each phase of a parse and each node class.
+
+parser.parse(string, profile=True) returns a QueryContainer whose profile
+property is a ParseProfile instance.  The ParseProfile has the time spent
+removing comments, finding tokens with the lexer, and building the node
+tree from the tokens.  It also has, for each node class, the number of
+calls and the cumulative time of the operations named in PROFILED_METHODS.
+
+The operations are timed where the parse does them, by the create_node,
+place_node, and verify_node methods: nodes are created and placed for the
+tokens in the query and in the function bodies expanded at function calls,
+and verified wherever the parse verifies them.  The node classes are not
+changed, so parses without a profile, including those running in other
+threads, do exactly what they would do if no parse were profiled.
+
+The time of a call includes the time of the calls it makes, so the time
+of a place_node_in_tree call which creates and places other nodes
+includes the time of those nodes.  The '__init__' time of a token whose
+node is created by a function, rather than a class, includes the time
+of the function, and is counted for the class of the node returned.
+
+The as_dict and to_json methods export the profile.
+
+"""
+import json
+import time
+
+# The node operations timed in a profiled parse.
+PROFILED_METHODS = (
+    "__init__",
+    "place_node_in_tree",
+    "verify_children_and_set_types",
+)
+
+# The parse phases timed by parser.populate_container().
+PHASES = ("comments", "lexer", "tree")
+
+
+class ParseProfile:
+    """Counts and cumulative times of a parse by phase and node class."""
+
+    __slots__ = ("_phases", "_tokens", "_calls")
+
+    def __init__(self):
+        """Initialise profile with no calls recorded."""
+        self._phases = dict.fromkeys(PHASES, 0.0)
+        self._tokens = 0
+        # [count, seconds] lists keyed by (node class, method name).
+        self._calls = {}
+
+    @property
+    def phases(self):
+        """Return self._phases."""
+        return self._phases
+
+    @property
+    def tokens(self):
+        """Return self._tokens."""
+        return self._tokens
+
+    def add_phase_time(self, phase, seconds, tokens=0):
+        """Add seconds to time of phase and tokens to token count."""
+        self._phases[phase] += seconds
+        self._tokens += tokens
+
+    def add_call(self, class_, name, seconds):
+        """Add a call of method name of class_ which took seconds."""
+        call = self._calls.get((class_, name))
+        if call is None:
+            self._calls[(class_, name)] = [1, seconds]
+        else:
+            call[0] += 1
+            call[1] += seconds
+
+    def calls(self, class_, name):
+        """Return (count, seconds) of calls of method name of class_."""
+        return tuple(self._calls.get((class_, name), (0, 0.0)))
+
+    def create_node(self, class_, match_, container):
+        """Return class_(match_=match_, container=container) after timing.
+
+        The call is recorded as '__init__' for the class of the node
+        returned, because class_ may be a function which decides the class.
+
+        """
+        start = time.perf_counter()
+        node = class_(match_=match_, container=container)
+        self.add_call(node.__class__, "__init__", time.perf_counter() - start)
+        return node
+
+    def place_node(self, node):
+        """Call node.place_node_in_tree() and record the time taken."""
+        start = time.perf_counter()
+        try:
+            node.place_node_in_tree()
+        finally:
+            self.add_call(
+                node.__class__,
+                "place_node_in_tree",
+                time.perf_counter() - start,
+            )
+
+    def verify_node(self, node):
+        """Verify children and set types of node and record the time taken.
+
+        This is called by BaseNode.verify_children_and_set_types() when the
+        parse is profiled.
+
+        """
+        start = time.perf_counter()
+        try:
+            # pylint: disable-next=protected-access
+            node._verify_children_and_set_own_types()
+        finally:
+            self.add_call(
+                node.__class__,
+                "verify_children_and_set_types",
+                time.perf_counter() - start,
+            )
+
+    def as_dict(self):
+        """Return dict of phase times and calls by node class and method.
+
+        The node classes are keyed by '<module>.<class>' names, without
+        the 'chessql.core.' prefix, in descending order of total time.
+
+        """
+        classes = {}
+        for (class_, name), (count, seconds) in self._calls.items():
+            key = ".".join(
+                (class_.__module__.rpartition(".")[-1], class_.__qualname__)
+            )
+            classes.setdefault(key, {})[name] = {
+                "count": count,
+                "seconds": seconds,
+            }
+        return {
+            "tokens": self._tokens,
+            "seconds": sum(self._phases.values()),
+            "phases": dict(self._phases),
+            "classes": dict(
+                sorted(
+                    classes.items(),
+                    key=lambda item: -sum(
+                        call["seconds"] for call in item[1].values()
+                    ),
+                )
+            ),
+        }
+
+    def to_json(self, **kwargs):
+        """Return as_dict() as JSON text: kwargs are passed to json.dumps."""
+        return json.dumps(self.as_dict(), **kwargs)
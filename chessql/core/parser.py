@@ -60,50 +60,132 @@ Since this module is following CQL, not CQLi, the global scope of user
 defined names is acceptable.
 
 """
+import concurrent.futures
 import re
 import os
+import time
 
+from . import basenode
+from . import cqltypes
 from . import elements
+from . import lexer
 from . import pattern
+from . import structure
 from . import tokenmap
 from . import querycontainer
 from . import options
+from . import parseprofile
+from . import compact as compact_module
 
+# Matches the same text as elements.BLOCK_COMMENT but the unrolled loop
+# avoids trying an alternative for each character of long comments.
+_BLOCK_COMMENT = r"(?P<block_comment>)/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"
+
+# Strings are matched so comment markers inside strings are ignored.
+# Text which cannot start a comment or string is skipped by the search
+# rather than matched.
 _comment_re = re.compile(
     r"|".join(
         (
-            elements.BLOCK_COMMENT,
+            _BLOCK_COMMENT,
             elements.LINE_COMMENT,
             elements.STRING,
             elements.COMMENT_SYMBOL,
-            r'(?P<anything_else>)[^/"]+',  # Not elements.ANYTHING_ELSE set.
-            r'[/"]',
         )
     )
 )
 
+# Every comment starts with this character.
+_COMMENT_START = "/"
+
+# The tokens which open and close the nested parts of filters when
+# parse_collecting_errors() looks for a filter to resume the parse.  The
+# closing tokens map to the opening token they close.
+_OPEN_DELIMITERS = ("(", "{", "[")
+_CLOSE_DELIMITERS = {")": "(", "}": "{", "]": "["}
+
+# The functions returning infix operator nodes, which cannot start a filter,
+# in tokenmap.class_from_group_index: classes are tested by issubclass.
+_INFIX_NODE_FUNCTIONS = frozenset(
+    (tokenmap.filters.assign, tokenmap.filters.colon)
+)
+
+
+class ReparseError(Exception):
+    """Exception raised if an edit given to reparse() does not fit string."""
+
 
 def populate_container(container, string, *args):
     """Populate container instance from parsed query in string."""
+    if container.profile is not None:
+        _populate_container_profile(container, string, *args)
+        return
     container.place_node_in_tree()
-    for token in pattern.cql_re.finditer(
-        _remove_comments(string, container), *args
+    class_from_group_index = tokenmap.class_from_group_index
+    for token in lexer.finditer(
+        _remove_comments(string, container), *args, version=container.version
     ):
         container.current_token = token
-        classes = {
-            key: tokenmap.class_from_token_name[key]
-            for key, value in token.groupdict().items()
-            if value is not None
-        }
-        container.raise_if_not_single_match_groupdict_entry(token, classes)
-        for value in classes.values():
-            value(
-                match_=token,
-                container=container,
-            ).place_node_in_tree()
+        container.count_token()
+        class_from_group_index[token.lastindex](
+            match_=token,
+            container=container,
+        ).place_node_in_tree()
 
 
-def parse(string):
+def _populate_container_profile(container, string, *args):
+    """Populate container from query in string recording time of phases.
+
+    The time to find each token is the 'lexer' phase and the time to
+    create and place the node for the token is the 'tree' phase.  The
+    creation and placing of each node is recorded in the profile too.
+
+    """
+    profile = container.profile
+    perf_counter = time.perf_counter
+    lexer_time = 0.0
+    tree_time = 0.0
+    tokens = 0
+    start = perf_counter()
+    string = _remove_comments(string, container)
+    profile.add_phase_time("comments", perf_counter() - start)
+    try:
+        start = perf_counter()
+        container.place_node_in_tree()
+        tree_time += perf_counter() - start
+        class_from_group_index = tokenmap.class_from_group_index
+        token_iterator = lexer.finditer(
+            string, *args, version=container.version
+        )
+        while True:
+            start = perf_counter()
+            token = next(token_iterator, None)
+            lexer_time += perf_counter() - start
+            if token is None:
+                break
+            tokens += 1
+            start = perf_counter()
+            container.current_token = token
+            container.count_token()
+            profile.place_node(
+                profile.create_node(
+                    class_from_group_index[token.lastindex], token, container
+                )
+            )
+            tree_time += perf_counter() - start
+    finally:
+        profile.add_phase_time("lexer", lexer_time, tokens=tokens)
+        profile.add_phase_time("tree", tree_time)
+
+
+def parse(
+    string,
+    share_function_bodies=False,
+    compact=False,
+    version=None,
+    limits=None,
+    profile=False,
+):
     """Return a QueryContainer instance for query in string.
 
     A basenode.NodeError is raised if the parse fails.
@@ -111,12 +193,780 @@ def parse(string):
     The command line is ignored: the caller must make arrangements to
     provide a query string.
 
+    If share_function_bodies is True the function calls which expand to
+    the same body, apart from variable names, share one copy of the body.
+    See tokenmap.share_function_bodies().
+
+    If compact is True the nodes keep compact.TokenMatch instances rather
+    than re.Match instances.  See compact.compact_container().
+
+    If version is given only the tokens of that CQL version, one of the
+    pattern.CQL_VERSIONS, are accepted.  A pattern.PatternError is raised
+    if version is not one of these.
+
+    If limits is a querycontainer.ParseLimits instance the parse stops
+    with a querycontainer.ParseLimitError, a subclass of NodeError, when
+    a limit is exceeded.
+
+    If profile is True the container's profile property is bound to a
+    parseprofile.ParseProfile instance with the time spent in each phase
+    of the parse and in the methods of each node class.
+
+    An exception raised while parsing the query has a span attribute, the
+    span of the token being processed or None, so callers which report
+    failures, like batchparser, can say where the parse stopped.
+
     """
     container = querycontainer.QueryContainer()
-    populate_container(container, string)
+    if version is not None:
+        pattern.version_element_indices(version)
+        container.version = version
+    container.limits = limits
+    if profile:
+        container.profile = parseprofile.ParseProfile()
+    try:
+        populate_container(container, string)
+    except Exception as exc:
+        token = container.current_token
+        exc.span = None if token is None else token.span()
+        raise
+    if share_function_bodies:
+        tokenmap.share_function_bodies(container)
+    if compact:
+        compact_module.compact_container(container)
     return container
 
 
+def parse_many(strings, executor=None, return_exceptions=False, **kwargs):
+    """Return list of QueryContainer instances for queries in strings.
+
+    The queries are parsed by parse(string, **kwargs) in the threads of
+    executor, a concurrent.futures.Executor, or of a ThreadPoolExecutor
+    created for the call if executor is None.  The containers are in the
+    order of strings.
+
+    If return_exceptions is False the exception raised by the first query,
+    in the order of strings, which fails to parse is raised and the parse
+    of queries not started is cancelled.  Otherwise the exception is put
+    in the list in place of the container.
+
+    All the state of a parse, including the profile if profile=True, is
+    held in its QueryContainer: the lexer caches of compiled patterns, the
+    only module level state changed by a parse, are guarded by a lock.
+
+    """
+    if executor is None:
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            return parse_many(
+                strings,
+                executor=executor,
+                return_exceptions=return_exceptions,
+                **kwargs,
+            )
+    futures = [executor.submit(parse, string, **kwargs) for string in strings]
+    containers = []
+    try:
+        for future in futures:
+            if not return_exceptions:
+                containers.append(future.result())
+                continue
+            exception = future.exception()
+            containers.append(
+                future.result() if exception is None else exception
+            )
+    finally:
+        for future in futures:
+            future.cancel()
+    return containers
+
+
+def parse_collecting_errors(
+    string, version=None, limits=None, max_errors=None
+):
+    """Return (QueryContainer or None, list of errors) for query in string.
+
+    The parse does not stop at the first error.  Each error is recorded as
+    a dict with the keys 'error', the message, and 'span', the [start, end]
+    span of the token being processed, as in the batchparser results.  The
+    top-level filter containing the error is dropped and the parse resumes
+    at the next top-level filter, or after the '}' or ')' closing the
+    nested part of the filter containing the error.
+
+    The query is split into tokens once.  Each error causes the node tree
+    to be built again from the kept tokens because the tree, definitions,
+    and variable types, built before the error cannot be unwound.
+
+    The QueryContainer has the top-level filters without errors, and is
+    None if the parse could not be completed: errors found at the end of
+    the query, in the 'cql(...)' header, or a limit exceeded, stop the
+    parse.  It stops also when max_errors errors have been found.  But
+    the names not assigned, reported at the end of the query, are each
+    reported and dropped before the parse is completed.
+
+    Errors after the first may be caused by dropping a filter: a variable
+    assigned in the dropped filter is not assigned in the kept filters.
+
+    The version and limits arguments are as for parse().
+
+    """
+    if max_errors is not None and max_errors < 1:
+        raise ValueError("max_errors must be greater than zero")
+    if version is not None:
+        pattern.version_element_indices(version)
+    tokens = None
+    skipped = set()
+    errors = []
+    # The (start, resume, message, previous) details of the latest tokens
+    # skipped: tokens[start:resume] were skipped for the error message, and
+    # previous is the start of the filter before tokens[start] if the error
+    # may be in that filter.
+    latest_skip = None
+    while True:
+        container = querycontainer.QueryContainer()
+        container.version = version
+        container.limits = limits
+        blanked = _remove_comments(string, container)
+        if tokens is None:
+            tokens = list(lexer.finditer(blanked, version=version))
+        failure = _populate_container_skipping(container, tokens, skipped)
+        if failure is None:
+            return container, errors
+        exc, index, start, previous = failure
+        message = _error_message(exc)
+
+        # A name not assigned is reported when the end of the query is
+        # reached.  The name is dropped and the parse tried again to find
+        # any other names not assigned.
+        if isinstance(exc, tokenmap.filters.UnassignedVariableError):
+            errors.append(
+                {"error": message, "span": list(tokens[index].span())}
+            )
+            if len(errors) == max_errors:
+                return None, errors
+            skipped.add(_token_index(tokens, exc.match_, skipped))
+            latest_skip = None
+            continue
+
+        # An error at the token where the parse resumed is not recorded.
+        # The same error again means the error was found verifying the
+        # filter before the skipped tokens when the next filter started,
+        # so that filter is skipped instead.  Otherwise the token is taken
+        # as not starting a filter and the next start is found.
+        if latest_skip is not None and index == latest_skip[1]:
+            skip_start, resume, skip_message, skip_previous = latest_skip
+            if message == skip_message and skip_previous is not None:
+                skipped.difference_update(range(skip_start, resume))
+                skipped.update(range(skip_previous, skip_start))
+                latest_skip = (skip_previous, skip_start, message, None)
+                continue
+            if index < len(tokens) - 1:
+                resume = _next_filter_start(tokens, skip_start, index)
+                skipped.update(range(skip_start, resume))
+                latest_skip = (skip_start, resume, skip_message, skip_previous)
+                continue
+        errors.append({"error": message, "span": list(tokens[index].span())})
+        if (
+            start is None
+            or index == len(tokens) - 1
+            or isinstance(exc, querycontainer.ParseLimitError)
+            or len(errors) == max_errors
+        ):
+            return None, errors
+        resume = _next_filter_start(tokens, start, index)
+        skipped.update(range(start, resume))
+        latest_skip = (start, resume, message, previous)
+
+
+def _token_index(tokens, match_, skipped):
+    """Return index of token in tokens, not in skipped, with match_ span."""
+    span = match_.span()
+    for index, token in enumerate(tokens):
+        if token.span() == span and index not in skipped:
+            return index
+    raise RuntimeError("A token with the span of match_ is expected")
+
+
+def _populate_container_skipping(container, tokens, skipped):
+    """Populate container from tokens except those indexed in skipped.
+
+    Return None if container is populated.  Otherwise return (exception,
+    index, start, previous) where index is the token causing exception,
+    and start is the index of the first token of the top-level filter
+    containing the error.  The start is None if the error is in the
+    'cql(...)' header.  If start is index the error may be in the filter
+    before, and previous is the index of it's first token: otherwise
+    previous is None.
+
+    """
+    container.place_node_in_tree()
+    class_from_group_index = tokenmap.class_from_group_index
+    cql_node = None
+    header_end = None
+    filter_start = None
+    filter_count = None
+    index = 0
+    try:
+        for index, token in enumerate(tokens):
+            if index in skipped:
+                continue
+            # The number of top-level filters if token may start a filter.
+            filter_count = None
+            if cql_node is not None and token.group().strip():
+                if _top_level_filters_full(container, cql_node):
+                    filter_count = len(cql_node.children)
+            container.current_token = token
+            container.count_token()
+            class_from_group_index[token.lastindex](
+                match_=token,
+                container=container,
+            ).place_node_in_tree()
+            if cql_node is None:
+                if container.children:
+                    cql_node = container.children[0]
+                    header_end = cql_node.match_.end()
+            elif (
+                filter_count is not None
+                and len(cql_node.children) > filter_count
+            ):
+                filter_start = index
+    # Some invalid queries cause exceptions other than NodeError.  These
+    # are recorded like NodeError, with the exception name.
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        if cql_node is None or tokens[index].start() < header_end:
+            return exc, index, None, None
+        if filter_count is not None:
+            return exc, index, index, filter_start
+        if filter_start is None:
+            return exc, index, index, None
+        return exc, index, filter_start, None
+    return None
+
+
+def _top_level_filters_full(container, cql_node):
+    """Return True if the nodes from cursor up to cql_node are full.
+
+    Then the next token starts a top-level filter, or is an infix operator
+    taking the latest top-level filter as it's left operand.
+
+    """
+    node = container.cursor
+    while node is not cql_node and node is not None:
+        if not node.full():
+            return False
+        node = node.parent
+    return True
+
+
+def _next_filter_start(tokens, start, index):
+    """Return index of token where parse resumes after error at index.
+
+    The parse resumes at the first token after index, not in a part of
+    the filter starting at tokens[start] nested in '(', '{', or '[', which
+    follows whitespace or a closing ')', '}', or ']', and is not an infix
+    operator.  A closing token ends the nested part only if it matches the
+    opening token.  The last token, the end of the query, is returned if
+    no other token is found.
+
+    """
+    # The '(', '{', and '[', which are open.  A closing ')', '}', or ']'
+    # closes the innermost matching one and those opened after it, and is
+    # ignored if none match.
+    opened = []
+    previous = None
+    for position in range(start, len(tokens) - 1):
+        text = tokens[position].group()
+        if (
+            position > index
+            and not opened
+            and text.strip()
+            and (not previous.strip() or previous in _CLOSE_DELIMITERS)
+            and not _is_infix_operator(tokens[position])
+        ):
+            return position
+        if text in _CLOSE_DELIMITERS:
+            opener = _CLOSE_DELIMITERS[text]
+            if opener in opened:
+                del opened[len(opened) - opened[::-1].index(opener) - 1 :]
+        elif text.endswith(_OPEN_DELIMITERS):
+            opened.append(text[-1])
+        previous = text
+    return len(tokens) - 1
+
+
+def _is_infix_operator(token):
+    """Return True if token is an infix operator."""
+    node_class = tokenmap.class_from_group_index[token.lastindex]
+    if isinstance(node_class, type):
+        return issubclass(node_class, structure.Infix)
+    return node_class in _INFIX_NODE_FUNCTIONS
+
+
+def _error_message(exc):
+    """Return message for exc, prefixed by it's name if not a NodeError."""
+    if isinstance(exc, basenode.NodeError):
+        return str(exc)
+    return ": ".join((exc.__class__.__name__, str(exc)))
+
+
+def reparse(container, string, offset, removed, inserted, compact=False):
+    """Return a QueryContainer for query in string after an edit.
+
+    The container is the QueryContainer returned by parse() for string,
+    and the edit replaces the removed characters at offset in string by
+    the str in inserted.
+
+    The top-level filters of the 'cql(...)' node which contain the edit
+    are parsed again, with one unchanged filter either side which must be
+    parsed the same as before.  The new filters replace the old ones in
+    container, the other filters are kept, and container is returned.
+
+    The matches of the filters after the edit are replaced by matches at
+    their positions in the edited string.  The matches of the filters
+    before the edit are kept: their 'string' attribute is the query before
+    the edit, which is the same as the edited query up to the end of the
+    match.
+
+    The result is the same as parse() of the edited string, at the CQL
+    version of container, and a new QueryContainer from parse() is
+    returned when this cannot be shown.  Queries which define functions,
+    edits of the 'cql(...)' header, and edits which change how the
+    neighbouring filters are parsed, are examples.  The exception raised
+    by parse(), a basenode.NodeError usually, is raised if the edited
+    string is not a valid query.
+
+    If compact is True the new QueryContainer from parse() is always
+    returned, with compact.TokenMatch instances, because the matches of
+    the kept filters cannot be moved in a compacted container.  The new
+    QueryContainer is always returned if container has limits, so the
+    limits apply to the whole edited query.
+
+    A ReparseError is raised if offset and removed do not fit string.
+
+    """
+    if offset < 0 or removed < 0 or offset + removed > len(string):
+        raise ReparseError(
+            "".join(
+                (
+                    "Edit removing ",
+                    str(removed),
+                    " characters at offset ",
+                    str(offset),
+                    " does not fit string of length ",
+                    str(len(string)),
+                )
+            )
+        )
+    edited = "".join((string[:offset], inserted, string[offset + removed :]))
+    if not compact and _reparse_edit(
+        container, string, edited, offset, removed
+    ):
+        return container
+    return parse(
+        edited,
+        compact=compact,
+        version=container.version,
+        limits=container.limits,
+    )
+
+
+def _reparse_edit(container, string, edited, offset, removed):
+    """Return True if edit is applied to container by reparsing filters.
+
+    The container is not changed if False is returned.
+
+    """
+    current_token = container.current_token
+    if not isinstance(current_token, re.Match):
+        return False
+    # The limits apply to the parse of the whole edited query.
+    if container.limits is not None:
+        return False
+    blanked = current_token.string
+    if len(blanked) != len(string) or _defines_function(container):
+        return False
+    if len(container.children) != 1:
+        return False
+    cql_node = container.children[0]
+    children = cql_node.children
+    if not isinstance(cql_node, tokenmap.cql.CQL) or not children:
+        return False
+    header_end = cql_node.match_.end()
+    if offset <= header_end:
+        return False
+
+    # The filters containing the edit, and a filter either side, are
+    # children[low:high], from region_start to before region_end.  The
+    # region includes the end of stream token if high is len(children).
+    delta = len(edited) - len(string)
+    starts = {}
+    low = max(_child_at(children, offset, starts) - 1, 0)
+    high = min(
+        _child_at(children, offset + removed, starts) + 2,
+        len(children),
+    )
+    if low:
+        region_start = _child_start(children, low, starts)
+    else:
+        region_start = header_end
+    at_end = high == len(children)
+    if at_end:
+        region_end = len(blanked) + 1
+    else:
+        region_end = _child_start(children, high, starts)
+    edited_region_end = region_end + delta
+
+    scratch = querycontainer.QueryContainer()
+    scratch.version = container.version
+    scratch.place_node_in_tree()
+    edited_blanked = _remove_comments(edited, scratch)
+    if _comments_outside_region(
+        container.whitespace, region_start, region_end, delta
+    ) != _comments_outside_region(
+        scratch.whitespace, region_start, edited_region_end, 0
+    ):
+        return False
+    tokens = _region_tokens(
+        edited_blanked,
+        cql_node.match_.span(),
+        region_start,
+        edited_region_end,
+        container.version,
+    )
+    if tokens is None:
+        return False
+    class_from_group_index = tokenmap.class_from_group_index
+    # The parse of the edited string raises the exception, if any, so the
+    # error is reported for the query rather than the region.
+    try:
+        for token in tokens:
+            scratch.current_token = token
+            class_from_group_index[token.lastindex](
+                match_=token,
+                container=scratch,
+            ).place_node_in_tree()
+    except Exception:  # pylint: disable=broad-exception-caught
+        return False
+    if len(scratch.children) != 1 or _defines_function(scratch):
+        return False
+    scratch_cql_node = scratch.children[0]
+    new_children = scratch_cql_node.children
+
+    # The unchanged filters either side of the edit must be parsed the
+    # same as before.  Then the parse of the filters before the region is
+    # not affected by the edit, and the filters after the region are
+    # parsed the same because the parse proceeds from left to right.
+    buffers = []
+    if low:
+        buffers.append((new_children[:1], children[low], 0))
+    if not at_end:
+        buffers.append((new_children[-1:], children[high - 1], delta))
+    if len(new_children) < len(buffers):
+        return False
+    # Some filter_type properties raise NodeError if the filter's names are
+    # not known, which is taken as a difference.
+    try:
+        for new_child, old_child, shift in buffers:
+            if not new_child or _tree_signature(
+                new_child[0], 0
+            ) != _tree_signature(old_child, shift):
+                return False
+    except basenode.NodeError:
+        return False
+
+    old_nodes = _tree_nodes(children[low:high])
+    new_nodes = _tree_nodes(new_children)
+    definitions = _edited_definitions(
+        container.definitions,
+        scratch.definitions,
+        old_nodes + new_nodes,
+        children[:low],
+        children[high:],
+    )
+    if definitions is None:
+        return False
+
+    # The nodes after the region get matches on the edited string moved by
+    # delta.  The matches before the region are kept: their string is the
+    # same as the edited string up to the end of the match.
+    prefix_space, old_space, suffix_space = _partition(
+        container.whitespace, region_start, region_end
+    )
+    kept_nodes = _tree_nodes(children[high:])
+    kept_nodes.extend(suffix_space)
+    edited_matches = {}
+    replacements = []
+    for node in kept_nodes:
+        match_ = node.match_
+        if match_ is None:
+            continue
+        edited_match = edited_matches.get(id(match_))
+        if edited_match is None:
+            if _is_comment(node):
+                edited_string = edited
+            elif _is_query_match(match_):
+                edited_string = edited_blanked
+            else:
+                continue
+            start, end = match_.span()
+            if start < region_end:
+                return False
+            edited_match = match_.re.match(
+                edited_string, start + delta, match_.endpos + delta
+            )
+            if (
+                edited_match is None
+                or edited_match.end() != end + delta
+                or edited_match.lastindex != match_.lastindex
+            ):
+                return False
+            edited_matches[id(match_)] = edited_match
+        replacements.append((node, edited_match))
+
+    # Apply the edit to container.
+    dummy, new_space, dummy = _partition(
+        scratch.whitespace, region_start, edited_region_end
+    )
+    for node, edited_match in replacements:
+        node.match_ = edited_match
+    for node in new_nodes + new_space:
+        node.container = container
+    for child in new_children:
+        child.parent = cql_node
+    children[low:high] = new_children
+    container.whitespace[:] = sorted(
+        prefix_space + new_space + suffix_space,
+        key=lambda node: not _is_comment(node),
+    )
+    before, dummy, after = _partition(
+        container.open_delimiters, region_start, region_end
+    )
+    dummy, inside, dummy = _partition(
+        scratch.open_delimiters, region_start, edited_region_end
+    )
+    container.open_delimiters[:] = before + inside + after
+    new_node_set = set(new_nodes + new_space)
+    verified = container.verified
+    verified.difference_update(old_nodes + old_space)
+    verified.update(node for node in scratch.verified if node in new_node_set)
+    container.definitions.clear()
+    container.definitions.update(definitions)
+    if at_end:
+        container.current_token = scratch.current_token
+        if scratch.cursor is scratch_cql_node:
+            container.cursor = cql_node
+        elif scratch.cursor is not scratch:
+            container.cursor = scratch.cursor
+    else:
+        container.current_token = edited_matches[id(current_token)]
+    return True
+
+
+def _defines_function(container):
+    """Return True if a function is defined in container."""
+    return any(
+        isinstance(definition, cqltypes.Function)
+        for definition in container.definitions.values()
+    )
+
+
+def _is_comment(node):
+    """Return True if node is a comment removed by _remove_comments()."""
+    return isinstance(
+        node, (tokenmap.filters.BlockComment, tokenmap.filters.LineComment)
+    )
+
+
+def _is_query_match(match_):
+    """Return True if match_ is a token of the query string.
+
+    Other matches, for the names of variables in ranges for example, are
+    on strings which are not the query.
+
+    """
+    return lexer.cql_regex(match_.re) is pattern.cql_re
+
+
+def _child_start(children, index, starts):
+    """Return start of first token in query of children[index].
+
+    The start is cached in starts, keyed by index.
+
+    """
+    start = starts.get(index)
+    if start is None:
+        start = min(
+            node.match_.start()
+            for depth, node in children[index].iter_tree()
+            if node.match_ is not None and _is_query_match(node.match_)
+        )
+        starts[index] = start
+    return start
+
+
+def _child_at(children, position, starts):
+    """Return index of last of children starting at or before position.
+
+    The index is -1 if all children start after position.
+
+    """
+    low = 0
+    high = len(children)
+    while low < high:
+        middle = (low + high) // 2
+        if _child_start(children, middle, starts) <= position:
+            low = middle + 1
+        else:
+            high = middle
+    return low - 1
+
+
+def _tree_nodes(children):
+    """Return list of nodes in the trees of children."""
+    return [node for child in children for depth, node in child.iter_tree()]
+
+
+def _partition(nodes, region_start, region_end):
+    """Return lists of nodes starting before, in, and after, region."""
+    before = []
+    inside = []
+    after = []
+    for node in nodes:
+        start = node.match_.start()
+        if start < region_start:
+            before.append(node)
+        elif start < region_end:
+            inside.append(node)
+        else:
+            after.append(node)
+    return before, inside, after
+
+
+def _comments_outside_region(nodes, region_start, region_end, delta):
+    """Return list of (start, text) of comments outside region in nodes.
+
+    The starts of comments after the region are moved by delta.  None is
+    returned if a comment crosses a boundary of the region.
+
+    """
+    comments = []
+    for node in nodes:
+        if not _is_comment(node):
+            continue
+        start, end = node.match_.span()
+        if end <= region_start:
+            comments.append((start, node.match_.group()))
+        elif start >= region_end:
+            comments.append((start + delta, node.match_.group()))
+        elif start < region_start or end > region_end:
+            return None
+    return comments
+
+
+def _region_tokens(string, header_span, region_start, region_end, version):
+    """Return list of tokens for header and region of string.
+
+    The 'cql(...)' header ends at header_span[-1], and the tokens of the
+    region are followed by an end of stream token at region_end unless
+    the region includes the end of string.  None is returned if a token
+    crosses region_end.
+
+    """
+    tokens = []
+    for token in lexer.finditer(string, version=version):
+        if token.start() >= header_span[-1]:
+            break
+        tokens.append(token)
+    if not tokens or tokens[-1].span() != header_span:
+        return None
+    for token in lexer.finditer(string, region_start, version=version):
+        if token.start() >= region_end:
+            break
+        if token.end() > region_end:
+            return None
+        tokens.append(token)
+    else:
+        return tokens
+    if token.start() != region_end:
+        return None
+    end_of_stream = lexer.regex_for_character("", version=version).match(
+        string, region_end, region_end
+    )
+    if (
+        end_of_stream is None
+        or pattern.cql_token_names[end_of_stream.lastindex] != "end_of_stream"
+    ):
+        return None
+    tokens.append(end_of_stream)
+    return tokens
+
+
+def _tree_signature(node, delta):
+    """Return list describing the tree of node with positions in query.
+
+    The starts of matches on the query are moved by delta so trees parsed
+    from different positions can be compared.
+
+    """
+    signature = []
+    for depth, item in node.iter_tree():
+        match_ = item.match_
+        if match_ is None:
+            position = None
+        elif _is_query_match(match_):
+            position = (match_.start() + delta, match_.group())
+        else:
+            position = (match_.start(), match_.group())
+        signature.append(
+            (
+                depth,
+                item.__class__,
+                item.filter_type,
+                item.name,
+                item.completed,
+                position,
+            )
+        )
+    return signature
+
+
+def _edited_definitions(
+    definitions,
+    scratch_definitions,
+    region_nodes,
+    prefix_children,
+    suffix_children,
+):
+    """Return dict of definitions after edit, or None if not known.
+
+    The names defined or used in region_nodes must not be used in the
+    trees of prefix_children and suffix_children, so the definitions made
+    by the filters before the region do not affect the parse of the region
+    and the definitions made in the region do not affect the parse of
+    filters after the region.
+
+    """
+    names = definitions.keys() | scratch_definitions.keys()
+    if not names:
+        return {}
+    region_names = {node.name for node in region_nodes} & names
+    prefix_names = {node.name for node in _tree_nodes(prefix_children)} & names
+    suffix_names = {node.name for node in _tree_nodes(suffix_children)} & names
+    if region_names & (prefix_names | suffix_names):
+        return None
+    edited = {
+        name: definition
+        for name, definition in definitions.items()
+        if name not in region_names and name not in suffix_names
+    }
+    edited.update(scratch_definitions)
+    edited.update(
+        (name, definition)
+        for name, definition in definitions.items()
+        if name in suffix_names
+    )
+    return edited
+
+
 def parse_command_line_query():
     """Return QueryContainer instance for query specified in command line.
 
@@ -156,34 +1006,31 @@ def parse_debug(string, tree_only=False, tokens_only=False):
         tokens_only = False
     container = querycontainer.QueryContainer()
     container.place_node_in_tree()
-    for token in pattern.cql_re.finditer(_remove_comments(string, container)):
-        classes = {
-            key: tokenmap.class_from_token_name[key]
-            for key, value in token.groupdict().items()
-            if value is not None
-        }
-        container.raise_if_not_single_match_groupdict_entry(token, classes)
-        for value in classes.values():
-            if not tree_only:
-                if not tokens_only:
-                    print()
-                print(token)
-                if not tokens_only:
-                    print("*cursor*", _parent_class_trace(container.cursor))
-            cqlobj = value(match_=token, container=container)
-            if not tree_only:
-                if not tokens_only:
-                    print("*init match*", _parent_match_trace(cqlobj))
-                    print("*init class*", _parent_class_trace(cqlobj))
-            cqlobj.place_node_in_tree()
-            if not tree_only:
-                if not tokens_only:
-                    print("*place match*", _parent_match_trace(cqlobj))
-                    print("*place class*", _parent_class_trace(cqlobj))
-                    print(
-                        "*cursor*",
-                        _parent_class_trace(container.cursor),
-                    )
+    for token in lexer.finditer(
+        _remove_comments(string, container), version=container.version
+    ):
+        if not tree_only:
+            if not tokens_only:
+                print()
+            print(token)
+            if not tokens_only:
+                print("*cursor*", _parent_class_trace(container.cursor))
+        cqlobj = tokenmap.class_from_group_index[token.lastindex](
+            match_=token, container=container
+        )
+        if not tree_only:
+            if not tokens_only:
+                print("*init match*", _parent_match_trace(cqlobj))
+                print("*init class*", _parent_class_trace(cqlobj))
+        cqlobj.place_node_in_tree()
+        if not tree_only:
+            if not tokens_only:
+                print("*place match*", _parent_match_trace(cqlobj))
+                print("*place class*", _parent_class_trace(cqlobj))
+                print(
+                    "*cursor*",
+                    _parent_class_trace(container.cursor),
+                )
     return container
 
 
@@ -207,6 +1054,10 @@ def _remove_comments(string, container):
     The simplest solution given the pattern is pre-process the query to
     remove the comments.
 
+    The search for comments is done by the regular expression module, and
+    string is returned unchanged if it has no comments, to avoid copying
+    long queries.  Text between comments is copied in slices.
+
     """
     # It looks possible to have another class to represent the kind of
     # left parenthesis in 'ray(R k)', chosen in the parenthesis_left()
@@ -220,13 +1071,18 @@ def _remove_comments(string, container):
             " but it is a ",
             container.__class__.__name__.join("''"),
         )
+    if _COMMENT_START not in string:
+        return string
     block_comment = tokenmap.filters.BlockComment
     line_comment = tokenmap.filters.LineComment
     no_comments = []
+    end = 0
     for token in _comment_re.finditer(string):
         group = token.group
         if group(1) is not None:
+            no_comments.append(string[end : token.start()])
             no_comments.append(" " * len(group()))
+            end = token.end()
             block_comment(
                 match_=token, container=container
             ).place_node_in_tree()
@@ -234,12 +1090,15 @@ def _remove_comments(string, container):
             # Retain the assumed trailing '\n' because, for example,
             # 'path nestban quiet // comment\nwtm' is valid but
             # 'path nestban quiet // comment\n\nwtm' is not valid.
+            no_comments.append(string[end : token.start()])
             no_comments.append(" " * (len(group()) - 1) + group()[-1])
+            end = token.end()
             line_comment(
                 match_=token, container=container
             ).place_node_in_tree()
-        else:
-            no_comments.append(group())
+    if not no_comments:
+        return string
+    no_comments.append(string[end:])
     return "".join(no_comments)
 
 
@@ -0,0 +1,290 @@
+# persist.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Save and restore QueryContainer node trees without parsing the query.
+
+The node tree, the definitions, the cql() parameters, the whitespace
+and comment nodes, and the filter, variable, and persistence, types of
+the nodes and definitions are saved in pickle format.
+
+Nodes refer to the re.Match instances which created them.  These cannot
+be pickled so each is saved as it's pattern, string, span, and the spans
+of the groups which took part in the match.  The restored nodes refer to
+SavedMatch instances which provide the parts of the re.Match interface
+used by the node classes.  Neither the regular expression nor the
+place_node_in_tree methods are run when restoring a node tree.
+
+Any object which can be pickled and contains QueryContainer instances,
+a dict of QueryContainer instances keyed by query file name for example,
+can be saved and restored.
+
+The saved data includes the chessql version which saved it, or a hash
+of the chessql.core source if chessql is not installed, and restore is
+refused if the version is different.  Only restore data from trusted
+sources: the pickle module is not secure against maliciously constructed
+data.
+
+"""
+import copyreg
+import gc
+import hashlib
+import importlib.metadata
+import io
+import itertools
+import operator
+import os
+import pickle
+import re
+
+from . import lexer
+
+
+def _source_version():
+    """Return version derived from the source of the chessql.core modules.
+
+    This is used when chessql is not installed, so data saved by other
+    source is still refused.
+
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py"):
+            with open(os.path.join(directory, name), mode="rb") as file:
+                digest.update(name.encode("utf-8"))
+                digest.update(file.read())
+    return "source-" + digest.hexdigest()
+
+
+# The chessql version saved with the data.
+try:
+    VERSION = importlib.metadata.version("chessql")
+except importlib.metadata.PackageNotFoundError:
+    VERSION = _source_version()
+
+# Identify data saved by this module.
+_FORMAT = "chessql.persist.1"
+
+
+class PersistError(Exception):
+    """Exception raised for problems saving or restoring node trees."""
+
+
+class SavedMatch:
+    """Provide the re.Match interface used by nodes for a saved match.
+
+    Only the groups which took part in the match are kept, in the spans
+    dict keyed by group index.
+    """
+
+    __slots__ = ("re", "string", "pos", "endpos", "lastindex", "_spans")
+
+    def __init__(self, regex, string, pos, endpos, lastindex, spans):
+        """Set details of match of regex in string."""
+        self.re = regex
+        self.string = string
+        self.pos = pos
+        self.endpos = endpos
+        self.lastindex = lastindex
+        self._spans = spans
+
+    def __repr__(self):
+        """Return str like repr of re.Match instance."""
+        return "".join(
+            (
+                "<",
+                self.__class__.__name__,
+                " object; span=",
+                str(self.span()),
+                ", match=",
+                repr(self.group()),
+                ">",
+            )
+        )
+
+    def __getitem__(self, group):
+        """Return self.group(group)."""
+        return self.group(group)
+
+    @property
+    def lastgroup(self):
+        """Return name of last matched group or None."""
+        for name, index in self.re.groupindex.items():
+            if index == self.lastindex:
+                return name
+        return None
+
+    @property
+    def regs(self):
+        """Return tuple of spans of all groups, (-1, -1) if not matched."""
+        spans = self._spans
+        return tuple(
+            spans.get(index, (-1, -1)) for index in range(self.re.groups + 1)
+        )
+
+    def _index(self, group):
+        """Return index of group, which may be a group name."""
+        if isinstance(group, str):
+            try:
+                return self.re.groupindex[group]
+            except KeyError as exc:
+                raise IndexError("no such group") from exc
+        if not 0 <= group <= self.re.groups:
+            raise IndexError("no such group")
+        return group
+
+    def span(self, group=0):
+        """Return (start, end) of group, (-1, -1) if not matched."""
+        return self._spans.get(self._index(group), (-1, -1))
+
+    def start(self, group=0):
+        """Return start of group, -1 if not matched."""
+        return self.span(group)[0]
+
+    def end(self, group=0):
+        """Return end of group, -1 if not matched."""
+        return self.span(group)[1]
+
+    def _group(self, group, default=None):
+        """Return str matched by group or default if not matched."""
+        span = self._spans.get(self._index(group))
+        if span is None:
+            return default
+        return self.string[span[0] : span[1]]
+
+    def group(self, *groups):
+        """Return str, or tuple of str, matched by groups."""
+        if not groups:
+            return self._group(0)
+        if len(groups) == 1:
+            return self._group(groups[0])
+        return tuple(self._group(group) for group in groups)
+
+    def groups(self, default=None):
+        """Return tuple of str matched by all groups except group 0."""
+        return tuple(
+            self._group(index, default=default)
+            for index in range(1, self.re.groups + 1)
+        )
+
+    def groupdict(self, default=None):
+        """Return dict of str matched by named groups keyed by name."""
+        return {
+            name: self._group(index, default=default)
+            for name, index in self.re.groupindex.items()
+        }
+
+
+def _reduce_match(match_):
+    """Return arguments to create SavedMatch instance equivalent to match_."""
+    span = match_.span
+    matched = itertools.compress(
+        itertools.count(1),
+        map(operator.is_not, match_.groups(), itertools.repeat(None)),
+    )
+    spans = {index: span(index) for index in matched}
+    spans[0] = span()
+    return (
+        SavedMatch,
+        (
+            lexer.cql_regex(match_.re),
+            match_.string,
+            match_.pos,
+            match_.endpos,
+            match_.lastindex,
+            spans,
+        ),
+    )
+
+
+def _reduce_pattern(pattern):
+    """Return arguments to compile pattern with re module cache lookup.
+
+    The default reduction passes pattern.flags to re.compile, which is a
+    different cache key to the one for the original re.compile call when
+    the flags include the implied re.UNICODE flag.
+
+    """
+    flags = pattern.flags
+    if isinstance(pattern.pattern, str):
+        flags &= ~re.UNICODE
+    return (re.compile, (pattern.pattern, flags))
+
+
+def _without_garbage_collection(function, *args):
+    """Return function(*args) with garbage collection disabled.
+
+    Creating or scanning many objects which are referenced by others, the
+    nodes of a tree for example, triggers frequent and expensive garbage
+    collection cycles which find nothing to collect.
+
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return function(*args)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def dump(obj, file):
+    """Write obj, usually a QueryContainer instance, to binary file."""
+    pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[re.Match] = _reduce_match
+    pickler.dispatch_table[re.Pattern] = _reduce_pattern
+    _without_garbage_collection(pickler.dump, (_FORMAT, VERSION, obj))
+
+
+def dumps(obj):
+    """Return bytes for obj, usually a QueryContainer instance."""
+    file = io.BytesIO()
+    dump(obj, file)
+    return file.getvalue()
+
+
+def _verify_header(saved):
+    """Return object in saved after verifying the format and version."""
+    if not isinstance(saved, tuple) or len(saved) != 3:
+        raise PersistError("Data was not saved by chessql persist module")
+    format_, version, obj = saved
+    if format_ != _FORMAT:
+        raise PersistError(
+            "".join(
+                (
+                    "Data format is ",
+                    str(format_).join("''"),
+                    " but ",
+                    _FORMAT.join("''"),
+                    " is expected",
+                )
+            )
+        )
+    if version != VERSION:
+        raise PersistError(
+            "".join(
+                (
+                    "Data was saved by chessql version ",
+                    str(version).join("''"),
+                    " but this is version ",
+                    VERSION.join("''"),
+                )
+            )
+        )
+    return obj
+
+
+def load(file):
+    """Return object, usually a QueryContainer instance, read from file."""
+    return _verify_header(_without_garbage_collection(pickle.load, file))
+
+
+def loads(data):
+    """Return object, usually a QueryContainer instance, in bytes data.
+
+    Any bytes-like object is accepted, including a mmap.mmap instance.
+
+    """
+    return _verify_header(_without_garbage_collection(pickle.loads, data))
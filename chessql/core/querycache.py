@@ -0,0 +1,217 @@
+# querycache.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Cache of QueryContainer instances created by parser.parse.
+
+Applications which parse the same queries repeatedly can use a QueryCache
+instance to avoid rebuilding the QueryContainer node tree each time.
+
+The cache key is a hash of the chessql version, the query text, and the
+CQL version and parse limits given to parser.parse.  The query text is
+not normalized in any way because the spans of the matches held in the
+node tree refer to the exact text parsed.
+
+The QueryContainer instances held in the cache are shared by all callers
+and must be treated as read-only.  Use the copy argument of the parse
+method to get a private copy of the node tree.
+
+Optionally the QueryContainer instances are saved in a directory, using
+the persist module, so other processes, or later runs of this process,
+can restore them rather than parse the query.  The directory is assumed
+to be trusted: see the persist module.
+
+"""
+import collections
+import copy as copy_module
+import hashlib
+import os
+import tempfile
+
+from . import parser
+from . import persist
+
+# Default maximum number of QueryContainer instances held in a QueryCache.
+DEFAULT_MAXSIZE = 256
+
+# File name extension for QueryContainer instances saved in directory.
+SAVED_QUERY_EXTENSION = ".cqltree"
+
+
+def query_key(string, version=None, limits=None):
+    """Return cache key for query in string and installed chessql version.
+
+    The version and limits arguments are those given to parser.parse.
+
+    """
+    return hashlib.sha256(
+        "\x00".join(
+            (persist.VERSION, repr(version), repr(limits), string)
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class QueryCache:
+    """Least recently used cache of parsed queries.
+
+    At most maxsize QueryContainer instances are kept.  The least recently
+    used entry is discarded when a new entry would exceed maxsize.
+
+    Queries which fail to parse are not cached: the basenode.NodeError
+    exception is raised on every attempt.
+
+    If directory is not None containers not in memory are restored from
+    directory if possible, and containers created by parsing are saved
+    in directory.  Restored containers are counted as disk hits and also
+    as misses.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, directory=None):
+        """Initialise empty cache holding at most maxsize containers."""
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize must be an int greater than zero")
+        self._maxsize = maxsize
+        self._directory = directory
+        self._containers = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._disk_hits = 0
+
+    @property
+    def maxsize(self):
+        """Return self._maxsize."""
+        return self._maxsize
+
+    @property
+    def directory(self):
+        """Return self._directory."""
+        return self._directory
+
+    @property
+    def disk_hits(self):
+        """Return self._disk_hits."""
+        return self._disk_hits
+
+    @property
+    def hits(self):
+        """Return self._hits."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Return self._misses."""
+        return self._misses
+
+    def __len__(self):
+        """Return number of containers in cache."""
+        return len(self._containers)
+
+    def __contains__(self, string):
+        """Return True if query in string parsed with defaults is in cache.
+
+        See the contains method to include version and limits arguments.
+
+        """
+        return query_key(string) in self._containers
+
+    def contains(self, string, version=None, limits=None):
+        """Return True if query in string parsed with arguments is in cache."""
+        return query_key(string, version, limits) in self._containers
+
+    def parse(self, string, copy=False, version=None, limits=None):
+        """Return QueryContainer instance for query in string.
+
+        The cached instance is returned if present, otherwise the query is
+        parsed by parser.parse with the version and limits arguments and
+        the new instance is added to the cache.  The containers for other
+        version and limits arguments are separate entries in the cache.
+
+        The cached instance is shared so a deep copy is returned if copy
+        is True.
+
+        A basenode.NodeError is raised if the parse fails.
+
+        """
+        key = query_key(string, version, limits)
+        containers = self._containers
+        container = containers.get(key)
+        if container is None:
+            self._misses += 1
+            if self._directory is None:
+                container = parser.parse(
+                    string, version=version, limits=limits
+                )
+            else:
+                container = self._restore(key)
+                if container is None:
+                    container = parser.parse(
+                        string, version=version, limits=limits
+                    )
+                    self._save(key, container)
+                else:
+                    self._disk_hits += 1
+            containers[key] = container
+            if len(containers) > self._maxsize:
+                containers.popitem(last=False)
+        else:
+            self._hits += 1
+            containers.move_to_end(key)
+        if copy:
+            return copy_module.deepcopy(container)
+        return container
+
+    def _path(self, key):
+        """Return path of file in directory for container with key."""
+        return os.path.join(self._directory, key + SAVED_QUERY_EXTENSION)
+
+    def _restore(self, key):
+        """Return container for key restored from directory or None.
+
+        None is returned if the file does not exist or was saved by a
+        different version of chessql.
+
+        """
+        try:
+            with open(self._path(key), mode="rb") as file:
+                return persist.load(file)
+        except (FileNotFoundError, persist.PersistError):
+            return None
+
+    def _save(self, key, container):
+        """Save container for key in directory.
+
+        The file is written under a temporary name and renamed so other
+        processes never see a partly written file.
+
+        """
+        handle, temporary = tempfile.mkstemp(
+            suffix=SAVED_QUERY_EXTENSION, dir=self._directory
+        )
+        try:
+            with os.fdopen(handle, mode="wb") as file:
+                persist.dump(container, file)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def clear(self):
+        """Remove all containers from memory and reset hit and miss counts.
+
+        Containers saved in directory are not removed.
+
+        """
+        self._containers.clear()
+        self._hits = 0
+        self._misses = 0
+        self._disk_hits = 0
+
+    def statistics(self):
+        """Return dict of cache size and hit and miss counts."""
+        return {
+            "size": len(self._containers),
+            "maxsize": self._maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "disk_hits": self._disk_hits,
+        }
@@ -12,6 +12,102 @@ from . import basenode
 from . import constants
 from . import structure
 from . import options
+from . import parseprofile
+
+
+class ParseLimitError(basenode.NodeError):
+    """Exception raised if a parse exceeds a limit in ParseLimits."""
+
+
+class ParseLimits:
+    """Limits on the resources used to parse a query.
+
+    max_tokens is the number of tokens in the query, max_nodes is the
+    number of nodes created, including those for function bodies expanded
+    at function calls, and max_function_body_tokens is the number of
+    tokens in the function bodies expanded at function calls.  max_depth
+    is the number of '(', '{', and '[', delimiters and 'path' filters
+    open at the same time.
+
+    None means no limit.  A ParseLimitError is raised as soon as a limit
+    is exceeded.
+    """
+
+    __slots__ = (
+        "_max_tokens",
+        "_max_nodes",
+        "_max_function_body_tokens",
+        "_max_depth",
+    )
+
+    def __init__(
+        self,
+        max_tokens=None,
+        max_nodes=None,
+        max_function_body_tokens=None,
+        max_depth=None,
+    ):
+        """Note the limits after checking they are None or an int >= 0."""
+        for name, value in (
+            ("max_tokens", max_tokens),
+            ("max_nodes", max_nodes),
+            ("max_function_body_tokens", max_function_body_tokens),
+            ("max_depth", max_depth),
+        ):
+            if value is not None and (
+                not isinstance(value, int)
+                or isinstance(value, bool)
+                or value < 0
+            ):
+                raise ValueError(
+                    "".join(
+                        (
+                            name,
+                            " must be None or an int not less than zero",
+                        )
+                    )
+                )
+        self._max_tokens = max_tokens
+        self._max_nodes = max_nodes
+        self._max_function_body_tokens = max_function_body_tokens
+        self._max_depth = max_depth
+
+    def __repr__(self):
+        """Return str like the call which created self."""
+        return "".join(
+            (
+                self.__class__.__name__,
+                "(max_tokens=",
+                repr(self._max_tokens),
+                ", max_nodes=",
+                repr(self._max_nodes),
+                ", max_function_body_tokens=",
+                repr(self._max_function_body_tokens),
+                ", max_depth=",
+                repr(self._max_depth),
+                ")",
+            )
+        )
+
+    @property
+    def max_tokens(self):
+        """Return self._max_tokens."""
+        return self._max_tokens
+
+    @property
+    def max_nodes(self):
+        """Return self._max_nodes."""
+        return self._max_nodes
+
+    @property
+    def max_function_body_tokens(self):
+        """Return self._max_function_body_tokens."""
+        return self._max_function_body_tokens
+
+    @property
+    def max_depth(self):
+        """Return self._max_depth."""
+        return self._max_depth
 
 
 class _QueryParameters(basenode.BaseNode):
@@ -24,6 +120,14 @@ class _QueryParameters(basenode.BaseNode):
     passed to cql on the command line.
     """
 
+    __slots__ = (
+        "_cursor",
+        "_definitions",
+        "_next_reserved_name_id",
+        "_parameters",
+        "_options",
+    )
+
     def __init__(self, match_=None, container=None):
         """Delegate then set details for root of node tree."""
         if match_ is not None:
@@ -101,12 +205,40 @@ class QueryContainer(_QueryParameters, basenode.BaseNode):
     found in the command line for cqlincluding the *.cql file.
     """
 
+    __slots__ = (
+        "_function_body_cursor",
+        "_whitespace",
+        "_verified",
+        "_function_body_count",
+        "current_token",
+        "_shared_function_bodies",
+        "_open_delimiters",
+        "_version",
+        "_limits",
+        "_token_count",
+        "_node_count",
+        "_function_body_token_count",
+        "_profile",
+    )
+
     def __init__(self, match_=None, container=None):
         """Delegate then set details for root of node tree."""
         # FunctionBodyLeft instance accepting input tokens.
         # The instance which caused increment of _function_body_count to 1.
         self._function_body_cursor = None
 
+        # The ParseLimits instance, or None for no limits, and the counts
+        # of the resources used by the parse which have limits.
+        # BaseNode.__init__() counts nodes if there are limits.
+        self._limits = None
+        self._token_count = 0
+        self._node_count = 0
+        self._function_body_token_count = 0
+
+        # The parseprofile.ParseProfile instance, or None if the parse is
+        # not profiled.
+        self._profile = None
+
         super().__init__(match_=match_, container=container)
         self._parent = None
         self._whitespace = []
@@ -123,6 +255,18 @@ class QueryContainer(_QueryParameters, basenode.BaseNode):
         # Kept for reporting parsing errors.
         self.current_token = None
 
+        # The function call body shared by later calls of each function
+        # keyed by function name.  See tokenmap.share_function_bodies().
+        self._shared_function_bodies = {}
+
+        # The '(', '{', and '[', nodes not yet closed, innermost last.
+        # See tokenmap.parenthesis_right() and filters.brace_right().
+        self._open_delimiters = []
+
+        # The CQL version whose tokens are accepted, None for all versions.
+        # See lexer.finditer().
+        self._version = None
+
     @property
     def function_body_count(self):
         """Return self._function_body_count."""
@@ -153,6 +297,173 @@ class QueryContainer(_QueryParameters, basenode.BaseNode):
         """Return self._verified."""
         return self._verified
 
+    @property
+    def shared_function_bodies(self):
+        """Return self._shared_function_bodies."""
+        return self._shared_function_bodies
+
+    @property
+    def version(self):
+        """Return self._version."""
+        return self._version
+
+    @version.setter
+    def version(self, value):
+        """Bind self._version to value."""
+        self._version = value
+
+    @property
+    def open_delimiters(self):
+        """Return self._open_delimiters."""
+        return self._open_delimiters
+
+    @property
+    def limits(self):
+        """Return self._limits."""
+        return self._limits
+
+    @limits.setter
+    def limits(self, value):
+        """Bind self._limits to value."""
+        if value is not None and not isinstance(value, ParseLimits):
+            self.raise_nodeerror(
+                self.__class__.__name__.join("''"),
+                " expects limits to be a ",
+                ParseLimits.__name__.join("''"),
+                " but it is a ",
+                value.__class__.__name__.join("''"),
+            )
+        self._limits = value
+
+    @property
+    def profile(self):
+        """Return self._profile."""
+        return self._profile
+
+    @profile.setter
+    def profile(self, value):
+        """Bind self._profile to value."""
+        if value is not None and not isinstance(
+            value, parseprofile.ParseProfile
+        ):
+            self.raise_nodeerror(
+                self.__class__.__name__.join("''"),
+                " expects profile to be a ",
+                parseprofile.ParseProfile.__name__.join("''"),
+                " but it is a ",
+                value.__class__.__name__.join("''"),
+            )
+        self._profile = value
+
+    @property
+    def token_count(self):
+        """Return self._token_count."""
+        return self._token_count
+
+    @property
+    def node_count(self):
+        """Return self._node_count.
+
+        Nodes are counted only if limits is not None.
+
+        """
+        return self._node_count
+
+    @property
+    def function_body_token_count(self):
+        """Return self._function_body_token_count."""
+        return self._function_body_token_count
+
+    def _raise_limit_error(self, name, limit):
+        """Raise ParseLimitError for limit called name."""
+        raise ParseLimitError(
+            "".join(
+                (
+                    "Query exceeds limit of ",
+                    str(limit),
+                    " for ",
+                    name,
+                )
+            )
+        )
+
+    def count_token(self):
+        """Increment token count and raise ParseLimitError if too many."""
+        self._token_count += 1
+        limits = self._limits
+        if (
+            limits is not None
+            and limits.max_tokens is not None
+            and self._token_count > limits.max_tokens
+        ):
+            self._raise_limit_error("max_tokens", limits.max_tokens)
+
+    def count_node(self):
+        """Increment node count and raise ParseLimitError if too many."""
+        self._node_count += 1
+        max_nodes = self._limits.max_nodes
+        if max_nodes is not None and self._node_count > max_nodes:
+            self._raise_limit_error("max_nodes", max_nodes)
+
+    def count_function_body_tokens(self, count):
+        """Add count to function body tokens and raise ParseLimitError.
+
+        The ParseLimitError is raised if the total is too many.
+
+        """
+        self._function_body_token_count += count
+        limits = self._limits
+        if (
+            limits is not None
+            and limits.max_function_body_tokens is not None
+            and self._function_body_token_count
+            > limits.max_function_body_tokens
+        ):
+            self._raise_limit_error(
+                "max_function_body_tokens", limits.max_function_body_tokens
+            )
+
+    def pop_completed_delimiters(self):
+        """Remove completed delimiters from top of open_delimiters."""
+        delimiters = self._open_delimiters
+        while delimiters and delimiters[-1].completed:
+            delimiters.pop()
+
+    def push_open_delimiter(self, node):
+        """Append node to open_delimiters after removing completed ones.
+
+        A ParseLimitError is raised if the delimiters open exceed the
+        max_depth limit.
+
+        """
+        self.pop_completed_delimiters()
+        self._open_delimiters.append(node)
+        limits = self._limits
+        if (
+            limits is not None
+            and limits.max_depth is not None
+            and len(self._open_delimiters) > limits.max_depth
+        ):
+            self._raise_limit_error("max_depth", limits.max_depth)
+
+    def innermost_open_delimiters(self):
+        """Return iterator of open delimiters, innermost first."""
+        self.pop_completed_delimiters()
+        return reversed(self._open_delimiters)
+
+    def close_open_delimiter(self, node):
+        """Remove delimiters opened after node from open_delimiters.
+
+        The delimiters opened after node are nested within node and cannot
+        be closed once node is closed.  Node is removed when completed.
+
+        """
+        delimiters = self._open_delimiters
+        for index in range(len(delimiters) - 1, -1, -1):
+            if delimiters[index] is node:
+                del delimiters[index + 1 :]
+                return
+
     def get_next_variable_prefix(self):
         """Return str of next prefix for variable names.
 
@@ -235,15 +546,3 @@ class QueryContainer(_QueryParameters, basenode.BaseNode):
             elif isinstance(item.parameter_value, list):
                 trace[-1].append(" ".join(item.parameter_value))
         return [" ".join(t) for t in sorted(trace)]
-
-    def raise_if_not_single_match_groupdict_entry(self, token, entries):
-        """Raise NodeError if entries has more than one item for token."""
-        if len(entries) != 1:
-            self.raise_nodeerror(
-                "'",
-                self.__class__.__name__,
-                "' a single groupdict entry is expected frpm match on '",
-                token.group(),
-                "' but got ",
-                str(len(entries)),
-            )
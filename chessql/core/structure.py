@@ -48,6 +48,8 @@ _simple_designator_re = re.compile(
 class CQLObject(basenode.BaseNode):
     """Base class of classes which represent .constants.CQL_TOKENS matches."""
 
+    __slots__ = ()
+
     # Most CQLObjects are not allowed as first item in QueryContainer.
     # Probably only CQL class will ever return True.
     _is_allowed_first_object_in_container = False
@@ -83,6 +85,16 @@ class CQLObject(basenode.BaseNode):
         """Set self._parent."""
         self._parent = value
 
+    @property
+    def container(self):
+        """Return self._container."""
+        return self._container
+
+    @container.setter
+    def container(self, value):
+        """Set self._container."""
+        self._container = value
+
     @property
     def is_set_filter(self):
         """Return True if CQLobject instance is a Set Filter."""
@@ -297,6 +309,8 @@ class Complete(CQLObject):
     no arguments but do take parameters.
     """
 
+    __slots__ = ()
+
     def complete(self):
         """Return True.  Complete instances are always complete."""
         return True
@@ -318,6 +332,8 @@ class CompleteBlock(CQLObject):
     of ')' matching a '(' for example.
     """
 
+    __slots__ = ()
+
     def complete(self):
         """Return True if self.completed is True."""
         return self.completed
@@ -355,6 +371,8 @@ class PrecedenceFromChild(CQLObject):
     matters have not yet been spotted.
     """
 
+    __slots__ = ()
+
     @property
     def precedence(self):
         """Return a non-None child precedence or self.precedence."""
@@ -378,6 +396,8 @@ class CompleteParameterArguments(CQLObject):
     The 'to' parameter of 'pin' filter take one argument for example.
     """
 
+    __slots__ = ()
+
     def complete(self):
         """Return True if node representing filter is complete.
 
@@ -412,6 +432,8 @@ class CompleteParameterArguments(CQLObject):
 class Name(CQLObject):
     """Subclass of CQLObject for user defined names in CQL statements."""
 
+    __slots__ = ()
+
     @basenode.BaseNode.name.setter
     def name(self, value):
         """Set self._name."""
@@ -566,6 +588,8 @@ class VariableTypeSetter(Name):
     function and dictionary in CQL.
     """
 
+    __slots__ = ()
+
     def raise_if_child_cannot_be_index(self, child):
         """Raise NodeError if child cannot be index into self's value.
 
@@ -680,6 +704,8 @@ class VariableName(VariableTypeSetter):
     function and dictionary in CQL.
     """
 
+    __slots__ = ()
+
     # Probably should be able to put this in class Name but cannot now.
     @property
     def filter_type(self):
@@ -781,6 +807,8 @@ class DictionaryName(VariableTypeSetter):
     function and variable in CQL.
     """
 
+    __slots__ = ()
+
     # Introduced to allow filters._DashOrTake to become structure.DashOrTake
     # so InfixLeft.place_node_in_tree() can refer to it easily.
     # VariableName already exists for variable and additions to dictionary
@@ -828,6 +856,8 @@ class Argument(CQLObject):
     of '()' and '{}' compound filter clauses is permitted.
     """
 
+    __slots__ = ()
+
     # Keywords with unparenthesized argument take one child by default.
     _child_count = 1
 
@@ -847,6 +877,8 @@ class LeftParenthesisInfix(CQLObject):
     query is not seen as 'countmoves (-- == 1)'.
     """
 
+    __slots__ = ()
+
     def is_countmoves(self):
         """Return True if self is an instance of filters.CountMoves.
 
@@ -864,6 +896,8 @@ class BindArgument(Argument):
     a precedence greater than the comparison operators.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     @property
@@ -906,10 +940,13 @@ class BlockLeft(CompleteBlock):
     but Path might be included because it is ended by a blank line.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
-        """Delegate then set cursor to self."""
+        """Delegate then set cursor to self and note self is open."""
         super().place_node_in_tree()
         self.container.cursor = self
+        self.container.push_open_delimiter(self)
 
 
 class ParenthesizedArguments(BlockLeft):
@@ -919,10 +956,14 @@ class ParenthesizedArguments(BlockLeft):
     of '()' and '{}' compound filter clauses is permitted.
     """
 
+    __slots__ = ()
+
 
 class MaxOrMin(ParenthesizedArguments):
     """Subclass of ParenthesizedArguments for 'min' and 'max' filters."""
 
+    __slots__ = ()
+
     def _verify_children_and_set_own_types(self):
         """Override, raise NodeError if children verification fails."""
         if len(self.children) < 2:
@@ -971,6 +1012,8 @@ class MaxOrMin(ParenthesizedArguments):
 class Infix(CQLObject):
     """Subclass of CQLObject for infix operators."""
 
+    __slots__ = ()
+
     # Keywords for infix operators take two childs.
     _child_count = 2
 
@@ -1083,6 +1126,8 @@ class Infix(CQLObject):
 class InfixLeft(Infix):
     """Subclass of CQLObject for left associative infix operators."""
 
+    __slots__ = ()
+
     # Class CQL implements implicit top-level '{}' block at present.
     def place_node_in_tree(self):
         """Adjust node hierarchy, assert cursor is parent."""
@@ -1141,6 +1186,8 @@ class InfixLeft(Infix):
 class InfixRight(Infix):
     """Subclass of CQLObject for right associative infix operators."""
 
+    __slots__ = ()
+
     # Class CQL implements implicit top-level '{}' block at present.
     def place_node_in_tree(self):
         """Adjust node hierarchy, assert cursor is parent."""
@@ -1207,6 +1254,8 @@ class MoveInfix(Infix):
     '=?' is ascii with no utf8 equivalent.
     """
 
+    __slots__ = ()
+
     _filter_type = cqltypes.FilterType.LOGICAL
 
     # Class CQL implements implicit top-level '{}' block at present.
@@ -1240,6 +1289,8 @@ class DashOrTake(InfixLeft):
     DashOrTake instance to be a logical filter.
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then set container cursor to self."""
         super().place_node_in_tree()
@@ -1307,6 +1358,8 @@ class DashOrTake(InfixLeft):
 class Numeric(InfixLeft):
     """Subclass of InfixLeft for numeric operators."""
 
+    __slots__ = ()
+
     def _verify_children_and_set_own_types(self):
         """Override, raise NodeError if children verification fails."""
         self.raise_if_not_number_of_children(2)
@@ -1319,6 +1372,8 @@ class Numeric(InfixLeft):
 class ComparePosition(CQLObject):
     """Subclass of CQLObject for comparing only Position filters."""
 
+    __slots__ = ()
+
     @property
     def filter_type(self):
         """Verify children are comparable filter types.
@@ -1347,6 +1402,8 @@ class ComparePosition(CQLObject):
 class CompareSet(CQLObject):
     """Subclass of CQLObject for comparing only Set filters."""
 
+    __slots__ = ()
+
     @property
     def filter_type(self):
         """Verify children are comparable filter types.
@@ -1368,6 +1425,8 @@ class CompareSet(CQLObject):
 class Compare(CQLObject):
     """Subclass of CQLObject for comparing filters."""
 
+    __slots__ = ()
+
     # For all relational filters except '=='.
     _comparable_filter_types = (
         cqltypes.FilterType.NUMERIC
@@ -1430,6 +1489,8 @@ class Compare(CQLObject):
 class ParameterArgument(CQLObject):
     """Subclass of CQLObject for parameters which take an argument."""
 
+    __slots__ = ()
+
     _is_parameter = True
     # Keywords with unparenthesized argument take one child by default.
     _child_count = 1
@@ -1456,6 +1517,8 @@ class ParameterArgument(CQLObject):
 class NoArgumentsParameter(Complete):
     """Subclass of CQLObject for parameters which do not take arguments."""
 
+    __slots__ = ()
+
     _is_parameter = True
 
     def place_node_in_tree(self):
@@ -1479,6 +1542,8 @@ def is_direction_parameter_accepted_by(node):
 class DirectionParameter(NoArgumentsParameter):
     """Subclass of NoArgumentsParameter for direction parameters."""
 
+    __slots__ = ()
+
     def is_parameter_accepted_by_filter(self):
         """Return True if parent accepts self as a parameter."""
         return is_direction_parameter_accepted_by(self.parent)
@@ -1494,6 +1559,8 @@ class NoArgumentsFilter(CQLObject):
     arguments nor parameters.
     """
 
+    __slots__ = ()
+
     # Keywords no argument take zero childs.
     _child_count = 0
 
@@ -1510,6 +1577,8 @@ class ImplicitSearchFilter(NoArgumentsFilter):
     matches.  In other words <any value> can be taken as the argument.
     """
 
+    __slots__ = ()
+
     def _verify_children_and_set_own_types(self):
         """Override, raise NodeError if children verification fails."""
         if len(self.children) > 1:
@@ -1524,6 +1593,8 @@ class ImplicitSearchFilter(NoArgumentsFilter):
 class ModifyAssign(CQLObject):
     """Shared behaviour of '<operator>=' filters which have numeric rhs."""
 
+    __slots__ = ()
+
     def _verify_children_and_set_own_types(self):
         """Override, raise NodeError if children verification fails."""
         lhs = self.children[0]
@@ -1551,13 +1622,15 @@ class SquareIn(VariableName, Argument):
     the definition of the associated variable.
     """
 
+    __slots__ = ()
+
     _precedence = cqltypes.Precedence.P30
     _child_count = 2
 
     def __init__(self, match_=None, container=None):
         """Delegate then register the set variable name for square filter."""
         super().__init__(match_=match_, container=container)
-        self.name = match_.groupdict()["square"]
+        self.name = match_.group("square")
         self._register_variable_type(cqltypes.VariableType.SET)
         self.set_variable_types(
             cqltypes.VariableType.SET, cqltypes.FilterType.SET
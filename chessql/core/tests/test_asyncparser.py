@@ -0,0 +1,183 @@
+# test_asyncparser.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.asyncparser module."""
+
+import unittest
+import asyncio
+
+from .. import asyncparser
+from .. import basenode
+from .. import parser
+from .. import pattern
+from .. import persist
+from .. import querycontainer
+
+# A query which takes seconds to parse.
+_SLOW_QUERY = "cql() " + "k " * 100000
+
+
+def _tree(container):
+    """Return parse tree trace of container."""
+    tree = []
+    container.parse_tree_trace(trace=tree)
+    return tree
+
+
+class ParseService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = asyncparser.ParseService(max_workers=2)
+
+    async def asyncTearDown(self):
+        self.service.close(wait=False)
+        self.service = None
+
+    async def test_01_success(self):
+        ae = self.assertEqual
+        string = "cql() k ray(R k)"
+        result = await self.service.parse(string)
+        ae(result["success"], True)
+        ae(result["error"], None)
+        ae(result["span"], None)
+        ae(_tree(persist.loads(result["saved"])), _tree(parser.parse(string)))
+        result = await self.service.parse(string, save=False)
+        ae(result["success"], True)
+        ae(result["saved"], None)
+
+    async def test_02_failure(self):
+        ae = self.assertEqual
+        string = "cql() bt"
+        result = await self.service.parse(string)
+        ae(result["success"], False)
+        ae(result["saved"], None)
+        ae(result["span"], [8, 8])
+        with self.assertRaises(basenode.NodeError) as context:
+            parser.parse(string)
+        ae(result["error"], str(context.exception))
+
+    async def test_03_version(self):
+        ae = self.assertEqual
+        result = await self.service.parse("cql() a1→b2", version="6.1")
+        ae(result["success"], False)
+        result = await self.service.parse("cql() a1→b2", version="6.2")
+        ae(result["success"], True)
+        with self.assertRaises(pattern.PatternError):
+            await self.service.parse("cql() k", version="5.1")
+
+    async def test_04_concurrent_calls(self):
+        ae = self.assertEqual
+        strings = ["cql() k", "cql() bt", "cql() k or q", "cql() {R}"] * 3
+        results = await asyncio.gather(
+            *(self.service.parse(string) for string in strings)
+        )
+        ae(
+            [result["success"] for result in results],
+            [True, False, True, True] * 3,
+        )
+        statistics = self.service.statistics()
+        ae(statistics["completed"], len(strings))
+        ae(statistics["pending"], 0)
+        ae(statistics["queue_depth"], 0)
+        ae(statistics["latency_max"] >= statistics["latency_mean"] > 0, True)
+
+    async def test_05_timeout(self):
+        ae = self.assertEqual
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.service.parse(_SLOW_QUERY, timeout=0.2)
+        result = await self.service.parse("cql() k", timeout=60)
+        ae(result["success"], True)
+        statistics = self.service.statistics()
+        ae(statistics["timeouts"], 1)
+        ae(statistics["restarts"], 1)
+        ae(statistics["completed"], 1)
+
+    async def test_06_calls_waiting_for_stopped_pool(self):
+        ae = self.assertEqual
+        service = asyncparser.ParseService(max_workers=1)
+        try:
+            slow = asyncio.ensure_future(
+                service.parse(_SLOW_QUERY, timeout=0.5)
+            )
+            waiting = asyncio.ensure_future(service.parse("cql() k"))
+            await asyncio.sleep(0.1)
+            ae(service.pending, 2)
+            with self.assertRaises(asyncio.TimeoutError):
+                await slow
+            result = await waiting
+            ae(result["success"], True)
+            ae(service.statistics()["restarts"], 1)
+        finally:
+            service.close(wait=False)
+
+    async def test_07_cancel(self):
+        ae = self.assertEqual
+        task = asyncio.ensure_future(self.service.parse(_SLOW_QUERY))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        result = await self.service.parse("cql() k")
+        ae(result["success"], True)
+        ae(self.service.statistics()["cancelled"], 1)
+
+    async def test_08_default_timeout(self):
+        service = asyncparser.ParseService(max_workers=1, timeout=0.2)
+        try:
+            with self.assertRaises(asyncio.TimeoutError):
+                await service.parse(_SLOW_QUERY)
+        finally:
+            service.close(wait=False)
+
+    async def test_09_closed(self):
+        ae = self.assertEqual
+        async with asyncparser.ParseService(max_workers=1) as service:
+            result = await service.parse("cql() k")
+            ae(result["success"], True)
+        ae(service.closed, True)
+        with self.assertRaises(asyncparser.ParseServiceError):
+            await service.parse("cql() k")
+
+    def test_10_arguments(self):
+        self.assertRaises(ValueError, asyncparser.ParseService, max_workers=0)
+        self.assertRaises(ValueError, asyncparser.ParseService, timeout=-1)
+
+    def test_11_statistics_before_calls(self):
+        ae = self.assertEqual
+        statistics = self.service.statistics()
+        ae(statistics["completed"], 0)
+        ae(statistics["latency_mean"], None)
+        ae(statistics["max_workers"], 2)
+
+    async def test_12_limits(self):
+        ae = self.assertEqual
+        limits = querycontainer.ParseLimits(max_tokens=5)
+        service = asyncparser.ParseService(max_workers=1, limits=limits)
+        try:
+            ae(service.limits is limits, True)
+            result = await service.parse("cql() k")
+            ae(result["success"], True)
+            result = await service.parse("cql() k q r")
+            ae(result["success"], False)
+            ae(result["error"], "Query exceeds limit of 5 for max_tokens")
+        finally:
+            service.close(wait=False)
+
+
+class Aparse(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        if asyncparser._service is not None:
+            asyncparser._service.close(wait=False)
+
+    async def test_01_aparse(self):
+        ae = self.assertEqual
+        result = await asyncparser.aparse("cql() k", timeout=60)
+        ae(result["success"], True)
+        ae(asyncparser._service.statistics()["completed"], 1)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(ParseService))
+    runner().run(loader(Aparse))
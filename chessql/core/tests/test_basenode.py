@@ -0,0 +1,167 @@
+# test_basenode.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.basenode module."""
+
+import unittest
+import sys
+
+from .. import basenode
+from .. import cqltypes
+from .. import parser
+from .. import querycontainer
+
+
+def _subclasses(class_):
+    """Yield the subclasses of class_ recursively."""
+    for subclass in class_.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+class Slots(unittest.TestCase):
+    def test_01_no_instance_dict(self):
+        ae = self.assertEqual
+        for class_ in _subclasses(basenode.BaseNode):
+            with self.subTest(class_=class_.__name__):
+                ae(class_.__dictoffset__, 0)
+        nodes = []
+        parser.parse("cql() function F(x){x} F(k) ray(R k)").parse_tree_node(
+            trace=nodes
+        )
+        for depth, node in nodes:
+            ae(hasattr(node, "__dict__"), False)
+
+    def test_02_defaults_not_class_attributes(self):
+        ae = self.assertEqual
+        for class_ in _subclasses(basenode.BaseNode):
+            for name in basenode._DEFAULTED_SLOTS:
+                with self.subTest(class_=class_.__name__, name=name):
+                    ae(name in class_.__dict__, False)
+
+    def test_03_instance_defaults(self):
+        ae = self.assertEqual
+        container = querycontainer.QueryContainer()
+        ae(container.filter_type, ~cqltypes.FilterType.ANY)
+        ae(container.completed, False)
+        ae(container.name, None)
+        node = basenode.BaseNode(container=container)
+        ae(node.completed, False)
+        node.completed = True
+        node.filter_type = cqltypes.FilterType.SET
+        ae(node.completed, True)
+        ae(node.filter_type, cqltypes.FilterType.SET)
+        ae(basenode.BaseNode(container=container).completed, False)
+        ae(
+            basenode.BaseNode(container=container).filter_type,
+            ~cqltypes.FilterType.ANY,
+        )
+
+    def test_04_default_found_in_method_resolution_order(self):
+        ae = self.assertEqual
+
+        class A(basenode.BaseNode):
+            __slots__ = ()
+            completed = True
+
+        class B(basenode.BaseNode):
+            __slots__ = ()
+            _name = "b"
+
+        class C(A, B):
+            __slots__ = ()
+            _child_count = 2
+
+        ae(
+            A._slot_defaults,
+            (~cqltypes.FilterType.ANY, None, None, True, None),
+        )
+        ae(C._slot_defaults, (~cqltypes.FilterType.ANY, 2, None, True, "b"))
+
+
+class CompleteAndFull(unittest.TestCase):
+    def test_01_same_as_counting_all_children(self):
+        ae = self.assertEqual
+        complete = basenode.BaseNode.complete
+        full = basenode.BaseNode.full
+        for string in (
+            "cql() move from k to q legal",
+            "cql() line --> k --> q",
+            "cql() sort min k",
+            "cql() x=1 not k k&q ray(R k)",
+        ):
+            nodes = []
+            parser.parse(string).parse_tree_node(trace=nodes)
+            for depth, node in nodes:
+                if node.child_count is None:
+                    continue
+                count = len(node.children) - len(
+                    [
+                        child
+                        for child in node.children
+                        if child.is_parameter
+                        and child.is_parameter_accepted_by_filter()
+                    ]
+                )
+                with self.subTest(string=string, node=node):
+                    ae(complete(node), count > node.child_count)
+                    ae(full(node), count >= node.child_count)
+
+
+class IterTree(unittest.TestCase):
+    def test_01_iter_tree_same_as_parse_tree_node(self):
+        ae = self.assertEqual
+        container = parser.parse("cql() function F(x){x&a1} F(k) {v=1 v+=2}")
+        nodes = []
+        container.parse_tree_node(trace=nodes)
+        ae(list(container.iter_tree()), nodes)
+        ae(nodes[0], (1, container))
+        node = nodes[3][1]
+        trace = []
+        node.parse_tree_node(trace=trace)
+        ae(list(node.iter_tree()), trace)
+        ae(trace[0], nodes[3])
+
+    def test_02_iter_tree_trace_same_as_parse_tree_trace(self):
+        ae = self.assertEqual
+        for share_function_bodies in (False, True):
+            container = parser.parse(
+                "cql() function F(x){x&a1} F(k) F(q)",
+                share_function_bodies=share_function_bodies,
+            )
+            trace = []
+            container.parse_tree_trace(trace=trace)
+            with self.subTest(share_function_bodies=share_function_bodies):
+                ae(list(container.iter_tree_trace()), trace)
+
+    def test_03_iter_tree_is_generator(self):
+        ae = self.assertEqual
+        iterator = parser.parse("cql() k q").iter_tree()
+        ae(next(iterator)[0], 1)
+        ae(next(iterator)[0], 2)
+
+    def test_04_deep_nesting(self):
+        ae = self.assertEqual
+        depth = sys.getrecursionlimit() * 2
+        for left, right in ("{}", "()"):
+            container = parser.parse(
+                "".join(("cql() ", left * depth, "k", right * depth))
+            )
+            trace = []
+            container.parse_tree_trace(trace=trace)
+            nodes = []
+            container.parse_tree_node(trace=nodes)
+            with self.subTest(left=left):
+                ae(len(trace), depth + 3)
+                ae(len(nodes), depth + 3)
+                ae(nodes[-1][0], depth + 3)
+                ae(trace[-1].split()[-3:], ["'k'", "f:", "SET"])
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(Slots))
+    runner().run(loader(CompleteAndFull))
+    runner().run(loader(IterTree))
@@ -0,0 +1,187 @@
+# test_batchparser.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.batchparser module."""
+
+import unittest
+import io
+import json
+import os
+import tempfile
+
+from .. import batchparser
+
+
+class BatchParser(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.queries = {
+            "a.cql": "cql() k",
+            "b.CQL": "cql() bt",
+            "c.cql": "cql() k or q",
+            "d.txt": "cql() k",
+            os.path.join("sub", "e.cql"): "cql() R",
+        }
+        os.mkdir(os.path.join(self.directory.name, "sub"))
+        for name, query in self.queries.items():
+            with open(
+                os.path.join(self.directory.name, name),
+                mode="w",
+                encoding="utf-8",
+            ) as queryfile:
+                queryfile.write(query)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_01_query_files(self):
+        ae = self.assertEqual
+        ae(
+            batchparser.query_files([self.directory.name]),
+            [self.path("a.cql"), self.path("b.CQL"), self.path("c.cql")],
+        )
+        ae(
+            batchparser.query_files([self.directory.name], recursive=True),
+            [
+                self.path("a.cql"),
+                self.path("b.CQL"),
+                self.path("c.cql"),
+                self.path(os.path.join("sub", "e.cql")),
+            ],
+        )
+
+    def test_02_parse_file_success(self):
+        ae = self.assertEqual
+        result = batchparser.parse_file(self.path("c.cql"))
+        ae(result["file"], self.path("c.cql"))
+        ae(result["success"], True)
+        ae(result["error"], None)
+        ae(result["span"], None)
+        ae(result["nodes"], 5)
+        ae(isinstance(result["time"], float), True)
+
+    def test_03_parse_file_failure(self):
+        ae = self.assertEqual
+        result = batchparser.parse_file(self.path("b.CQL"))
+        ae(result["success"], False)
+        ae(isinstance(result["error"], str), True)
+        ae(result["span"], [8, 8])
+        ae(result["nodes"], None)
+
+    def test_04_parse_file_missing(self):
+        ae = self.assertEqual
+        result = batchparser.parse_file(self.path("missing.cql"))
+        ae(result["success"], False)
+        ae(isinstance(result["error"], str), True)
+        ae(result["time"], None)
+
+    def test_05_parse_files_jobs(self):
+        ae = self.assertEqual
+        paths = batchparser.query_files([self.directory.name])
+        serial = list(batchparser.parse_files(paths, jobs=1))
+        pooled = list(batchparser.parse_files(paths, jobs=2))
+        for result in serial + pooled:
+            del result["time"]
+        ae(serial, pooled)
+        ae([result["file"] for result in serial], paths)
+        self.assertRaises(
+            ValueError, list, batchparser.parse_files(paths, jobs=0)
+        )
+
+    def test_06_main(self):
+        ae = self.assertEqual
+        output = io.StringIO()
+        status = batchparser.main(
+            ["--jobs", "1", "--recursive", self.directory.name],
+            output=output,
+        )
+        ae(status, 1)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        ae(
+            [result["success"] for result in results],
+            [True, False, True, True],
+        )
+        output = io.StringIO()
+        status = batchparser.main(
+            ["-j", "1", os.path.join(self.directory.name, "sub")],
+            output=output,
+        )
+        ae(status, 0)
+        ae(len(output.getvalue().splitlines()), 1)
+
+    def test_07_parse_query(self):
+        ae = self.assertEqual
+        result, container = batchparser.parse_query("cql() k or q")
+        ae(result["success"], True)
+        ae(result["nodes"], 5)
+        ae("file" in result, False)
+        ae(container.current_token.span(), (12, 12))
+        result, container = batchparser.parse_query("cql() a1→b2", "6.1")
+        ae(result["success"], False)
+        ae(container, None)
+
+    def test_08_all_errors(self):
+        ae = self.assertEqual
+        result, container = batchparser.parse_query(
+            "cql() k @@ q 'a' r", all_errors=True
+        )
+        ae(result["success"], False)
+        ae(container, None)
+        ae(result["error"], "Unexpected '@@' found")
+        ae(result["span"], [8, 10])
+        ae([error["span"] for error in result["errors"]], [[8, 10], [13, 16]])
+        result, container = batchparser.parse_query(
+            "cql() k or q", all_errors=True
+        )
+        ae(result["success"], True)
+        ae(result["errors"], [])
+        ae(result["nodes"], 5)
+        ae(container is None, False)
+        with open(self.path("f.cql"), mode="w", encoding="utf-8") as file:
+            file.write("cql() @@ k ) q")
+        output = io.StringIO()
+        status = batchparser.main(
+            ["-j", "1", "--all-errors", self.directory.name], output=output
+        )
+        ae(status, 1)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        ae([len(result["errors"]) for result in results], [0, 1, 0, 2])
+        result = batchparser.parse_file(
+            self.path("missing.cql"), all_errors=True
+        )
+        ae(len(result["errors"]), 1)
+        ae(result["errors"][0]["span"], None)
+
+    def test_09_version(self):
+        ae = self.assertEqual
+        with open(self.path("f.cql"), mode="w", encoding="utf-8") as file:
+            file.write("cql() a1→b2")
+        for version, success in (("6.1", False), ("6.2", True)):
+            with self.subTest(version=version):
+                output = io.StringIO()
+                status = batchparser.main(
+                    ["-j", "1", "--version", version, self.directory.name],
+                    output=output,
+                )
+                ae(status, 1)
+                results = [
+                    json.loads(line) for line in output.getvalue().splitlines()
+                ]
+                ae(results[-1]["file"], self.path("f.cql"))
+                ae(results[-1]["success"], success)
+        self.assertRaises(
+            SystemExit,
+            batchparser.main,
+            ["--version", "5.1", self.directory.name],
+            output=io.StringIO(),
+        )
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(BatchParser))
@@ -0,0 +1,148 @@
+# test_compact.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.compact module."""
+
+import unittest
+import pickle
+import re
+
+from .. import compact
+from .. import parser
+from .. import pattern
+from .. import persist
+
+from . import treetrace
+
+
+def _nodes(container):
+    """Return list of nodes in tree of container."""
+    trace = []
+    container.parse_tree_node(trace=trace)
+    return [node for depth, node in trace]
+
+
+class TokenMatch(unittest.TestCase):
+    def setUp(self):
+        self.match_ = pattern.cql_re.match("cql() piece X in Q", 6)
+        self.token = compact.token_match(self.match_)
+
+    def test_01_token_match(self):
+        ae = self.assertEqual
+        token = self.token
+        ae(isinstance(token, compact.TokenMatch), True)
+        ae(token.string, None)
+        ae(token.re is self.match_.re, True)
+        ae(token.lastindex, self.match_.lastindex)
+        ae(token.lastgroup, self.match_.lastgroup)
+
+    def test_02_group_and_span(self):
+        ae = self.assertEqual
+        token = self.token
+        match_ = self.match_
+        ae(token.group(), match_.group())
+        ae(token[0], match_[0])
+        ae(token["piece"], match_["piece"])
+        ae(token.group(0, "piece"), match_.group(0, "piece"))
+        ae(token.span(), match_.span())
+        ae(token.span("square"), match_.span("square"))
+        ae(token.start("piece"), match_.start("piece"))
+        ae(token.end(), match_.end())
+        self.assertRaises(IndexError, token.group, "nosuchgroup")
+        self.assertRaises(IndexError, token.span, match_.re.groups + 1)
+
+    def test_03_groups_and_groupdict(self):
+        ae = self.assertEqual
+        ae(self.token.groups(), self.match_.groups())
+        ae(self.token.groupdict(), self.match_.groupdict())
+        ae(self.token.groupdict(default=""), self.match_.groupdict(""))
+
+    def test_04_whole_string(self):
+        ae = self.assertEqual
+        token = compact.token_match(re.match(r"(?P<variable>.*)", "x"))
+        ae(token.string, "x")
+        ae(token.group("variable"), "x")
+
+    def test_05_all_cql_re_groups_kept(self):
+        ae = self.assertEqual
+        for match_ in pattern.cql_re.finditer(
+            'cql() k ray(R k) {x=1 x+=2} "s" a-h1-8 --> 5 /* c */'
+        ):
+            token = compact.token_match(match_)
+            with self.subTest(match_=match_):
+                ae(token.groups(), match_.groups())
+
+
+class CompactContainer(unittest.TestCase):
+    def verify_compact(self, string, share_function_bodies=False):
+        ae = self.assertEqual
+        container = parser.parse(
+            string, share_function_bodies=share_function_bodies
+        )
+        compacted = parser.parse(
+            string, share_function_bodies=share_function_bodies, compact=True
+        )
+        ae(treetrace.traces(compacted), treetrace.traces(container))
+        ae(
+            [node.get_match_text() for node in _nodes(compacted)[1:]],
+            [node.get_match_text() for node in _nodes(container)[1:]],
+        )
+        for node in _nodes(compacted)[1:]:
+            ae(isinstance(node.match_, re.Match), False)
+        ae(isinstance(compacted.current_token, re.Match), False)
+        return container, compacted
+
+    def test_01_filters(self):
+        self.verify_compact("cql() k q ray(R k) {v=1 v+=2 v>1}")
+
+    def test_02_parameters_and_comments(self):
+        self.verify_compact(
+            "cql(input a.pgn output b.pgn) /* c */ k // line\n q"
+        )
+
+    def test_03_function_calls(self):
+        string = "cql() function F(x){x&a1 ray(R x)} F(k) v=a1 F(v) F(q)"
+        container, compacted = self.verify_compact(string)
+        definition = compacted.definitions["F"]
+        for match_ in definition.body:
+            self.assertEqual(isinstance(match_, compact.TokenMatch), True)
+        for class_, match_ in definition.template:
+            self.assertEqual(isinstance(match_, compact.TokenMatch), True)
+        self.verify_compact(string, share_function_bodies=True)
+
+    def test_04_function_body_matches_shared(self):
+        compacted = parser.parse(
+            "cql() function F(x){x&a1} F(k) F(q)", compact=True
+        )
+        calls = [
+            node
+            for node in _nodes(compacted)
+            if node.__class__.__name__ == "Intersection"
+        ]
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[0].match_ is calls[1].match_, True)
+
+    def test_05_pickle(self):
+        container, compacted = self.verify_compact(
+            "cql(input a.pgn) function F(x){x} F(k) v=1 /* c */ F(q)"
+        )
+        self.assertRaises(TypeError, pickle.dumps, container)
+        self.assertEqual(
+            treetrace.traces(pickle.loads(pickle.dumps(compacted))),
+            treetrace.traces(container),
+        )
+
+    def test_06_persist(self):
+        container, compacted = self.verify_compact("cql() k or q")
+        self.assertEqual(
+            treetrace.traces(persist.loads(persist.dumps(compacted))),
+            treetrace.traces(container),
+        )
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(TokenMatch))
+    runner().run(loader(CompactContainer))
@@ -0,0 +1,153 @@
+# test_costestimate.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.costestimate module."""
+
+import unittest
+import json
+
+from .. import costestimate
+from .. import parser
+from .. import persist
+
+
+def _estimate(string, **kwargs):
+    """Return QueryCost of query in string parsed with kwargs."""
+    return costestimate.estimate(parser.parse(string, **kwargs))
+
+
+def _subtrees(string):
+    """Return list of (class name, cost) of top level filters in string."""
+    return [
+        (node.__class__.__name__, cost)
+        for node, cost in _estimate(string).subtrees
+    ]
+
+
+class Estimate(unittest.TestCase):
+    def test_01_cheap_filters(self):
+        ae = self.assertEqual
+        ae(_subtrees("cql() k"), [("PieceDesignator", 1)])
+        ae(
+            _subtrees('cql() player white "Smith" result 1-0'),
+            [("Player", 1), ("Result", 1)],
+        )
+        ae(_estimate("cql() k").category, "cheap")
+
+    def test_02_base_costs(self):
+        ae = self.assertEqual
+        ae(_subtrees("cql() ray(R k)"), [("Ray", 6)])
+        ae(_subtrees("cql() countmoves legal --"), [("CountMoves", 43)])
+        ae(_subtrees("cql() mate"), [("Mate", 20)])
+
+    def test_03_transform_multipliers(self):
+        ae = self.assertEqual
+        ae(_subtrees("cql() flip k"), [("Flip", 9)])
+        ae(_subtrees("cql() rotate90 k"), [("Rotate90", 5)])
+        ae(_subtrees("cql() flipcolor k"), [("FlipColor", 3)])
+        ae(_subtrees("cql() rotate45 shift k"), [("Rotate45", 521)])
+
+    def test_04_iterators(self):
+        ae = self.assertEqual
+        ae(
+            _subtrees("cql() square all x in A {x attacks k}"),
+            [("SquareAll", 2 + 64 * 5)],
+        )
+        ae(_subtrees("cql() piece x in Q ray(x k)"), [("Piece", 2 + 32 * 5)])
+
+    def test_05_game_searches(self):
+        ae = self.assertEqual
+        ae(_subtrees("cql() find check"), [("Find", 401)])
+        ae(_subtrees("cql() line --> R --> k"), [("Line", 1 + 100 * (2 + 2))])
+        estimate = _estimate("cql() line --> R --> line --> k")
+        ae(estimate.total, 1 + 100 * (2 + 1 + (1 + 100 * 2)))
+        ae(estimate.category, "expensive")
+        estimate = _estimate("cql() s=position 1 t=position 2 echo (s t) k")
+        ae(estimate.subtrees[-1][1], 1 + 100 * 100)
+        ae(estimate.category, "expensive")
+        estimate = _estimate("cql() echo (s t) {s&t}")
+        ae(estimate.subtrees, [(estimate.breakdown[2][1], 1 + 100 * 100)])
+        ae(estimate.category, "expensive")
+
+    def test_06_move_generation(self):
+        ae = self.assertEqual
+        ae(_estimate("cql() countmoves legal --").category, "cheap")
+        ae(_estimate("cql() find countmoves legal --").category, "moderate")
+        ae(
+            _estimate("cql() line --> find countmoves legal --").category,
+            "expensive",
+        )
+
+    def test_07_function_calls(self):
+        ae = self.assertEqual
+        string = "cql() function F(){flip k} F() F()"
+        ae(
+            _subtrees(string),
+            [("Function", 0), ("FunctionCall", 9), ("FunctionCall", 9)],
+        )
+        expected = _estimate(string).total
+        ae(_estimate(string, share_function_bodies=True).total, expected)
+        ae(_estimate(string, compact=True).total, expected)
+        ae(
+            costestimate.estimate(
+                persist.loads(persist.dumps(parser.parse(string)))
+            ).total,
+            expected,
+        )
+
+    def test_08_as_dict(self):
+        ae = self.assertEqual
+        estimate = _estimate("cql() k flip {R}")
+        ae(
+            estimate.as_dict(),
+            {
+                "total": 10,
+                "category": "cheap",
+                "subtrees": [
+                    {
+                        "class": "PieceDesignator",
+                        "text": "k",
+                        "span": [6, 7],
+                        "cost": 1,
+                        "children": [],
+                    },
+                    {
+                        "class": "Flip",
+                        "text": "flip",
+                        "span": [8, 12],
+                        "cost": 9,
+                        "children": [
+                            {
+                                "class": "BraceLeft",
+                                "text": "{",
+                                "span": [13, 14],
+                                "cost": 1,
+                                "children": [
+                                    {
+                                        "class": "PieceDesignator",
+                                        "text": "R",
+                                        "span": [14, 15],
+                                        "cost": 1,
+                                        "children": [],
+                                    },
+                                ],
+                            },
+                        ],
+                    },
+                ],
+            },
+        )
+        ae(json.loads(estimate.to_json()), estimate.as_dict())
+
+    def test_09_deep_nesting(self):
+        ae = self.assertEqual
+        estimate = _estimate("cql() " + "{" * 500 + "k" + "}" * 500)
+        ae(estimate.total, 1)
+        ae(len(estimate.breakdown), 503)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(Estimate))
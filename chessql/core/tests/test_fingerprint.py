@@ -0,0 +1,132 @@
+# test_fingerprint.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.fingerprint module."""
+
+import unittest
+
+from .. import fingerprint
+from .. import parser
+from .. import persist
+
+
+def _fingerprint(string, **kwargs):
+    """Return fingerprint of query in string parsed with kwargs."""
+    return fingerprint.fingerprint(parser.parse(string, **kwargs))
+
+
+class CanonicalForm(unittest.TestCase):
+    def test_01_canonical_form(self):
+        ae = self.assertEqual
+        ae(
+            fingerprint.canonical_form(
+                parser.parse('cql() cnt = 3  k ≤ cnt ray (R k) sort "a  b" k')
+            ).split("\n"),
+            [
+                "0 QueryContainer",
+                "1 CQL cql()",
+                "2 Assign =",
+                "3 Variable v1",
+                "3 Integer 3",
+                "2 LE <=",
+                "3 PieceDesignator k",
+                "3 Variable v1",
+                "2 Ray ray(",
+                "3 PieceDesignator R",
+                "3 PieceDesignator k",
+                "2 Sort sort",
+                '3 Documentation "a  b"',
+                "3 PieceDesignator k",
+            ],
+        )
+
+    def test_02_function_body(self):
+        ae = self.assertEqual
+        ae(
+            fingerprint.canonical_form(
+                parser.parse("cql() function Fun(num x){ num + x }")
+            ).split("\n")[2:],
+            ["2 Function function f1(v1 v2)", "3 body { v1 + v2 }"],
+        )
+
+
+class Fingerprint(unittest.TestCase):
+    def assert_same(self, *strings):
+        """Assert the queries in strings have the same fingerprint."""
+        fingerprints = {_fingerprint(string) for string in strings}
+        self.assertEqual(len(fingerprints), 1)
+
+    def assert_different(self, *strings):
+        """Assert the queries in strings have different fingerprints."""
+        fingerprints = {_fingerprint(string) for string in strings}
+        self.assertEqual(len(fingerprints), len(strings))
+
+    def test_01_hex_digest(self):
+        ae = self.assertEqual
+        digest = _fingerprint("cql() k")
+        ae(len(digest), 64)
+        ae(int(digest, 16) >= 0, True)
+
+    def test_02_whitespace_and_comments(self):
+        self.assert_same(
+            "cql() k or q ray(R k)",
+            "cql()   k\n  or q  ray (R  k)",
+            "cql() /* block */ k or q // line\n ray /* x */ (R k)",
+        )
+
+    def test_03_unicode_symbols(self):
+        self.assert_same("cql() k <= 3", "cql() k ≤ 3")
+        self.assert_same("cql() R -> k", "cql() R → k")
+        self.assert_same("cql() K & q", "cql() K ∩ q")
+        self.assert_same("cql() flip k", "cql() ✵ k")
+
+    def test_04_renamed_definitions(self):
+        self.assert_same(
+            "cql() x = 3 y = x + 1 y > 2",
+            "cql() first = 3 second = first + 1 second > 2",
+        )
+        self.assert_same(
+            "cql() function F(num){num + 1} F(2)",
+            "cql() function Other(n1){n1 + 1} Other(2)",
+        )
+        self.assert_same(
+            'cql() dictionary D["a"] = 1',
+            'cql() dictionary Words["a"] = 1',
+        )
+        self.assert_same(
+            "cql() [Aa]x[element].k",
+            "cql() [Aa]pc[element].k",
+        )
+
+    def test_05_differences_kept(self):
+        self.assert_different("cql() k", "cql() q", "cql() k or q")
+        self.assert_different('cql() sort "a b" k', 'cql() sort "a  b" k')
+        self.assert_different(
+            "cql() x = 1 y = 2 x > y",
+            "cql() x = 1 y = 2 y > x",
+        )
+        self.assert_different(
+            "cql() function F(){k}",
+            "cql() function F(){q}",
+        )
+
+    def test_06_container_forms(self):
+        ae = self.assertEqual
+        string = "cql() function F(x){x + 1} F(2) F(3) k"
+        expected = _fingerprint(string)
+        ae(_fingerprint(string, share_function_bodies=True), expected)
+        ae(_fingerprint(string, compact=True), expected)
+        ae(
+            fingerprint.fingerprint(
+                persist.loads(persist.dumps(parser.parse(string)))
+            ),
+            expected,
+        )
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(CanonicalForm))
+    runner().run(loader(Fingerprint))
@@ -0,0 +1,188 @@
+# test_lexer.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.lexer module."""
+
+import unittest
+import re
+
+from .. import compact
+from .. import lexer
+from .. import parser
+from .. import pattern
+from .. import persist
+
+_QUERIES = (
+    "",
+    "cql()",
+    "cql() k",
+    "cql(input a.pgn output b.pgn) /* c */ k // line\n q",
+    'cql() k ray(R k) {x=1 x+=2} "s" a-h1-8 --> 5 /* c */',
+    "cql() function F(x){x&a1 ray(R x)} F(k) v=a1 F(v) F(q)",
+    "cql() line --> move from k to q legal --> check{2,}",
+    "cql() [Qa-h1-8]×[rnb] Q――q a1→b2 c3←d4 x≤2 y≥3 z≠4",
+    'cql() sort min k comment("x" k) echo(s t) {s&t} 4[x]k',
+    "cql() \\1 \\-2 ~~ [] {+} {*} {1,3} <-- [>=] [<] ///",
+    'cql() "unterminated string',
+    "cql() /* unterminated comment",
+    "\n\n  \t",
+    "é ü × ―",
+)
+
+
+def _tokens(tokens):
+    """Return list of (span, lastindex, groups) for tokens."""
+    return [
+        (token.span(), token.lastindex, token.groups()) for token in tokens
+    ]
+
+
+class Finditer(unittest.TestCase):
+    def test_01_same_tokens_as_cql_re(self):
+        ae = self.assertEqual
+        for string in _QUERIES:
+            with self.subTest(string=string):
+                ae(
+                    _tokens(lexer.finditer(string)),
+                    _tokens(pattern.cql_re.finditer(string)),
+                )
+
+    def test_02_pos_and_endpos(self):
+        ae = self.assertEqual
+        for string in ("", "cql() k", "  a", "×"):
+            for pos in range(-1, len(string) + 2):
+                for endpos in range(-1, len(string) + 2):
+                    with self.subTest(string=string, pos=pos, endpos=endpos):
+                        ae(
+                            _tokens(lexer.finditer(string, pos, endpos)),
+                            _tokens(
+                                pattern.cql_re.finditer(string, pos, endpos)
+                            ),
+                        )
+                ae(
+                    _tokens(lexer.finditer(string, pos)),
+                    _tokens(pattern.cql_re.finditer(string, pos)),
+                )
+
+    def test_03_lastgroup(self):
+        ae = self.assertEqual
+        string = _QUERIES[4]
+        ae(
+            [token.lastgroup for token in lexer.finditer(string)],
+            [token.lastgroup for token in pattern.cql_re.finditer(string)],
+        )
+
+
+class RegexForCharacter(unittest.TestCase):
+    def test_01_groups_same_as_cql_re(self):
+        ae = self.assertEqual
+        for character in sorted(set("".join(_QUERIES))) + [""]:
+            regex = lexer.regex_for_character(character)
+            with self.subTest(character=character):
+                ae(regex.groups, pattern.cql_re.groups)
+                ae(regex.groupindex, pattern.cql_re.groupindex)
+
+    def test_02_cached(self):
+        ae = self.assertEqual
+        ae(
+            lexer.regex_for_character("k") is lexer.regex_for_character("k"),
+            True,
+        )
+        ae(
+            lexer.regex_for_character(" ") is lexer.regex_for_character("k"),
+            False,
+        )
+
+    def test_03_fewer_alternatives_than_cql_re(self):
+        ae = self.assertEqual
+        regex = lexer.regex_for_character("k")
+        ae(regex.pattern.count("|") < pattern.cql_re.pattern.count("|"), True)
+
+
+class CqlRegex(unittest.TestCase):
+    def test_01_cql_regex(self):
+        ae = self.assertEqual
+        regex = lexer.regex_for_character("k")
+        ae(lexer.cql_regex(regex) is pattern.cql_re, True)
+        ae(lexer.cql_regex(pattern.cql_re) is pattern.cql_re, True)
+        other = re.compile("k")
+        ae(lexer.cql_regex(other) is other, True)
+
+    def test_02_compact_and_persist_use_cql_re(self):
+        ae = self.assertEqual
+        token = next(lexer.finditer("k"))
+        ae(token.re is pattern.cql_re, False)
+        ae(compact.token_match(token).re is pattern.cql_re, True)
+        ae(persist.loads(persist.dumps(token)).re is pattern.cql_re, True)
+
+    def test_03_parse(self):
+        ae = self.assertEqual
+        container = parser.parse("cql() k q", compact=True)
+        ae(container.current_token.re is pattern.cql_re, True)
+
+
+class Version(unittest.TestCase):
+    def test_01_latest_version_same_as_all_versions(self):
+        ae = self.assertEqual
+        for string in _QUERIES:
+            with self.subTest(string=string):
+                ae(
+                    _tokens(
+                        lexer.finditer(
+                            string, version=pattern.CQL_VERSIONS[-1]
+                        )
+                    ),
+                    _tokens(lexer.finditer(string)),
+                )
+
+    def test_02_tokens_of_later_versions_not_matched(self):
+        ae = self.assertEqual
+        string = "cql() a1→b2 k――q \\1"
+        names = {
+            version: [
+                pattern.cql_token_names[token.lastindex]
+                for token in lexer.finditer(string, version=version)
+            ]
+            for version in pattern.CQL_VERSIONS
+        }
+        ae("attack_arrow" in names["6.2"], True)
+        ae("dash_lr" in names["6.2"], True)
+        ae("regex_captured_group" in names["6.1"], True)
+        ae("attack_arrow" in names["6.1"], False)
+        ae("dash_lr" in names["6.1"], False)
+        ae("regex_captured_group" in names["6.0.4"], False)
+
+    def test_03_version_patterns(self):
+        ae = self.assertEqual
+        ae(lexer.version_regex() is pattern.cql_re, True)
+        for version in pattern.CQL_VERSIONS:
+            regex = lexer.version_regex(version)
+            with self.subTest(version=version):
+                ae(regex is lexer.version_regex(version), True)
+                ae(regex.groups, pattern.cql_re.groups)
+                ae(regex.groupindex, pattern.cql_re.groupindex)
+                ae(lexer.cql_regex(regex) is pattern.cql_re, True)
+                ae(
+                    lexer.regex_for_character("k", version=version)
+                    is lexer.regex_for_character("k", version=version),
+                    True,
+                )
+
+    def test_04_unknown_version(self):
+        self.assertRaises(pattern.PatternError, lexer.version_regex, "5.1")
+        self.assertRaises(
+            pattern.PatternError, lexer.regex_for_character, "k", "5.1"
+        )
+        self.assertRaises(
+            pattern.PatternError, list, lexer.finditer("k", version="5.1")
+        )
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(Finditer))
+    runner().run(loader(RegexForCharacter))
+    runner().run(loader(CqlRegex))
+    runner().run(loader(Version))
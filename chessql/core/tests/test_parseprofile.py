@@ -0,0 +1,145 @@
+# test_parseprofile.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.parseprofile module."""
+
+import unittest
+import json
+import threading
+
+from .. import basenode
+from .. import filters
+from .. import parseprofile
+from .. import parser
+from .. import querycontainer
+
+
+class ParseProfile(unittest.TestCase):
+    def test_01_empty_profile(self):
+        ae = self.assertEqual
+        profile = parseprofile.ParseProfile()
+        ae(profile.tokens, 0)
+        ae(profile.phases, {"comments": 0.0, "lexer": 0.0, "tree": 0.0})
+        ae(profile.calls(filters.Ray, "__init__"), (0, 0.0))
+        ae(
+            profile.as_dict(),
+            {
+                "tokens": 0,
+                "seconds": 0.0,
+                "phases": {"comments": 0.0, "lexer": 0.0, "tree": 0.0},
+                "classes": {},
+            },
+        )
+
+    def test_02_add_call(self):
+        ae = self.assertEqual
+        profile = parseprofile.ParseProfile()
+        profile.add_call(filters.Ray, "__init__", 0.5)
+        profile.add_call(filters.Ray, "__init__", 0.25)
+        profile.add_call(filters.PieceDesignator, "__init__", 1.0)
+        profile.add_phase_time("lexer", 2.0, tokens=3)
+        ae(profile.calls(filters.Ray, "__init__"), (2, 0.75))
+        ae(profile.tokens, 3)
+        classes = profile.as_dict()["classes"]
+        ae(list(classes), ["filters.PieceDesignator", "filters.Ray"])
+        ae(classes["filters.Ray"], {"__init__": {"count": 2, "seconds": 0.75}})
+        ae(json.loads(profile.to_json()), profile.as_dict())
+
+    def test_03_container_profile_property(self):
+        ae = self.assertEqual
+        container = querycontainer.QueryContainer()
+        ae(container.profile, None)
+        profile = parseprofile.ParseProfile()
+        container.profile = profile
+        ae(container.profile is profile, True)
+        with self.assertRaises(basenode.NodeError):
+            container.profile = True
+
+
+class Profile(unittest.TestCase):
+    def test_01_parse_without_profile(self):
+        ae = self.assertEqual
+        ae(parser.parse("cql() k").profile, None)
+
+    def test_02_parse_with_profile(self):
+        ae = self.assertEqual
+        container = parser.parse(
+            "cql() k ray(R k) /* comment */ {R}", profile=True
+        )
+        profile = container.profile
+        ae(isinstance(profile, parseprofile.ParseProfile), True)
+        ae(profile.tokens, container.token_count)
+        ae(set(profile.phases), set(parseprofile.PHASES))
+        ae(profile.calls(filters.Ray, "__init__")[0], 1)
+        ae(profile.calls(filters.Ray, "place_node_in_tree")[0], 1)
+        ae(profile.calls(filters.Ray, "verify_children_and_set_types")[0], 1)
+        ae(profile.calls(filters.PieceDesignator, "__init__")[0], 4)
+        ae(profile.calls(querycontainer.QueryContainer, "__init__")[0], 0)
+        profile_dict = json.loads(profile.to_json())
+        ae(profile_dict["tokens"], profile.tokens)
+        ae(profile_dict["classes"]["filters.Ray"]["__init__"]["count"], 1)
+
+    def test_03_parse_trees_same(self):
+        ae = self.assertEqual
+        string = "cql() function F(){k q} F() F() line --> R --> k"
+        trace = []
+        parser.parse(string).parse_tree_trace(trace=trace)
+        profiled_trace = []
+        parser.parse(string, profile=True).parse_tree_trace(
+            trace=profiled_trace
+        )
+        ae(profiled_trace, trace)
+
+    def test_04_node_classes_not_changed(self):
+        ae = self.assertEqual
+        classes = [filters.Ray, filters.PieceDesignator, basenode.BaseNode]
+        methods = [
+            (class_, name, class_.__dict__.get(name))
+            for class_ in classes
+            for name in parseprofile.PROFILED_METHODS
+        ]
+        parser.parse("cql() ray(R k)", profile=True)
+        self.assertRaises(
+            basenode.NodeError, parser.parse, "cql() bt", profile=True
+        )
+        for class_, name, function in methods:
+            ae(class_.__dict__.get(name) is function, True)
+
+    def test_05_function_body_calls(self):
+        ae = self.assertEqual
+        profile = parser.parse(
+            "cql() function F(){ray(R k)} F() F()", profile=True
+        ).profile
+        ae(profile.calls(filters.Ray, "__init__")[0], 3)
+        ae(profile.calls(filters.Ray, "place_node_in_tree")[0], 3)
+        ae(profile.calls(filters.Ray, "verify_children_and_set_types")[0], 3)
+
+    def test_06_concurrent_profiled_parses(self):
+        ae = self.assertEqual
+        strings = ["cql() " + "ray(R k) " * (i + 1) for i in range(4)]
+        profiles = {}
+
+        def parse(string, profile):
+            profiles[string] = parser.parse(string, profile=profile).profile
+
+        threads = [
+            threading.Thread(target=parse, args=(string, bool(i % 2)))
+            for i, string in enumerate(strings)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i, string in enumerate(strings):
+            if i % 2:
+                ae(profiles[string].calls(filters.Ray, "__init__")[0], i + 1)
+            else:
+                ae(profiles[string], None)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(ParseProfile))
+    runner().run(loader(Profile))
@@ -0,0 +1,575 @@
+# test_parser.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.parser module."""
+
+import unittest
+import concurrent.futures
+import os
+import random
+import subprocess
+import sys
+
+from .. import basenode
+from .. import compact
+from .. import lexer
+from .. import parser
+from .. import pattern
+from .. import querycontainer
+
+
+class RemoveComments(unittest.TestCase):
+    def setUp(self):
+        self.container = querycontainer.QueryContainer()
+        self.container.place_node_in_tree()
+
+    def tearDown(self):
+        self.container = None
+
+    def whitespace(self):
+        trace = []
+        self.container.whitespace_flat_trace(trace=trace)
+        return trace
+
+    def test_01_no_comments(self):
+        ae = self.assertEqual
+        string = "cql() k or q"
+        ae(parser._remove_comments(string, self.container) is string, True)
+        ae(self.whitespace(), [])
+
+    def test_02_slash_without_comments(self):
+        ae = self.assertEqual
+        string = 'cql() x=4/2 y="/*" ///comment\n'
+        ae(parser._remove_comments(string, self.container) is string, True)
+        ae(self.whitespace(), [])
+
+    def test_03_block_comment(self):
+        ae = self.assertEqual
+        ae(
+            parser._remove_comments("cql() k/* c* **/ q", self.container),
+            "cql() k          q",
+        )
+        ae(self.whitespace(), ["BlockComment (7, 16) '/* c* **/'"])
+
+    def test_04_line_comment(self):
+        ae = self.assertEqual
+        ae(
+            parser._remove_comments("cql() k // c\n\nq", self.container),
+            "cql() k      \nq",
+        )
+        ae(self.whitespace(), ["LineComment (8, 14) '// c\\n\\n'"])
+
+    def test_05_comments_and_strings(self):
+        ae = self.assertEqual
+        ae(
+            parser._remove_comments(
+                'cql() "/*" /**/ k //// c\n"//" /* */', self.container
+            ),
+            'cql() "/*"      k       \n"//"      ',
+        )
+        ae(
+            self.whitespace(),
+            [
+                "BlockComment (11, 15) '/**/'",
+                "LineComment (18, 25) '//// c\\n'",
+                "BlockComment (30, 35) '/* */'",
+            ],
+        )
+
+    def test_06_unterminated_block_comment(self):
+        ae = self.assertEqual
+        string = "cql() k /* q"
+        ae(parser._remove_comments(string, self.container), string)
+        ae(self.whitespace(), [])
+
+
+class Parse(unittest.TestCase):
+    def test_01_comment_before_parenthesis(self):
+        tree = []
+        parser.parse("cql() ray /* R to k */ (R k)").parse_tree_trace(
+            trace=tree
+        )
+        tree_no_comment = []
+        parser.parse("cql() ray (R k)").parse_tree_trace(trace=tree_no_comment)
+        self.assertEqual(
+            [line.split(" ")[:2] for line in tree],
+            [line.split(" ")[:2] for line in tree_no_comment],
+        )
+
+    def test_02_version(self):
+        ae = self.assertEqual
+        string = "cql() a1→b2"
+        tree = []
+        parser.parse(string).parse_tree_trace(trace=tree)
+        for version in pattern.CQL_VERSIONS:
+            with self.subTest(version=version):
+                if version != "6.2":
+                    self.assertRaisesRegex(
+                        basenode.NodeError,
+                        "Unexpected '→b2' found",
+                        parser.parse,
+                        string,
+                        version=version,
+                    )
+                    continue
+                container = parser.parse(string, version=version)
+                ae(container.version, version)
+                version_tree = []
+                container.parse_tree_trace(trace=version_tree)
+                ae(version_tree, tree)
+        ae(parser.parse(string).version, None)
+
+    def test_03_unknown_version(self):
+        self.assertRaises(
+            pattern.PatternError, parser.parse, "cql() k", version="5.1"
+        )
+
+    def test_04_failure_span(self):
+        ae = self.assertEqual
+        with self.assertRaises(basenode.NodeError) as context:
+            parser.parse("cql() k @@ q")
+        ae(context.exception.span, (8, 10))
+
+    def test_05_version_brace_integer_brace(self):
+        ae = self.assertEqual
+        for string in ("cql() {2}", "cql() function F(){2} F()"):
+            tree = []
+            parser.parse(string).parse_tree_trace(trace=tree)
+            for version in pattern.CQL_VERSIONS:
+                with self.subTest(string=string, version=version):
+                    version_tree = []
+                    parser.parse(string, version=version).parse_tree_trace(
+                        trace=version_tree
+                    )
+                    ae(version_tree, tree)
+
+
+class Reparse(unittest.TestCase):
+    def state(self, container):
+        """Return parse tree and whitespace traces of container."""
+        tree = []
+        container.parse_tree_trace(trace=tree)
+        whitespace = []
+        container.whitespace_flat_trace(trace=whitespace)
+        return tree, whitespace, container.current_token.span()
+
+    def reparse(self, string, offset, removed, inserted, **kwargs):
+        """Return container from reparse() after checking against parse()."""
+        container = parser.parse(string)
+        edited = "".join(
+            (string[:offset], inserted, string[offset + removed :])
+        )
+        result = parser.reparse(
+            container, string, offset, removed, inserted, **kwargs
+        )
+        self.assertEqual(self.state(result), self.state(parser.parse(edited)))
+        return container, result
+
+    def test_01_filters_reparsed(self):
+        ae = self.assertEqual
+        string = "cql() k q ray(R k) {x=1 x+=2} not a1 /* c */ B"
+        for offset, removed, inserted in (
+            (string.index(" ray"), 0, " b"),
+            (string.index("R k"), 1, "Q"),
+            (string.index("x+=2"), 4, "y=2"),
+            (string.index(" not"), 0, " // c\n"),
+            (len(string), 0, " r"),
+            (string.index(" q"), string.index(" {") - string.index(" q"), ""),
+        ):
+            with self.subTest(offset=offset, removed=removed):
+                container, result = self.reparse(
+                    string, offset, removed, inserted
+                )
+                ae(result is container, True)
+
+    def test_02_all_offsets(self):
+        ae = self.assertEqual
+        string = "cql() k {q or r} a1 not b2"
+        for offset in range(len(string) + 1):
+            for inserted in (" ", " k "):
+                with self.subTest(offset=offset, inserted=inserted):
+                    try:
+                        parser.parse(
+                            string[:offset] + inserted + string[offset:]
+                        )
+                    except Exception as exc:
+                        self.assertRaises(
+                            exc.__class__,
+                            parser.reparse,
+                            parser.parse(string),
+                            string,
+                            offset,
+                            0,
+                            inserted,
+                        )
+                        continue
+                    container, result = self.reparse(
+                        string, offset, 0, inserted
+                    )
+                    ae(result is container, offset > len("cql()"))
+
+    def test_03_new_container(self):
+        ae = self.assertEqual
+        function = "cql() function F(){k} F() q"
+        header = "cql() k q"
+        name = "cql() x=1 k q r x>0"
+        comment = "cql() k q r b /* c */ B"
+        for string, offset, removed, inserted in (
+            (function, len(function), 0, " r"),
+            (header, header.index(")"), 0, "input a.pgn"),
+            (name, name.index("1"), 1, "2"),
+            (comment, comment.index(" q"), 0, " /*"),
+        ):
+            with self.subTest(string=string):
+                container, result = self.reparse(
+                    string, offset, removed, inserted
+                )
+                ae(result is container, False)
+
+    def test_04_compact(self):
+        ae = self.assertEqual
+        container, result = self.reparse("cql() k q", 7, 0, " r", compact=True)
+        ae(result is container, False)
+        ae(isinstance(result.current_token, compact.TokenMatch), True)
+
+    def test_05_invalid_edit(self):
+        string = "cql() k q"
+        container = parser.parse(string)
+        self.assertRaises(
+            basenode.NodeError, parser.reparse, container, string, 7, 0, "}"
+        )
+        for offset, removed in ((-1, 0), (0, -1), (9, 1), (10, 0)):
+            with self.subTest(offset=offset, removed=removed):
+                self.assertRaises(
+                    parser.ReparseError,
+                    parser.reparse,
+                    container,
+                    string,
+                    offset,
+                    removed,
+                    "k",
+                )
+
+
+class CollectingErrors(unittest.TestCase):
+    def collect(self, string, **kwargs):
+        """Return (top-level filter texts or None, errors) for string."""
+        container, errors = parser.parse_collecting_errors(string, **kwargs)
+        if container is None:
+            return None, errors
+        return [
+            node.match_.group() for node in container.children[0].children
+        ], errors
+
+    def test_01_valid_query(self):
+        ae = self.assertEqual
+        string = "cql() k or q ray(R k) x = 3"
+        container, errors = parser.parse_collecting_errors(string)
+        ae(errors, [])
+        trace = []
+        container.parse_tree_trace(trace=trace)
+        expected = []
+        parser.parse(string).parse_tree_trace(trace=expected)
+        ae(trace, expected)
+
+    def test_02_first_error_as_parse(self):
+        ae = self.assertEqual
+        string = "cql() k ) q"
+        with self.assertRaises(basenode.NodeError) as context:
+            parser.parse(string)
+        filters, errors = self.collect(string)
+        ae(filters, ["k", "q"])
+        ae(errors, [{"error": str(context.exception), "span": [8, 9]}])
+
+    def test_03_several_errors(self):
+        ae = self.assertEqual
+        filters, errors = self.collect("cql() {k @@} q {R ) } r 'a' b")
+        ae(filters, ["q", "r", "b"])
+        ae([error["span"] for error in errors], [[9, 11], [18, 19], [24, 27]])
+
+    def test_04_error_in_filter_before_next_filter(self):
+        ae = self.assertEqual
+        filters, errors = self.collect("cql() ray(R bt) k")
+        ae(filters, ["k"])
+        ae(
+            errors,
+            [
+                {
+                    "error": "'Ray' expects a 'set' argument but got a 'any'",
+                    "span": [16, 17],
+                }
+            ],
+        )
+
+    def test_05_resume_after_infix_operators(self):
+        ae = self.assertEqual
+        ae(self.collect("cql() k or @@ q r")[0], ["q", "r"])
+        ae(self.collect("cql() x = @@ y = 1 q")[0], ["=", "q"])
+
+    def test_06_errors_which_stop_parse(self):
+        ae = self.assertEqual
+        for string, span in (
+            ("cql(foo) k", [0, 8]),
+            ("cql() @@ {k q", [13, 13]),
+        ):
+            with self.subTest(string=string):
+                filters, errors = self.collect(string)
+                ae(filters, None)
+                ae(errors[-1]["span"], span)
+        filters, errors = self.collect(
+            "cql() k @@ q @@ r",
+            limits=querycontainer.ParseLimits(max_tokens=6),
+        )
+        ae(filters, None)
+        ae(len(errors), 2)
+        ae(errors[1]["error"], "Query exceeds limit of 6 for max_tokens")
+
+    def test_07_max_errors(self):
+        ae = self.assertEqual
+        filters, errors = self.collect("cql() @@ k @@ q @@", max_errors=2)
+        ae(filters, None)
+        ae(len(errors), 2)
+        self.assertRaises(
+            ValueError, parser.parse_collecting_errors, "cql() k", max_errors=0
+        )
+
+    def test_08_version(self):
+        ae = self.assertEqual
+        filters, errors = self.collect("cql() a1→b2 k", version="6.1")
+        ae(filters, ["a1", "k"])
+        ae(errors, [{"error": "Unexpected '→b2' found", "span": [8, 11]}])
+        ae(self.collect("cql() a1→b2 k", version="6.2"), (["→", "k"], []))
+        self.assertRaises(
+            pattern.PatternError,
+            parser.parse_collecting_errors,
+            "cql() k",
+            version="5.1",
+        )
+
+    def test_09_names_not_assigned(self):
+        ae = self.assertEqual
+        filters, errors = self.collect("cql() k bt q ray(R k) bt2 check")
+        ae(filters, ["k", "q", "ray(", "check"])
+        ae(
+            errors,
+            [
+                {
+                    "error": "Variable 'bt' has not been assigned",
+                    "span": [31, 31],
+                },
+                {
+                    "error": "Variable 'bt2' has not been assigned",
+                    "span": [31, 31],
+                },
+            ],
+        )
+        filters, errors = self.collect("cql() @@ bt k")
+        ae(filters, ["k"])
+        ae(len(errors), 2)
+        ae(errors[1]["span"], [13, 13])
+        filters, errors = self.collect("cql() bt bt2", max_errors=1)
+        ae(filters, None)
+        ae(len(errors), 1)
+
+    def test_10_resume_at_matching_close(self):
+        ae = self.assertEqual
+        filters, errors = self.collect("cql() {k ray(R} q {mate ) } check")
+        ae(filters, ["q", "check"])
+        ae(
+            [error["error"] for error in errors],
+            [
+                "'Ray' cannot close parenthesized arguments with '}'",
+                "'BraceLeft' cannot close a '{' compound filter with ')'",
+            ],
+        )
+
+
+class ParseMany(unittest.TestCase):
+    # Queries for a range of filters, function definitions, and errors.
+    corpus = (
+        "cql() k",
+        "cql(input a.pgn output b.pgn) /* c */ k // line\n q",
+        'cql() k ray(R k) {x=1 x+=2} "s" a-h1-8 --> 5 /* c */',
+        "cql() function F(x){x&a1 ray(R x)} F(k) v=a1 F(v) F(q)",
+        "cql() line --> move from k to q legal --> check{2,}",
+        "cql() [Qa-h1-8]×[rnb] Q――q a1→b2 c3←d4 x≤2 y≥3 z≠4",
+        'cql() sort min k comment("x" k) s=position 1 echo(s t) {s&t}',
+        "cql() square all x in A {x attacks k} piece y in Q ray(y k)",
+        "cql() flip rotate45 shift {R attacks k} countmoves legal --",
+        'cql() dictionary D["a"]=1 player white "x" result 1-0',
+        "cql() path --> k --> q find check",
+        "cql() x=3 while (x<5) {x+=1} loop {k} year>1900",
+        "cql() a1→b2",
+        "cql() bt",
+        "cql() ray(R",
+        "cql() k ≤ 3 {",
+        'cql() "unterminated string',
+    )
+
+    def parse_all(self, strings, **kwargs):
+        """Return list of parse tree trace or error for queries in strings."""
+        results = []
+        for item in parser.parse_many(
+            strings, return_exceptions=True, **kwargs
+        ):
+            if isinstance(item, Exception):
+                results.append((item.__class__, str(item)))
+                continue
+            trace = []
+            item.parse_tree_trace(trace=trace)
+            results.append(trace)
+        return results
+
+    def test_01_same_as_parse(self):
+        ae = self.assertEqual
+        strings = ["cql() k", "cql() k ray(R k)", "cql() {R} q"]
+        containers = parser.parse_many(strings)
+        ae(len(containers), len(strings))
+        for string, container in zip(strings, containers):
+            trace = []
+            container.parse_tree_trace(trace=trace)
+            expected = []
+            parser.parse(string).parse_tree_trace(trace=expected)
+            ae(trace, expected)
+        ae(parser.parse_many([]), [])
+
+    def test_02_errors(self):
+        ae = self.assertEqual
+        strings = ["cql() k", "cql() bt", "cql() q"]
+        self.assertRaises(basenode.NodeError, parser.parse_many, strings)
+        items = parser.parse_many(strings, return_exceptions=True)
+        ae(isinstance(items[0], querycontainer.QueryContainer), True)
+        ae(isinstance(items[1], basenode.NodeError), True)
+        ae(isinstance(items[2], querycontainer.QueryContainer), True)
+
+    def test_03_executor_and_arguments(self):
+        ae = self.assertEqual
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            containers = parser.parse_many(
+                ["cql() k", "cql() a1→b2"],
+                executor=executor,
+                version="6.2",
+                compact=True,
+            )
+            ae([container.version for container in containers], ["6.2"] * 2)
+            self.assertRaises(
+                basenode.NodeError,
+                parser.parse_many,
+                ["cql() a1→b2"],
+                executor=executor,
+                version="6.1",
+            )
+
+    def test_04_stress(self):
+        ae = self.assertEqual
+        kwargs_list = (
+            {},
+            {"version": "6.1"},
+            {"share_function_bodies": True},
+            {"compact": True, "profile": True},
+        )
+        strings = list(self.corpus) * 8
+        random.Random(1).shuffle(strings)
+        expected = {}
+        for kwargs in kwargs_list:
+            results = [
+                self.parse_all([string], **kwargs)[0] for string in strings
+            ]
+            expected[tuple(kwargs)] = results
+
+        # Start with empty lexer caches so the threads compile the patterns,
+        # and restore the caches after so patterns used by earlier parses
+        # are still recognised by lexer.cql_regex().
+        caches = (
+            lexer._elements,
+            lexer._regex_by_elements,
+            lexer._regex_by_character,
+            lexer._indices_by_version,
+            lexer._regex_ids,
+        )
+        saved = [cache.copy() for cache in caches]
+        with lexer._lock:
+            for cache in caches:
+                cache.clear()
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=16
+            ) as executor:
+                for kwargs in kwargs_list:
+                    with self.subTest(kwargs=kwargs):
+                        ae(
+                            self.parse_all(
+                                strings, executor=executor, **kwargs
+                            ),
+                            expected[tuple(kwargs)],
+                        )
+            ae(len(lexer._elements), len(pattern.CQL_ELEMENTS))
+            ae(len(lexer._regex_ids), len(lexer._regex_by_elements))
+        finally:
+            sys.setswitchinterval(interval)
+            with lexer._lock:
+                for cache, copy in zip(caches, saved):
+                    cache.clear()
+                    if isinstance(cache, list):
+                        cache.extend(copy)
+                    else:
+                        cache.update(copy)
+
+
+class Imports(unittest.TestCase):
+    def imported(self, module):
+        """Return sys.modules names and cql_re flag after importing module.
+
+        The import is done in a new process because the modules are
+        already imported in this process.
+
+        """
+        script = "".join(
+            (
+                "import sys\n",
+                "import chessql.core.",
+                module,
+                "\n",
+                "pattern = sys.modules.get('chessql.core.pattern')\n",
+                "print(' '.join(sys.modules))\n",
+                "print(pattern is not None and 'cql_re' in vars(pattern))\n",
+            )
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(
+                os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+            ),
+            text=True,
+        ).stdout.splitlines()
+        return output[0].split(), output[1] == "True"
+
+    def test_01_parser_does_not_compile_cql_re(self):
+        modules, compiled = self.imported("parser")
+        self.assertEqual("chessql.core.filters" in modules, True)
+        self.assertEqual(compiled, False)
+
+    def test_02_modules_without_filters(self):
+        ae = self.assertEqual
+        for module in ("options", "keywords", "cqltypes"):
+            modules, compiled = self.imported(module)
+            with self.subTest(module=module):
+                ae("chessql.core.filters" in modules, False)
+                ae("chessql.core.pattern" in modules, False)
+                ae(compiled, False)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(RemoveComments))
+    runner().run(loader(Parse))
+    runner().run(loader(Reparse))
+    runner().run(loader(CollectingErrors))
+    runner().run(loader(ParseMany))
+    runner().run(loader(Imports))
@@ -19,7 +19,10 @@ class PatternAttributes(unittest.TestCase):
         self.assertEqual(
             [a for a in sorted(dir(pattern)) if a.isupper()],
             [
+                "CQL_ELEMENTS",
                 "CQL_TOKENS",
+                "CQL_VERSIONED_ELEMENTS",
+                "CQL_VERSIONS",
             ],
         )
 
@@ -810,6 +813,80 @@ class Pattern(unittest.TestCase):
             ),
         )
 
+    def test_cql_elements(self):
+        ae = self.assertEqual
+        ae(isinstance(pattern.CQL_ELEMENTS, tuple), True)
+        ae(
+            pattern.CQL_TOKENS,
+            "(" + ")|(".join(pattern.CQL_ELEMENTS) + ")",
+        )
+        ae(pattern.CQL_ELEMENTS[-1], r"(?P<end_of_stream>)$")
+
+    def test_cql_versioned_elements(self):
+        ae = self.assertEqual
+        ae(
+            pattern.CQL_ELEMENTS,
+            tuple(
+                element for element, version in pattern.CQL_VERSIONED_ELEMENTS
+            ),
+        )
+        ae(
+            {version for element, version in pattern.CQL_VERSIONED_ELEMENTS},
+            set(pattern.CQL_VERSIONS),
+        )
+
+    def test_version_element_indices(self):
+        ae = self.assertEqual
+        elements = pattern.CQL_ELEMENTS
+        indices = [
+            pattern.version_element_indices(version)
+            for version in pattern.CQL_VERSIONS
+        ]
+        ae(indices[0] < indices[1] < indices[2], True)
+        ae(indices[-1], frozenset(range(len(elements))))
+        ae(
+            elements.index(pattern.elements.PIECE_DESIGNATOR) in indices[0],
+            True,
+        )
+        ae(elements.index(pattern.hhdb.HHDB) in indices[0], False)
+        ae(elements.index(pattern.hhdb.HHDB) in indices[1], True)
+        ae(elements.index(pattern.elements.DASH_II) in indices[1], False)
+        ae(elements.index(pattern.elements.DASH_II) in indices[2], True)
+        self.assertRaises(
+            pattern.PatternError, pattern.version_element_indices, "5.1"
+        )
+        self.assertRaises(
+            pattern.PatternError, pattern.version_element_indices, None
+        )
+
+    def test_cql_token_names(self):
+        ae = self.assertEqual
+        ae(
+            pattern.cql_token_names,
+            pattern.map_group_index_to_token_name(pattern.cql_re),
+        )
+        ae(
+            pattern.map_element_index_to_token_name(
+                (r"(?P<a>)x", r"?:(?P<b>)y", r"(?P<c>)z")
+            ),
+            {1: "a", 2: "a", 3: "b", 4: "c", 5: "c"},
+        )
+        self.assertRaises(
+            RuntimeError,
+            pattern.map_element_index_to_token_name,
+            (r"(?P<a>)x(?P<b>)y",),
+        )
+        self.assertRaises(
+            RuntimeError, pattern.map_element_index_to_token_name, (r"x",)
+        )
+
+    def test_cql_re_module_attribute(self):
+        ae = self.assertEqual
+        ae(pattern.cql_re is pattern.cql_re, True)
+        ae(vars(pattern)["cql_re"] is pattern.cql_re, True)
+        ae(pattern.cql_re.pattern, pattern.CQL_TOKENS)
+        self.assertRaises(AttributeError, getattr, pattern, "no_such_name")
+
 
 class PatternRe(unittest.TestCase):
     def test_cql_tokens_re(self):
@@ -0,0 +1,148 @@
+# test_persist.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.persist module."""
+
+import unittest
+import io
+import pickle
+
+from .. import parser
+from .. import pattern
+from .. import persist
+from .. import querycontainer
+
+from . import treetrace
+
+
+class SavedMatch(unittest.TestCase):
+    def setUp(self):
+        self.match_ = pattern.cql_re.match("piece X in Q", 0)
+        self.saved = persist.loads(persist.dumps(self.match_))
+
+    def test_01_saved_match(self):
+        ae = self.assertEqual
+        saved = self.saved
+        ae(isinstance(saved, persist.SavedMatch), True)
+        ae(saved.string, self.match_.string)
+        ae(saved.re is self.match_.re, True)
+        ae(saved.lastindex, self.match_.lastindex)
+        ae(saved.lastgroup, self.match_.lastgroup)
+
+    def test_02_group_and_span(self):
+        ae = self.assertEqual
+        saved = self.saved
+        match_ = self.match_
+        ae(saved.group(), match_.group())
+        ae(saved[0], match_[0])
+        ae(saved["piece"], match_["piece"])
+        ae(saved.group(0, "piece"), match_.group(0, "piece"))
+        ae(saved.span(), match_.span())
+        ae(saved.span("square"), match_.span("square"))
+        ae(saved.start("piece"), match_.start("piece"))
+        ae(saved.end(), match_.end())
+        ae(saved.regs, match_.regs)
+        self.assertRaises(IndexError, saved.group, "nosuchgroup")
+        self.assertRaises(IndexError, saved.span, match_.re.groups + 1)
+
+    def test_03_groups_and_groupdict(self):
+        ae = self.assertEqual
+        ae(self.saved.groups(), self.match_.groups())
+        ae(self.saved.groupdict(), self.match_.groupdict())
+        ae(self.saved.groupdict(default=""), self.match_.groupdict(""))
+
+
+class Persist(unittest.TestCase):
+    def verify_round_trip(self, string):
+        container = parser.parse(string)
+        restored = persist.loads(persist.dumps(container))
+        self.assertEqual(
+            isinstance(restored, querycontainer.QueryContainer), True
+        )
+        self.assertEqual(
+            treetrace.traces(restored), treetrace.traces(container)
+        )
+        return container, restored
+
+    def test_01_filters(self):
+        self.verify_round_trip("cql() k q ray(R k) {v=1 v+=2 v>1}")
+
+    def test_02_parameters_and_comments(self):
+        self.verify_round_trip(
+            "cql(input a.pgn output b.pgn) /* c */ k // line\n q"
+        )
+
+    def test_03_definitions(self):
+        container, restored = self.verify_round_trip(
+            'cql() function F(x){x} F(k) F(q) v=1 dictionary D["a"]=1'
+        )
+        ae = self.assertEqual
+        ae(sorted(restored.definitions), sorted(container.definitions))
+        for name, item in container.definitions.items():
+            restored_item = restored.definitions[name]
+            ae(restored_item.__class__, item.__class__)
+            ae(restored_item.definition_type, item.definition_type)
+            for attr in ("filter_type", "variable_type", "persistence_type"):
+                ae(
+                    getattr(restored_item, attr, None),
+                    getattr(item, attr, None),
+                )
+
+    def test_04_tree_links(self):
+        container, restored = self.verify_round_trip("cql() k or q")
+        del container
+        nodes = []
+        restored.parse_tree_node(trace=nodes)
+        for depth, node in nodes:
+            self.assertEqual(node.container is restored, True)
+            for child in node.children:
+                self.assertEqual(child.parent is node, True)
+
+    def test_05_dump_and_load_file(self):
+        containers = {
+            "a.cql": parser.parse("cql() k"),
+            "b.cql": parser.parse("cql() q"),
+        }
+        file = io.BytesIO()
+        persist.dump(containers, file)
+        file.seek(0)
+        restored = persist.load(file)
+        self.assertEqual(sorted(restored), ["a.cql", "b.cql"])
+        for key, value in containers.items():
+            self.assertEqual(
+                treetrace.traces(restored[key]), treetrace.traces(value)
+            )
+
+    def test_06_not_persist_data(self):
+        self.assertRaises(
+            persist.PersistError, persist.loads, pickle.dumps("cql() k")
+        )
+
+    def test_07_wrong_format(self):
+        self.assertRaises(
+            persist.PersistError,
+            persist.loads,
+            pickle.dumps(("chessql.persist.0", persist.VERSION, None)),
+        )
+
+    def test_08_wrong_version(self):
+        self.assertRaises(
+            persist.PersistError,
+            persist.loads,
+            pickle.dumps(("chessql.persist.1", persist.VERSION + "x", None)),
+        )
+
+    def test_09_version_without_package_metadata(self):
+        ae = self.assertEqual
+        version = persist._source_version()
+        ae(version.startswith("source-"), True)
+        ae(len(version), len("source-") + 64)
+        ae(persist._source_version(), version)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(SavedMatch))
+    runner().run(loader(Persist))
@@ -0,0 +1,165 @@
+# test_querycache.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.querycache module."""
+
+import unittest
+import tempfile
+
+from .. import querycache
+from .. import querycontainer
+from ..basenode import NodeError
+
+
+class QueryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = querycache.QueryCache(maxsize=2)
+
+    def tearDown(self):
+        self.cache = None
+
+    def test_01_maxsize(self):
+        ar = self.assertRaises
+        ar(ValueError, querycache.QueryCache, maxsize=0)
+        ar(ValueError, querycache.QueryCache, maxsize="1")
+        self.assertEqual(self.cache.maxsize, 2)
+
+    def test_02_query_key(self):
+        ae = self.assertEqual
+        ae(querycache.query_key("cql() k"), querycache.query_key("cql() k"))
+        ae(
+            querycache.query_key("cql() k")
+            == querycache.query_key("cql()  k"),
+            False,
+        )
+        ae(
+            querycache.query_key("cql() k")
+            == querycache.query_key("cql() k", version="6.1"),
+            False,
+        )
+        ae(
+            querycache.query_key("cql() k")
+            == querycache.query_key(
+                "cql() k", limits=querycontainer.ParseLimits(max_tokens=9)
+            ),
+            False,
+        )
+
+    def test_03_hit_and_miss(self):
+        ae = self.assertEqual
+        cache = self.cache
+        first = cache.parse("cql() k")
+        ae(isinstance(first, querycontainer.QueryContainer), True)
+        ae((cache.hits, cache.misses), (0, 1))
+        ae(cache.parse("cql() k") is first, True)
+        ae((cache.hits, cache.misses), (1, 1))
+        ae("cql() k" in cache, True)
+        ae(len(cache), 1)
+
+    def test_04_copy(self):
+        ae = self.assertEqual
+        cache = self.cache
+        first = cache.parse("cql() k")
+        second = cache.parse("cql() k", copy=True)
+        ae(second is first, False)
+        trace_first = []
+        first.parse_tree_trace(trace=trace_first)
+        trace_second = []
+        second.parse_tree_trace(trace=trace_second)
+        ae(trace_first, trace_second)
+
+    def test_05_least_recently_used_discarded(self):
+        ae = self.assertEqual
+        cache = self.cache
+        cache.parse("cql() k")
+        cache.parse("cql() q")
+        cache.parse("cql() k")
+        cache.parse("cql() r")
+        ae(len(cache), 2)
+        ae("cql() k" in cache, True)
+        ae("cql() q" in cache, False)
+        ae("cql() r" in cache, True)
+
+    def test_06_parse_error_not_cached(self):
+        ae = self.assertEqual
+        cache = self.cache
+        self.assertRaises(NodeError, cache.parse, "cql() bt")
+        ae(len(cache), 0)
+        ae(cache.misses, 1)
+
+    def test_07_statistics_and_clear(self):
+        ae = self.assertEqual
+        cache = self.cache
+        cache.parse("cql() k")
+        cache.parse("cql() k")
+        ae(
+            cache.statistics(),
+            {
+                "size": 1,
+                "maxsize": 2,
+                "hits": 1,
+                "misses": 1,
+                "disk_hits": 0,
+            },
+        )
+        cache.clear()
+        ae(
+            cache.statistics(),
+            {
+                "size": 0,
+                "maxsize": 2,
+                "hits": 0,
+                "misses": 0,
+                "disk_hits": 0,
+            },
+        )
+
+    def test_08_version_and_limits(self):
+        ae = self.assertEqual
+        cache = self.cache
+        string = "cql() a1→b2"
+        ae(cache.parse(string).version, None)
+        self.assertRaises(NodeError, cache.parse, string, version="6.1")
+        ae(cache.parse(string, version="6.2").version, "6.2")
+        ae(len(cache), 2)
+        ae(cache.contains(string, version="6.2"), True)
+        ae(cache.contains(string, version="6.1"), False)
+        limits = querycontainer.ParseLimits(max_tokens=2)
+        self.assertRaises(
+            querycontainer.ParseLimitError,
+            cache.parse,
+            "cql() k q r",
+            limits=limits,
+        )
+        ae(cache.contains("cql() k q r", limits=limits), False)
+
+
+class QueryCacheDirectory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_01_save_and_restore(self):
+        ae = self.assertEqual
+        first = querycache.QueryCache(directory=self.directory.name)
+        container = first.parse("cql() k")
+        ae((first.misses, first.disk_hits), (1, 0))
+        second = querycache.QueryCache(directory=self.directory.name)
+        restored = second.parse("cql() k")
+        ae((second.misses, second.disk_hits), (1, 1))
+        ae(restored is container, False)
+        trace_saved = []
+        container.parse_tree_trace(trace=trace_saved)
+        trace_restored = []
+        restored.parse_tree_trace(trace=trace_restored)
+        ae(trace_saved, trace_restored)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(QueryCache))
+    runner().run(loader(QueryCacheDirectory))
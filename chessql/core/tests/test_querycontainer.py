@@ -0,0 +1,173 @@
+# test_querycontainer.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Unittests for chessql.core.querycontainer module."""
+
+import unittest
+
+from .. import basenode
+from .. import batchparser
+from .. import parser
+from .. import persist
+from .. import querycontainer
+
+# Each call doubles the function body tokens expanded by the calls in the
+# body of the function called.
+_DOUBLING_CALLS = " ".join(
+    (
+        "cql() function F1(){k}",
+        "function F2(){F1() F1()}",
+        "function F3(){F2() F2()}",
+        "function F4(){F3() F3()}",
+        "F4()",
+    )
+)
+
+
+class ParseLimits(unittest.TestCase):
+    def test_01_arguments(self):
+        ae = self.assertEqual
+        limits = querycontainer.ParseLimits(max_tokens=3, max_depth=0)
+        ae(limits.max_tokens, 3)
+        ae(limits.max_nodes, None)
+        ae(limits.max_function_body_tokens, None)
+        ae(limits.max_depth, 0)
+        ae(
+            repr(limits),
+            "".join(
+                (
+                    "ParseLimits(max_tokens=3, max_nodes=None, ",
+                    "max_function_body_tokens=None, max_depth=0)",
+                )
+            ),
+        )
+        for name in (
+            "max_tokens",
+            "max_nodes",
+            "max_function_body_tokens",
+            "max_depth",
+        ):
+            for value in (-1, 1.5, True, "1"):
+                with self.subTest(name=name, value=value):
+                    self.assertRaises(
+                        ValueError,
+                        querycontainer.ParseLimits,
+                        **{name: value},
+                    )
+
+    def test_02_limits_property(self):
+        ae = self.assertEqual
+        container = querycontainer.QueryContainer()
+        ae(container.limits, None)
+        limits = querycontainer.ParseLimits()
+        container.limits = limits
+        ae(container.limits is limits, True)
+        with self.assertRaises(basenode.NodeError):
+            container.limits = {"max_tokens": 3}
+
+
+class Limits(unittest.TestCase):
+    def limit_reached(self, string, name, count):
+        """Assert parse of string fails if limit called name is count-1."""
+        ae = self.assertEqual
+        container = parser.parse(
+            string, limits=querycontainer.ParseLimits(**{name: count})
+        )
+        ae(container.limits.max_tokens is None, name != "max_tokens")
+        with self.assertRaisesRegex(
+            querycontainer.ParseLimitError,
+            "".join(
+                ("Query exceeds limit of ", str(count - 1), " for ", name)
+            ),
+        ):
+            parser.parse(
+                string, limits=querycontainer.ParseLimits(**{name: count - 1})
+            )
+
+    def test_01_no_limits(self):
+        ae = self.assertEqual
+        container = parser.parse("cql() k q r")
+        ae(container.limits, None)
+        ae(container.token_count, 8)
+        ae(container.node_count, 0)
+
+    def test_02_max_tokens(self):
+        ae = self.assertEqual
+        container = parser.parse(
+            "cql() k q r", limits=querycontainer.ParseLimits()
+        )
+        ae(container.token_count, 8)
+        self.limit_reached("cql() k q r", "max_tokens", 8)
+
+    def test_03_max_nodes(self):
+        ae = self.assertEqual
+        string = "cql() function F(){k q} F() F()"
+        container = parser.parse(string, limits=querycontainer.ParseLimits())
+        ae(container.node_count, 29)
+        self.limit_reached(string, "max_nodes", 29)
+
+    def test_04_max_function_body_tokens(self):
+        ae = self.assertEqual
+        container = parser.parse(
+            _DOUBLING_CALLS, limits=querycontainer.ParseLimits()
+        )
+        ae(container.function_body_token_count, 73)
+        self.limit_reached(_DOUBLING_CALLS, "max_function_body_tokens", 73)
+
+    def test_05_max_depth(self):
+        self.limit_reached("cql() {{{k}}}", "max_depth", 3)
+        self.limit_reached("cql() {k} ray(R {k})", "max_depth", 2)
+        self.limit_reached("cql() function F(){{k}} {F()}", "max_depth", 5)
+
+    def test_06_limit_error_is_node_error(self):
+        self.assertRaises(
+            basenode.NodeError,
+            parser.parse,
+            "cql() k",
+            limits=querycontainer.ParseLimits(max_tokens=0),
+        )
+
+    def test_07_reparse(self):
+        ae = self.assertEqual
+        limits = querycontainer.ParseLimits(max_tokens=8)
+        container = parser.parse("cql() k q", limits=limits)
+        result = parser.reparse(container, "cql() k q", 9, 0, " r")
+        ae(result is container, False)
+        ae(result.limits is limits, True)
+        self.assertRaises(
+            querycontainer.ParseLimitError,
+            parser.reparse,
+            result,
+            "cql() k q r",
+            11,
+            0,
+            " b",
+        )
+
+    def test_08_batchparser(self):
+        ae = self.assertEqual
+        result, container = batchparser.parse_query(
+            _DOUBLING_CALLS,
+            limits=querycontainer.ParseLimits(max_function_body_tokens=10),
+        )
+        ae(result["success"], False)
+        ae(container, None)
+        ae(
+            result["error"],
+            "Query exceeds limit of 10 for max_function_body_tokens",
+        )
+
+    def test_09_persist(self):
+        ae = self.assertEqual
+        container = parser.parse(
+            "cql() k", limits=querycontainer.ParseLimits(max_depth=4)
+        )
+        ae(persist.loads(persist.dumps(container)).limits.max_depth, 4)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner
+    loader = unittest.defaultTestLoader.loadTestsFromTestCase
+    runner().run(loader(ParseLimits))
+    runner().run(loader(Limits))
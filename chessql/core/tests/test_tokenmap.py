@@ -7,7 +7,11 @@
 import unittest
 import re
 
+from .. import basenode
+from .. import filters
+from .. import parser
 from .. import pattern
+from .. import querycontainer
 from .. import tokenmap
 
 
@@ -30,7 +34,244 @@ class ClassFromTokenName(unittest.TestCase):
         ae(len(tokenmap.class_from_token_name), len(found), msg=msg)
 
 
+class ClassFromGroupIndex(unittest.TestCase):
+    def test_01_class_from_group_index_values(self):
+        ae = self.assertEqual
+        ae(
+            set(tokenmap.class_from_group_index.values()),
+            set(tokenmap.class_from_token_name.values()),
+        )
+
+    def test_02_class_from_group_index_lastindex(self):
+        ae = self.assertEqual
+        for match_ in pattern.cql_re.finditer(
+            "cql() piece X in Q square Y in k ray(R k) hhdb max award\n"
+            "function F(x){x} F(q) v=1 {v+=2} ; /* c */ // c\n"
+        ):
+            names = [k for k, v in match_.groupdict().items() if v is not None]
+            ae(len(names), 1)
+            ae(pattern.cql_token_names[match_.lastindex], names[0])
+            ae(
+                tokenmap.class_from_group_index[match_.lastindex],
+                tokenmap.class_from_token_name[names[0]],
+            )
+
+
+class FunctionBodyTemplate(unittest.TestCase):
+    def test_01_template_built_at_first_call(self):
+        ae = self.assertEqual
+        container = parser.parse("cql() function F(x){x k} F(q)")
+        definition = container.definitions["F"]
+        template = definition.template
+        ae(isinstance(template, tuple), True)
+        ae([token for class_, token in template], definition.body)
+        ae(
+            [class_ for class_, token in template],
+            [
+                tokenmap.class_from_group_index[token.lastindex]
+                for token in definition.body
+            ],
+        )
+
+    def test_02_template_reused(self):
+        ae = self.assertEqual
+        container = parser.parse("cql() function F(x){x} F(q) F(r)")
+        template = container.definitions["F"].template
+        ae(
+            tokenmap._function_body_template(container.definitions["F"])
+            is template,
+            True,
+        )
+
+    def test_03_template_discarded_if_body_changed(self):
+        ae = self.assertEqual
+        container = parser.parse("cql() function F(x){x} F(q)")
+        definition = container.definitions["F"]
+        definition.body.append(definition.body[-1])
+        ae(definition.template, None)
+
+    def test_04_each_call_expands_body(self):
+        ae = self.assertEqual
+
+        def nodes(string):
+            trace = []
+            parser.parse(string).parse_tree_node(trace=trace)
+            return [(depth, node.__class__) for depth, node in trace]
+
+        definition = nodes("cql() function F(x){x --}")
+        once = nodes("cql() function F(x){x --}F(k)")
+        twice = nodes("cql() function F(x){x --}F(k) F(k)")
+        call = once[len(definition) :]
+        ae(twice, definition + call + call)
+
+
+class SharedFunctionBodies(unittest.TestCase):
+    def verify_shared(self, string, shared_count):
+        ae = self.assertEqual
+        expanded = parser.parse(string)
+        shared = parser.parse(string, share_function_bodies=True)
+        traces = []
+        depths = []
+        for container in expanded, shared:
+            trace = []
+            container.parse_tree_trace(trace=trace)
+            traces.append(trace)
+            trace = []
+            container.parse_tree_node(trace=trace)
+            depths.append([depth for depth, node in trace])
+        ae(traces[1], traces[0])
+        ae(depths[1], depths[0])
+        references = []
+        nodes = [shared]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, tokenmap.SharedFunctionBody):
+                references.append(node)
+            else:
+                nodes.extend(node.children)
+        ae(len(references), shared_count)
+        for reference in references:
+            ae(reference.parent.children[-1] is reference, True)
+            ae(reference.filter_type, reference.body.filter_type)
+        ae(len(shared.verified) < len(expanded.verified), shared_count > 0)
+        return shared
+
+    def test_01_not_shared_by_default(self):
+        ae = self.assertEqual
+        container = parser.parse("cql() function F(x){x&a1} F(k) F(q)")
+        ae(container.shared_function_bodies, {})
+        nodes = []
+        container.parse_tree_node(trace=nodes)
+        ae(
+            [
+                node
+                for depth, node in nodes
+                if isinstance(node, tokenmap.SharedFunctionBody)
+            ],
+            [],
+        )
+
+    def test_02_share_bodies(self):
+        container = self.verify_shared(
+            "cql() function F(x){x&a1 ray(R x)} F(k) v=a1 F(v) F(q) F(v)",
+            3,
+        )
+        self.assertEqual(list(container.shared_function_bodies), ["F"])
+
+    def test_03_no_arguments(self):
+        self.verify_shared("cql() function F(){k} F() F() F()", 2)
+
+    def test_04_argument_types_differ(self):
+        self.verify_shared('cql() function F(x){x} F(k) F(1) F("s")', 0)
+
+    def test_05_arguments_not_distinct(self):
+        self.verify_shared(
+            "cql() function F(x y){x+y} va=1 vb=2 F(va vb) F(vb va) F(va va)",
+            1,
+        )
+
+    def test_06_nested_calls(self):
+        self.verify_shared(
+            "cql() function G(y){y} function F(x){G(x) x} "
+            "G(a1) F(k) F(q) v=k F(v)",
+            3,
+        )
+
+
+def _container_before_end_of_stream(string):
+    """Return QueryContainer with tokens in string placed in tree.
+
+    The end of stream token is not placed so the query can be incomplete.
+
+    """
+    container = querycontainer.QueryContainer()
+    container.place_node_in_tree()
+    for token in pattern.cql_re.finditer(string):
+        class_ = tokenmap.class_from_group_index[token.lastindex]
+        if class_ is filters.end_of_stream:
+            break
+        container.current_token = token
+        class_(match_=token, container=container).place_node_in_tree()
+    return container
+
+
+class OpenDelimiters(unittest.TestCase):
+    def open_delimiters(self, string):
+        return [
+            node.__class__.__name__
+            for node in _container_before_end_of_stream(
+                string
+            ).innermost_open_delimiters()
+        ]
+
+    def test_01_nested(self):
+        ae = self.assertEqual
+        ae(self.open_delimiters("cql() {"), ["BraceLeft"])
+        ae(
+            self.open_delimiters("cql() {ray(R k) (k"),
+            ["ParenthesisLeft", "BraceLeft"],
+        )
+        ae(
+            self.open_delimiters("cql() {ray(R k) (k)"),
+            ["BraceLeft"],
+        )
+        ae(
+            self.open_delimiters("cql() {ray(R k) {k} x[1"),
+            ["BracketLeft", "BraceLeft"],
+        )
+        ae(self.open_delimiters("cql() e2--(k"), ["TargetParenthesisLeft"])
+
+    def test_02_closed(self):
+        ae = self.assertEqual
+        for string in (
+            "cql() {ray(R k) (k) x=1 x[1]}",
+            "cql() function F(x){(x)} F(k) {F(q)}",
+            "cql() " + "(k) " * 100,
+        ):
+            container = parser.parse(string)
+            with self.subTest(string=string):
+                ae(list(container.innermost_open_delimiters()), [])
+                ae(len(container.open_delimiters) < 2, True)
+                ae(container.open_delimiters, [])
+
+    def test_03_closing_class(self):
+        ae = self.assertEqual
+        for string, class_name in (
+            ("cql() {(k", "ParenthesisRight"),
+            ("cql() function F(x){x} {F(k", "FunctionCallEnd"),
+            ("cql() {ray(R k", "ParenthesizedArgumentsEnd"),
+            ("cql() line-->(k", "LineConstituentParenthesisRight"),
+            ("cql() path (k", "ConstituentParenthesisRight"),
+            ("cql() e2--(k", "TargetConditionsEnd"),
+        ):
+            container = _container_before_end_of_stream(string)
+            with self.subTest(string=string):
+                ae(
+                    tokenmap.parenthesis_right(
+                        match_=pattern.cql_re.match(")"), container=container
+                    ).__class__.__name__,
+                    class_name,
+                )
+
+    def test_04_unmatched(self):
+        ae = self.assertEqual
+        for string, message in (
+            ("cql() k)", "cannot find a '(' phrase to close with ')'"),
+            ("cql() {k)}", "cannot close a '{' compound filter with ')'"),
+            ("cql() (k}", "cannot close a '(' parenthesized block with '}'"),
+            ("cql() k}", "found while trying to match a '}'"),
+        ):
+            with self.subTest(string=string):
+                with self.assertRaises(basenode.NodeError) as context:
+                    parser.parse(string)
+                ae(message in str(context.exception), True)
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner
     loader = unittest.defaultTestLoader.loadTestsFromTestCase
     runner().run(loader(ClassFromTokenName))
+    runner().run(loader(ClassFromGroupIndex))
+    runner().run(loader(FunctionBodyTemplate))
+    runner().run(loader(SharedFunctionBodies))
+    runner().run(loader(OpenDelimiters))
@@ -0,0 +1,18 @@
+# treetrace.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Traces of QueryContainer instances for comparing node trees in tests.
+
+The persist and compact tests verify a QueryContainer saved, restored,
+or compacted, has the same traces as the QueryContainer from the parse.
+"""
+
+
+def traces(container):
+    """Return the parse, whitespace, and parameter, traces of container."""
+    tree = []
+    container.parse_tree_trace(trace=tree)
+    whitespace = []
+    container.whitespace_flat_trace(trace=whitespace)
+    return tree, whitespace, container.parse_parameter_trace()
@@ -28,10 +28,12 @@ direct use of the class_from_token_name dict defined in this module.
 """
 import re
 
+from . import basenode
 from . import filters
 from . import hhdb
 from . import structure
 from . import cql
+from . import pattern
 
 # This gives misleading information about variable name derivation but
 # fits the pattern to detect 'function call' variable names.
@@ -59,6 +61,8 @@ class ReservedVariable(filters.Variable):
     module though it does not belong there.
     """
 
+    __slots__ = ()
+
     def _raise_if_name_invalid(self, type_):
         """Raise NodeError if conditions are met.
 
@@ -68,6 +72,33 @@ class ReservedVariable(filters.Variable):
         self._raise_if_characters_invalid(type_)
 
 
+def _function_body_template(definition):
+    """Return tuple of (class, match) pairs to replay definition's body.
+
+    The tuple is built at the first call of the function and kept in the
+    definition for later calls, so the token classes are looked up and
+    the repeated tokens removed once for each function.
+
+    Queries like 'function F(){--}F()' will produce three tokens for the
+    '--' string inside the function call.  Only one of these should be
+    processed to avoid adding three sets of the classes generated for
+    '--'.  Outside a function call only one token is seen for a '--'.
+
+    """
+    template = definition.template
+    if template is not None:
+        return template
+    template = []
+    previous_token_end = None
+    for token in definition.body:
+        if token.end() == previous_token_end:
+            continue
+        previous_token_end = token.end()
+        template.append((class_from_group_index[token.lastindex], token))
+    definition.template = tuple(template)
+    return definition.template
+
+
 class FunctionCallEnd(filters.RightCompoundPlace):
     """Delegate then close FunctionCall and include function body.
 
@@ -76,6 +107,8 @@ class FunctionCallEnd(filters.RightCompoundPlace):
 
     """
 
+    __slots__ = ()
+
     def place_node_in_tree(self):
         """Delegate then add function body to container cursor."""
         super().place_node_in_tree()
@@ -85,12 +118,12 @@ class FunctionCallEnd(filters.RightCompoundPlace):
             variable_prefix = container.get_next_variable_prefix()
             cursor = container.cursor
             formal = cursor.formal
-            parameters = container.definitions[cursor.name].parameters
+            definition = container.definitions[cursor.name]
+            parameters = definition.parameters
             cursor.completed = False
-            body = container.definitions[container.cursor.name].body
-            filters.BraceLeft(
-                match_=body[0], container=container
-            ).place_node_in_tree()
+            body = definition.body
+            brace_left = filters.BraceLeft(match_=body[0], container=container)
+            brace_left.place_node_in_tree()
             for item, child in enumerate(cursor.children[:-1]):
                 name = (
                     child.name if isinstance(child, structure.Name) else None
@@ -120,89 +153,276 @@ class FunctionCallEnd(filters.RightCompoundPlace):
                 # remove it from function call children.
                 container.cursor.children.append(cursor.children.pop(0))
                 container.cursor.children[-1].parent = container.cursor
-            # Queries like 'function F(){--}F()' will produce three tokens
-            # for the '--' string inside the function call.  Only one of
-            # these should be processed to avoid adding three sets of the
-            # classes generated for '--'.
-            # Outside a function call only one token is seen for a '--'.
-            previous_token_end = None
-            for token in body:
-                if token.end() == previous_token_end:
-                    continue
-                previous_token_end = token.end()
-                classes = {
-                    key: class_from_token_name[key]
-                    # pylint R0801 duplicate code.  Ignored.
-                    # See cql.CQL.place_node_in_tree().
-                    # Shortening the 'raise_...' function name enough would
-                    # remove the pylint report after black reformatting.
-                    for key, value in token.groupdict().items()
-                    if value is not None
-                }
-                container.raise_if_not_single_match_groupdict_entry(
-                    token, classes
-                )
-                for value in classes.values():
-                    # Rename formal variable instances as they appear.
-                    body_item = value(match_=token, container=container)
-                    if isinstance(body_item, structure.Name):
-                        if body_item.name in formal:
-                            body_item.replace_formal_name(formal)
+            template = _function_body_template(definition)
+            container.count_function_body_tokens(len(template))
+            profile = container.profile
+            for class_, token in template:
+                # Rename formal variable instances as they appear.
+                if profile is None:
+                    body_item = class_(match_=token, container=container)
+                else:
+                    body_item = profile.create_node(class_, token, container)
+                if isinstance(body_item, structure.Name):
+                    if body_item.name in formal:
+                        body_item.replace_formal_name(formal)
+                if profile is None:
                     body_item.place_node_in_tree()
+                else:
+                    profile.place_node(body_item)
             filters.BraceRight(
                 match_=body[-1], container=container
             ).place_node_in_tree()
+            container.close_open_delimiter(brace_left)
             # Setting completed outside verify_children_and_set_types()
             # needs a note of justification.
             cursor.completed = True
             container.cursor = cursor
 
 
+class SharedFunctionBody(basenode.BaseNode):
+    """Refer to the body of an earlier call of the same function.
+
+    The body is the '{}' block inside the '{}' block expanded for a
+    function call: see FunctionCallEnd.  The binding maps the variable
+    names in the shared body to the names used in this function call.
+
+    This class is in tokenmap, rather than filters, module because
+    instances are created by share_function_bodies() only, beside the
+    FunctionCallEnd class whose expanded bodies they replace.
+
+    """
+
+    __slots__ = ("_body", "_binding")
+
+    completed = True
+
+    # BaseNode.__init__() is not called because the node is not created
+    # at container.cursor while the query is parsed.
+    # pylint W0231 super-init-not-called.
+    def __init__(self, body, binding, parent):
+        """Initialise reference to body with names in binding."""
+        self._set_slot_defaults()
+        self._children = []
+        self.match_ = body.match_
+        self._container = body.container
+        self._parent = parent
+        self._body = body
+        self._binding = binding
+
+    @property
+    def body(self):
+        """Return self._body."""
+        return self._body
+
+    @property
+    def binding(self):
+        """Return self._binding."""
+        return self._binding
+
+    @property
+    def children(self):
+        """Return children of shared body."""
+        return self._body.children
+
+    @property
+    def filter_type(self):
+        """Return filter type of shared body."""
+        return self._body.filter_type
+
+    def complete(self):
+        """Return True."""
+        return True
+
+    def _tree_node_and_binding(self, binding):
+        """Return shared body and binding composed with self's binding."""
+        if binding:
+            composed = binding.copy()
+            composed.update(
+                (name, binding.get(other, other))
+                for name, other in self._binding.items()
+            )
+        else:
+            composed = self._binding
+        return self._body, composed
+
+
+# Node attributes compared by _function_body_binding() with the tree
+# links, names, and matches, compared as special cases.
+_NOT_COMPARED_ATTRIBUTES = frozenset(
+    ("_children", "_parent", "_container", "_name", "match_", "formal")
+)
+
+
+def _node_attributes(node):
+    """Return dict of names and values of attributes in __slots__ of node."""
+    attributes = {}
+    for class_ in node.__class__.__mro__:
+        for name in class_.__dict__.get("__slots__", ()):
+            if hasattr(node, name):
+                attributes[name] = getattr(node, name)
+    return attributes
+
+
+def _bind_name(forward, reverse, name, other):
+    """Return True if name can be bound to other in forward and reverse."""
+    if name in forward:
+        return forward[name] == other
+    if other in reverse:
+        return False
+    forward[name] = other
+    reverse[other] = name
+    return True
+
+
+def _function_body_binding(shared, body):
+    """Return binding of names in shared to names in body or None.
+
+    None is returned if body is not the same as shared except for a
+    consistent renaming of variables, or if the parse tree trace of body
+    is not reproduced by shared with the returned binding.
+
+    """
+    forward = {}
+    reverse = {}
+    pairs = [(shared, body)]
+    while pairs:
+        node, other = pairs.pop()
+        if node.__class__ is not other.__class__:
+            return None
+        if len(node.children) != len(other.children):
+            return None
+        node_attributes = _node_attributes(node)
+        other_attributes = _node_attributes(other)
+        if node_attributes.keys() != other_attributes.keys():
+            return None
+        for key, value in node_attributes.items():
+            if key in _NOT_COMPARED_ATTRIBUTES:
+                continue
+            if value != other_attributes[key]:
+                return None
+        if node.name is None or other.name is None:
+            if node.name is not other.name:
+                return None
+        elif not _bind_name(forward, reverse, node.name, other.name):
+            return None
+        if "formal" in node_attributes:
+            if node.formal.keys() != other.formal.keys():
+                return None
+            for key, value in node.formal.items():
+                if not _bind_name(forward, reverse, value, other.formal[key]):
+                    return None
+        match_ = node.match_
+        other_match = other.match_
+        if match_ is not other_match:
+            # Only the matches of reserved variables in function calls are
+            # created for each call.
+            if (
+                match_ is None
+                or other_match is None
+                or match_.re is not other_match.re
+                or match_.string != node.name
+                or other_match.string != other.name
+            ):
+                return None
+        pairs.extend(zip(node.children, other.children))
+    binding = {name: other for name, other in forward.items() if name != other}
+    trace = []
+    body.parse_tree_trace(trace=trace)
+    shared_trace = []
+    shared.parse_tree_trace_at_depth(
+        shared_trace, body.tree_depth(), binding=binding
+    )
+    if shared_trace != trace:
+        return None
+    return binding
+
+
+def share_function_bodies(container):
+    """Replace function call bodies in container by SharedFunctionBody.
+
+    The body expanded for the first call of a function in container is
+    kept and the bodies of later calls of the function are replaced by
+    references to the kept body if the later body differs only in the
+    names of variables.
+
+    The parse_tree_trace() and parse_tree_node() methods give the same
+    answers after the replacement, but parse_tree_node() gives the nodes
+    of the kept body for all the calls sharing it.
+
+    """
+    shared_bodies = container.shared_function_bodies
+    replacements = []
+    nodes = [container]
+    while nodes:
+        node = nodes.pop()
+        children = node.children
+        if isinstance(node, filters.FunctionCall) and node.completed:
+            block = children[-1]
+            body = block.children[-1]
+            shared = shared_bodies.get(node.name)
+            if shared is None:
+                shared_bodies[node.name] = body
+            else:
+                binding = _function_body_binding(shared, body)
+                if binding is not None:
+                    replacements.append((block, shared, binding))
+                    children = block.children[:-1]
+        nodes.extend(reversed(children))
+    verified = container.verified
+    for block, shared, binding in replacements:
+        replaced = []
+        block.children[-1].parse_tree_node(trace=replaced)
+        verified.difference_update(item[-1] for item in replaced)
+        block.children[-1] = SharedFunctionBody(shared, binding, block)
+
+
 def parenthesis_right(match_=None, container=None):
     """Return ParenthesisRight or ConstituentParenthesisRight instance.
 
     This function is in cql, rather than filters, module because it
     refers to FunctionCallEnd class.
 
+    The class is decided by the innermost open delimiter, the top of the
+    container's stack once completed delimiters are removed.  The loop
+    normally runs once: it moves past a delimiter only if complete()
+    is True before the delimiter is closed, or if ')' cannot close that
+    kind of delimiter.
+
     """
-    node = container.cursor
-    while node:
+    # The container keeps the '(', '{', and '[', nodes which are not yet
+    # closed so the parent chain of container.cursor is not searched.
+    # The first which is not complete decides the class for ')'.
+    for node in container.innermost_open_delimiters():
         if node.complete():
-            node = node.parent
             continue
         if isinstance(node, filters.ParenthesisLeft):
-            return filters.ParenthesisRight(match_=match_, container=container)
-        if isinstance(node, filters.ConstituentParenthesisLeft):
-            return filters.ConstituentParenthesisRight(
-                match_=match_, container=container
-            )
-        if isinstance(node, filters.LineConstituentParenthesisLeft):
-            return filters.LineConstituentParenthesisRight(
-                match_=match_, container=container
-            )
-        if isinstance(node, filters.FunctionCall):
-            return FunctionCallEnd(match_=match_, container=container)
-        if isinstance(node, structure.ParenthesizedArguments):
-            return filters.ParenthesizedArgumentsEnd(
-                match_=match_, container=container
-            )
-        if isinstance(node, filters.TargetParenthesisLeft):
-            return filters.TargetConditionsEnd(
-                match_=match_, container=container
-            )
-        if isinstance(node, filters.BraceLeft):
+            class_ = filters.ParenthesisRight
+        elif isinstance(node, filters.ConstituentParenthesisLeft):
+            class_ = filters.ConstituentParenthesisRight
+        elif isinstance(node, filters.LineConstituentParenthesisLeft):
+            class_ = filters.LineConstituentParenthesisRight
+        elif isinstance(node, filters.FunctionCall):
+            class_ = FunctionCallEnd
+        elif isinstance(node, structure.ParenthesizedArguments):
+            class_ = filters.ParenthesizedArgumentsEnd
+        elif isinstance(node, filters.TargetParenthesisLeft):
+            class_ = filters.TargetConditionsEnd
+        elif isinstance(node, filters.BraceLeft):
             node.raise_nodeerror(
                 node.__class__.__name__.join("''"),
                 " cannot close a '{' compound filter with ')'",
             )
-        if isinstance(node, filters.BracketLeft):
+        elif isinstance(node, filters.BracketLeft):
             node.raise_nodeerror(
                 node.__class__.__name__.join("''"),
                 " cannot close a '[' string index with ')'",
             )
-        node = node.parent
-    node.raise_nodeerror(
-        node.__class__.__name__.join("''"),
+        else:
+            continue
+        container.close_open_delimiter(node)
+        return class_(match_=match_, container=container)
+    container.raise_nodeerror(
+        container.__class__.__name__.join("''"),
         " cannot find a '(' phrase to close with ')'",
     )
     # A pylint R1710 inconsistent-return-statements report indicates the
@@ -475,3 +695,10 @@ class_from_token_name = {
     "xray": filters.XRay,
     "year": filters.Year,
 }
+
+# Classes for cql_re matches keyed by match_.lastindex values.
+# Avoids scanning the match's groupdict for the one entry not None.
+class_from_group_index = {
+    index: class_from_token_name[name]
+    for index, name in pattern.cql_token_names.items()
+}
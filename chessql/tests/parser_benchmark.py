@@ -0,0 +1,903 @@
+# parser_benchmark.py
+# Copyright 2025 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Measure parser.parse speed and memory use on the unittest queries.
+
+The query strings are extracted from the chessql.core.tests modules which
+import the verify module: the first argument of calls to the verify.Verify
+methods where the argument is a str literal.  The queries in each module
+are a filter family, named after the module without the 'test_' prefix.
+Each query is parsed with the 'cql() ' prefix added by verify.Verify.
+
+The time reported for a family is the shortest of several runs.  The
+token count is the number of matches of the pattern.cql_re pattern.
+
+Allocations are measured in a separate run without timing: 'blocks' is
+the number of memory blocks still allocated after parsing a query while
+the parse tree is alive, and 'peak' is the peak number of bytes traced
+by the tracemalloc module while parsing the query.
+
+Usage is:
+
+python -m chessql.tests.parser_benchmark run [--repeat N] [--family RE]
+    [--disable-gc] [--output FILE]
+
+python -m chessql.tests.parser_benchmark compare BASE NEW [--threshold P]
+
+python -m chessql.tests.parser_benchmark wide [--filters N] [--repeat N]
+    [--growth G]
+
+python -m chessql.tests.parser_benchmark lexer [--repeat N]
+
+python -m chessql.tests.parser_benchmark imports [--repeat N]
+
+python -m chessql.tests.parser_benchmark reparse [--filters N] [--repeat N]
+
+python -m chessql.tests.parser_benchmark hhdb [--repeat N]
+
+where compare reports the families at least P percent slower in the NEW
+run saved by 'run --output' than in the BASE run.  The exit status of
+compare is 1 if any family is slower.
+
+The wide command times the parsing of '{}' blocks containing a quarter,
+a half, and all, of N filters of several kinds.  The growth for a kind
+is the time per filter in the largest block divided by the time per
+filter in the smallest block: about 1 if the parse time is linear in
+the number of filters.  The exit status of wide is 1 if the growth for
+any kind is at least G.
+
+The lexer command times finding the tokens in all the unittest queries
+with pattern.cql_re.finditer and with lexer.finditer, and reports the
+speedup.  The exit status of lexer is 1 if the tokens found differ.
+
+The imports command times importing some chessql.core modules, and the
+first parse after importing the parser module, in new processes.  The
+exit status of imports is 1 if importing a module which does not parse
+queries imports the filters module, or if importing the parser module
+compiles the pattern.cql_re pattern.
+
+The reparse command times parser.parse and parser.reparse of a query of
+N top-level filters after inserting a filter near the start, middle, and
+end, of the query.  The exit status of reparse is 1 if parser.reparse
+does a full parse or gives a different parse tree.
+
+The hhdb command times, for the queries in the hhdb unittests, compiling
+the hhdb.HHDB pattern, matching it at the start of each query without
+the 'cql() ' prefix, finding the tokens with lexer.finditer, and parsing
+the queries.  Run it before and after a change to the hhdb module.  The
+exit status of hhdb is 1 if the tokens found by lexer.finditer differ
+from the tokens found by pattern.cql_re.finditer.
+
+"""
+
+import argparse
+import ast
+import gc
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from ..core import hhdb
+from ..core import lexer
+from ..core import parser
+from ..core import pattern
+from ..core.basenode import NodeError
+
+_TESTS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "core", "tests"
+)
+_VERIFY_MODULE = "verify.py"
+_VERIFY_CLASS = "Verify"
+_TEST_PREFIX = "test_"
+_QUERY_PREFIX = "cql() "
+_TOTAL = "TOTAL"
+
+# The modules imported by the imports command, and the modules which must
+# not import the filters module.
+_IMPORT_MODULES = ("options", "keywords", "cqltypes", "pattern", "parser")
+_LIGHT_MODULES = frozenset(("options", "keywords", "cqltypes"))
+
+# The script run in a new process for each module by the imports command.
+_IMPORT_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+import chessql.core.{module}
+imported = time.perf_counter()
+if {parse}:
+    chessql.core.parser.parse("cql() k q x=1 {{btm}} ray(R k)")
+parsed = time.perf_counter()
+pattern = sys.modules.get("chessql.core.pattern")
+print(
+    imported - start,
+    parsed - imported,
+    "chessql.core.filters" in sys.modules,
+    pattern is not None and "cql_re" in vars(pattern),
+)
+"""
+
+# The filters repeated in the '{}' blocks timed by the wide command.
+_WIDE_BLOCK_FILTERS = ("k", "x=1", "k&q", "{k}", "not k", "move from k")
+
+# The filters repeated in the query, the filter inserted, and the places
+# of the insertions as fractions of the query, for the reparse command.
+_REPARSE_FILTERS = ("k", "k&q", "{k}", "not k", "move from k", "ray(R k)")
+_REPARSE_INSERT = " q"
+_REPARSE_PLACES = (0.1, 0.5, 0.9, 1)
+
+# The family of the hhdb unittest queries timed by the hhdb command.
+_HHDB_FAMILY = "filter_hhdb"
+
+
+def _verify_method_names(directory):
+    """Return frozenset of names of verify.Verify methods."""
+    with open(
+        os.path.join(directory, _VERIFY_MODULE), mode="r", encoding="utf-8"
+    ) as module:
+        tree = ast.parse(module.read())
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == _VERIFY_CLASS:
+            return frozenset(
+                item.name
+                for item in node.body
+                if isinstance(item, ast.FunctionDef)
+                and item.name.startswith("verify")
+            )
+    return frozenset()
+
+
+def _imports_verify(tree):
+    """Return True if module in tree has 'from . import verify' statement."""
+    module_name = os.path.splitext(_VERIFY_MODULE)[0]
+    for node in tree.body:
+        if (
+            isinstance(node, ast.ImportFrom)
+            and node.level == 1
+            and node.module is None
+            and module_name in (alias.name for alias in node.names)
+        ):
+            return True
+    return False
+
+
+def extract_queries(directory=_TESTS_DIRECTORY):
+    """Return dict of lists of queries in unittests keyed by family name.
+
+    Duplicate queries in a family are ignored.
+
+    """
+    method_names = _verify_method_names(directory)
+    families = {}
+    for name in sorted(os.listdir(directory)):
+        family, extension = os.path.splitext(name)
+        if extension != ".py" or not family.startswith(_TEST_PREFIX):
+            continue
+        with open(
+            os.path.join(directory, name), mode="r", encoding="utf-8"
+        ) as module:
+            tree = ast.parse(module.read())
+        if not _imports_verify(tree):
+            continue
+        queries = {}
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call) or not node.args:
+                continue
+            if not isinstance(node.func, ast.Attribute):
+                continue
+            if node.func.attr not in method_names:
+                continue
+            argument = node.args[0]
+            if isinstance(argument, ast.Constant) and isinstance(
+                argument.value, str
+            ):
+                queries[_QUERY_PREFIX + argument.value] = None
+        if queries:
+            families[family[len(_TEST_PREFIX) :]] = list(queries)
+    return families
+
+
+def count_tokens(string):
+    """Return number of pattern.cql_re matches in string."""
+    return sum(1 for token in pattern.cql_re.finditer(string))
+
+
+def _parse_all(queries):
+    """Return number of queries parsed without error."""
+    parsed = 0
+    for query in queries:
+        try:
+            parser.parse(query)
+        except NodeError:
+            continue
+        parsed += 1
+    return parsed
+
+
+def time_queries(queries, repeat):
+    """Return (shortest time of repeat runs, parsed count) for queries."""
+    best = None
+    parsed = 0
+    for count in range(repeat):
+        del count
+        start = time.perf_counter()
+        parsed = _parse_all(queries)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, parsed
+
+
+def measure_allocations(queries):
+    """Return (total retained blocks, total peak bytes) for queries.
+
+    Garbage collection is disabled so collections of earlier parse trees
+    do not distort the counts: the parse trees are collected at the end.
+
+    """
+    blocks = 0
+    peak = 0
+    enabled = gc.isenabled()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for query in queries:
+            tracemalloc.reset_peak()
+            before_bytes = tracemalloc.get_traced_memory()[0]
+            before_blocks = sys.getallocatedblocks()
+            try:
+                container = parser.parse(query)
+            except NodeError:
+                container = None
+            blocks += sys.getallocatedblocks() - before_blocks
+            peak += tracemalloc.get_traced_memory()[1] - before_bytes
+            del container
+    finally:
+        tracemalloc.stop()
+        gc.collect()
+        if enabled:
+            gc.enable()
+    return blocks, peak
+
+
+def run(repeat=5, family_re=None, disable_gc=False):
+    """Return dict of benchmark results for families matching family_re."""
+    families = extract_queries()
+    if family_re is not None:
+        families = {
+            name: queries
+            for name, queries in families.items()
+            if re.search(family_re, name)
+        }
+    results = {}
+    enabled = gc.isenabled()
+    for name, queries in families.items():
+        if disable_gc:
+            gc.disable()
+        try:
+            seconds, parsed = time_queries(queries, repeat)
+        finally:
+            if enabled:
+                gc.enable()
+        blocks, peak = measure_allocations(queries)
+        results[name] = {
+            "queries": len(queries),
+            "parsed": parsed,
+            "tokens": sum(count_tokens(query) for query in queries),
+            "seconds": seconds,
+            "blocks": blocks,
+            "peak": peak,
+        }
+    total = {
+        key: sum(result[key] for result in results.values())
+        for key in ("queries", "parsed", "tokens", "seconds", "blocks", "peak")
+    }
+    results[_TOTAL] = total
+    return {
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "disable_gc": disable_gc,
+        "families": results,
+    }
+
+
+def wide_block(filter_, count):
+    """Return query with a '{}' block containing count copies of filter_."""
+    return "".join((_QUERY_PREFIX, "{ ", " ".join([filter_] * count), " }"))
+
+
+def run_wide(filters=5000, repeat=3):
+    """Return list of (filter, {block size: seconds}, growth) for filters.
+
+    The seconds are the shortest of repeat parses of each block.  Garbage
+    collection is disabled while timing, and done before each block size,
+    because the cost of full collections grows with the heap and would
+    make a linear parse look worse than linear.
+
+    """
+    sizes = (filters // 4, filters // 2, filters)
+    results = []
+    enabled = gc.isenabled()
+    for filter_ in _WIDE_BLOCK_FILTERS:
+        seconds = {}
+        for size in sizes:
+            query = wide_block(filter_, size)
+            gc.collect()
+            gc.disable()
+            try:
+                seconds[size] = time_queries([query], repeat)[0]
+            finally:
+                if enabled:
+                    gc.enable()
+        growth = (seconds[sizes[-1]] / sizes[-1]) / (
+            seconds[sizes[0]] / sizes[0]
+        )
+        results.append((filter_, seconds, growth))
+    return results
+
+
+def report_wide(results, limit):
+    """Return (list of lines, regression flag) reporting run_wide results.
+
+    A filter is a regression if the growth is at least limit.
+
+    """
+    sizes = list(results[0][1])
+    lines = [
+        "".join(
+            ["{:<14}".format("filter")]
+            + ["{:>10}".format(size) for size in sizes]
+            + ["{:>10}".format("us/filter"), "{:>8}".format("growth")]
+        )
+    ]
+    regression = False
+    for filter_, seconds, growth in results:
+        flag = ""
+        if growth >= limit:
+            flag = "  NOT LINEAR"
+            regression = True
+        lines.append(
+            "".join(
+                ["{:<14}".format(filter_)]
+                + ["{:>10.4f}".format(seconds[size]) for size in sizes]
+                + [
+                    "{:>10.1f}".format(seconds[sizes[-1]] / sizes[-1] * 1e6),
+                    "{:>8.2f}".format(growth),
+                    flag,
+                ]
+            )
+        )
+    return lines, regression
+
+
+def _tokens(finditer, queries):
+    """Return list of (span, lastindex, groups) for tokens in queries."""
+    return [
+        (token.span(), token.lastindex, token.groups())
+        for query in queries
+        for token in finditer(query)
+    ]
+
+
+def _time_finditer(finditer, queries, repeat):
+    """Return shortest time of repeat runs finding tokens in queries."""
+    best = None
+    for count in range(repeat):
+        del count
+        start = time.perf_counter()
+        for query in queries:
+            for token in finditer(query):
+                pass
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run_lexer(repeat=5):
+    """Return (list of lines, tokens differ flag) comparing finditers.
+
+    The lexer patterns are compiled before timing starts.
+
+    """
+    queries = [
+        query for family in extract_queries().values() for query in family
+    ]
+    expected = _tokens(pattern.cql_re.finditer, queries)
+    differ = _tokens(lexer.finditer, queries) != expected
+    cql_re_seconds = _time_finditer(pattern.cql_re.finditer, queries, repeat)
+    lexer_seconds = _time_finditer(lexer.finditer, queries, repeat)
+    lines = [
+        "".join(
+            ("queries ", str(len(queries)), " tokens ", str(len(expected)))
+        ),
+        "".join(
+            (
+                "cql_re.finditer ",
+                "{:.4f}".format(cql_re_seconds),
+                " seconds ",
+                str(_rate(len(expected), cql_re_seconds)),
+                " tokens per second",
+            )
+        ),
+        "".join(
+            (
+                "lexer.finditer  ",
+                "{:.4f}".format(lexer_seconds),
+                " seconds ",
+                str(_rate(len(expected), lexer_seconds)),
+                " tokens per second",
+            )
+        ),
+        "".join(
+            (
+                "speedup ",
+                "{:.2f}".format(
+                    cql_re_seconds / lexer_seconds if lexer_seconds else 0
+                ),
+            )
+        ),
+    ]
+    if differ:
+        lines.append("TOKENS DIFFER")
+    return lines, differ
+
+
+def _time_import(module, parse):
+    """Return (import seconds, parse seconds, filters flag, cql_re flag).
+
+    The flags are True if the filters module was imported and if the
+    pattern.cql_re pattern was compiled.
+
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _IMPORT_SCRIPT.format(module=module, parse=parse),
+        ],
+        capture_output=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        text=True,
+    ).stdout.split()
+    return (
+        float(output[0]),
+        float(output[1]),
+        output[2] == "True",
+        output[3] == "True",
+    )
+
+
+def run_imports(repeat=5):
+    """Return (list of lines, regression flag) for import times.
+
+    The times are the shortest of repeat runs.
+
+    """
+    lines = [
+        "".join(
+            (
+                "{:<10}".format("module"),
+                "{:>10}".format("import"),
+                "{:>12}".format("first parse"),
+                "{:>9}".format("filters"),
+                "{:>8}".format("cql_re"),
+            )
+        )
+    ]
+    regression = False
+    for module in _IMPORT_MODULES:
+        parse = module == "parser"
+        runs = [_time_import(module, parse) for count in range(repeat)]
+        filters, compiled = runs[0][2:]
+        flag = ""
+        if (module in _LIGHT_MODULES and filters) or (
+            module == "parser" and compiled
+        ):
+            flag = "  REGRESSION"
+            regression = True
+        lines.append(
+            "".join(
+                (
+                    "{:<10}".format(module),
+                    "{:>10.4f}".format(min(run[0] for run in runs)),
+                    (
+                        "{:>12.4f}".format(min(run[1] for run in runs))
+                        if parse
+                        else "{:>12}".format("")
+                    ),
+                    "{:>9}".format(str(filters)),
+                    "{:>8}".format(str(compiled)),
+                    flag,
+                )
+            )
+        )
+    return lines, regression
+
+
+def _parse_tree_trace(container):
+    """Return list of lines in parse tree trace of container."""
+    trace = []
+    container.parse_tree_trace(trace=trace)
+    return trace
+
+
+def run_reparse(filters=2000, repeat=5):
+    """Return (list of lines, differ flag) comparing reparse with parse.
+
+    The times are the shortest of repeat runs.  The parse of the query
+    before the edit is not included in the reparse time.
+
+    """
+    query = _QUERY_PREFIX
+    boundaries = []
+    for count in range(filters):
+        boundaries.append(len(query))
+        query += " " + _REPARSE_FILTERS[count % len(_REPARSE_FILTERS)]
+    boundaries.append(len(query))
+    lines = [
+        "".join(
+            (
+                "{:<8}".format("place"),
+                "{:>10}".format("parse"),
+                "{:>10}".format("reparse"),
+                "{:>9}".format("speedup"),
+            )
+        )
+    ]
+    differ = False
+    for place in _REPARSE_PLACES:
+        offset = boundaries[int(place * filters)]
+        edited = "".join((query[:offset], _REPARSE_INSERT, query[offset:]))
+        parse_seconds = time_queries([edited], repeat)[0]
+        reparse_seconds = None
+        for count in range(repeat):
+            container = parser.parse(query)
+            start = time.perf_counter()
+            reparsed = parser.reparse(
+                container, query, offset, 0, _REPARSE_INSERT
+            )
+            elapsed = time.perf_counter() - start
+            if reparse_seconds is None or elapsed < reparse_seconds:
+                reparse_seconds = elapsed
+        flag = ""
+        if reparsed is not container or _parse_tree_trace(
+            reparsed
+        ) != _parse_tree_trace(parser.parse(edited)):
+            flag = "  DIFFERS"
+            differ = True
+        lines.append(
+            "".join(
+                (
+                    "{:<8}".format(place),
+                    "{:>10.4f}".format(parse_seconds),
+                    "{:>10.4f}".format(reparse_seconds),
+                    "{:>9.2f}".format(
+                        parse_seconds / reparse_seconds
+                        if reparse_seconds
+                        else 0
+                    ),
+                    flag,
+                )
+            )
+        )
+    return lines, differ
+
+
+def _best_time(function, repeat):
+    """Return shortest time of repeat calls of function."""
+    best = None
+    for count in range(repeat):
+        del count
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def _compile_hhdb():
+    """Compile hhdb.HHDB without using the re module's cache."""
+    re.purge()
+    re.compile(hhdb.HHDB)
+
+
+def run_hhdb(repeat=5):
+    """Return (list of lines, tokens differ flag) for hhdb query times.
+
+    The times are the shortest of repeat runs.
+
+    """
+    queries = extract_queries()[_HHDB_FAMILY]
+    strings = [query[len(_QUERY_PREFIX) :] for query in queries]
+    hhdb_re = re.compile(hhdb.HHDB)
+    matched = sum(1 for string in strings if hhdb_re.match(string))
+    differ = _tokens(lexer.finditer, queries) != _tokens(
+        pattern.cql_re.finditer, queries
+    )
+    times = (
+        ("compile", 1, _best_time(_compile_hhdb, repeat)),
+        (
+            "match",
+            len(strings),
+            _best_time(
+                lambda: [hhdb_re.match(string) for string in strings], repeat
+            ),
+        ),
+        (
+            "lexer",
+            len(queries),
+            _best_time(
+                lambda: [
+                    token
+                    for query in queries
+                    for token in lexer.finditer(query)
+                ],
+                repeat,
+            ),
+        ),
+        ("parse", len(queries), time_queries(queries, repeat)[0]),
+    )
+    lines = [
+        "".join(
+            (
+                "queries ",
+                str(len(queries)),
+                " matched ",
+                str(matched),
+                " pattern length ",
+                str(len(hhdb.HHDB)),
+            )
+        ),
+        "{:<10}{:>10}{:>12}".format("step", "seconds", "us/item"),
+    ]
+    for step, items, seconds in times:
+        lines.append(
+            "{:<10}{:>10.6f}{:>12.2f}".format(
+                step, seconds, seconds / items * 1e6
+            )
+        )
+    if differ:
+        lines.append("TOKENS DIFFER")
+    return lines, differ
+
+
+def _rate(count, seconds):
+    """Return count per second as int, or 0 if seconds is zero."""
+    return int(count / seconds) if seconds else 0
+
+
+def report(benchmark):
+    """Return list of lines reporting benchmark results."""
+    lines = [
+        "".join(
+            (
+                "Python ",
+                benchmark["python"],
+                ", best of ",
+                str(benchmark["repeat"]),
+                " runs",
+                (
+                    ", garbage collection disabled"
+                    if benchmark["disable_gc"]
+                    else ""
+                ),
+            )
+        ),
+        "{:<28}{:>8}{:>8}{:>10}{:>11}{:>10}{:>9}{:>10}".format(
+            "family",
+            "queries",
+            "parsed",
+            "seconds",
+            "tokens/s",
+            "queries/s",
+            "blocks/q",
+            "peak/q",
+        ),
+    ]
+    for name, result in benchmark["families"].items():
+        queries = result["queries"]
+        lines.append(
+            "{:<28}{:>8}{:>8}{:>10.4f}{:>11}{:>10}{:>9}{:>10}".format(
+                name,
+                queries,
+                result["parsed"],
+                result["seconds"],
+                _rate(result["tokens"], result["seconds"]),
+                _rate(queries, result["seconds"]),
+                result["blocks"] // queries,
+                result["peak"] // queries,
+            )
+        )
+    return lines
+
+
+def compare(base, new, threshold=5.0):
+    """Return (list of lines, regression flag) comparing benchmark runs.
+
+    A family is a regression if it is at least threshold percent slower
+    in new than in base.  Families in only one run are ignored.
+
+    """
+    lines = [
+        "{:<28}{:>10}{:>10}{:>9}{:>10}{:>10}".format(
+            "family", "base s", "new s", "change", "blocks", "peak"
+        )
+    ]
+    regression = False
+    base_families = base["families"]
+    for name, result in new["families"].items():
+        if name not in base_families:
+            continue
+        base_result = base_families[name]
+        change = (result["seconds"] / base_result["seconds"] - 1) * 100
+        flag = ""
+        if change >= threshold:
+            flag = "  SLOWER"
+            regression = True
+        lines.append(
+            "{:<28}{:>10.4f}{:>10.4f}{:>8.1f}%{:>10}{:>10}{}".format(
+                name,
+                base_result["seconds"],
+                result["seconds"],
+                change,
+                result["blocks"] - base_result["blocks"],
+                result["peak"] - base_result["peak"],
+                flag,
+            )
+        )
+    return lines, regression
+
+
+def main(argv=None):
+    """Run or compare benchmarks and return exit status."""
+    argumentparser = argparse.ArgumentParser(
+        prog="python -m chessql.tests.parser_benchmark",
+        description="Benchmark parser.parse on the unittest queries.",
+    )
+    commands = argumentparser.add_subparsers(dest="command", required=True)
+    run_command = commands.add_parser("run", help="run the benchmark")
+    run_command.add_argument(
+        "--repeat", type=int, default=5, help="runs per family (default 5)"
+    )
+    run_command.add_argument(
+        "--family", default=None, help="regular expression for families"
+    )
+    run_command.add_argument(
+        "--disable-gc",
+        action="store_true",
+        help="disable garbage collection while timing",
+    )
+    run_command.add_argument(
+        "--output", default=None, help="file for results in JSON format"
+    )
+    compare_command = commands.add_parser(
+        "compare", help="compare two saved runs"
+    )
+    compare_command.add_argument("base", help="results of earlier run")
+    compare_command.add_argument("new", help="results of later run")
+    compare_command.add_argument(
+        "--threshold",
+        type=float,
+        default=5.0,
+        help="percent slower reported as regression (default 5)",
+    )
+    wide_command = commands.add_parser(
+        "wide", help="check parse time is linear in '{}' block size"
+    )
+    wide_command.add_argument(
+        "--filters",
+        type=int,
+        default=5000,
+        help="filters in largest block (default 5000)",
+    )
+    wide_command.add_argument(
+        "--repeat", type=int, default=3, help="runs per block (default 3)"
+    )
+    wide_command.add_argument(
+        "--growth",
+        type=float,
+        default=1.5,
+        help="growth reported as regression (default 1.5)",
+    )
+    lexer_command = commands.add_parser(
+        "lexer", help="compare lexer.finditer with cql_re.finditer"
+    )
+    lexer_command.add_argument(
+        "--repeat", type=int, default=5, help="runs per lexer (default 5)"
+    )
+    imports_command = commands.add_parser(
+        "imports", help="time importing modules in new processes"
+    )
+    imports_command.add_argument(
+        "--repeat", type=int, default=5, help="runs per module (default 5)"
+    )
+    reparse_command = commands.add_parser(
+        "reparse", help="compare parser.reparse with parser.parse"
+    )
+    reparse_command.add_argument(
+        "--filters",
+        type=int,
+        default=2000,
+        help="top-level filters in query (default 2000)",
+    )
+    reparse_command.add_argument(
+        "--repeat", type=int, default=5, help="runs per edit (default 5)"
+    )
+    hhdb_command = commands.add_parser(
+        "hhdb", help="time the hhdb pattern on the hhdb unittest queries"
+    )
+    hhdb_command.add_argument(
+        "--repeat", type=int, default=5, help="runs per step (default 5)"
+    )
+    arguments = argumentparser.parse_args(argv)
+    if arguments.command == "hhdb":
+        if arguments.repeat < 1:
+            argumentparser.error("repeat must be greater than zero")
+        lines, differ = run_hhdb(repeat=arguments.repeat)
+        print("\n".join(lines))
+        return 1 if differ else 0
+    if arguments.command == "reparse":
+        if arguments.repeat < 1:
+            argumentparser.error("repeat must be greater than zero")
+        if arguments.filters < 10:
+            argumentparser.error("filters must be at least 10")
+        lines, differ = run_reparse(
+            filters=arguments.filters, repeat=arguments.repeat
+        )
+        print("\n".join(lines))
+        return 1 if differ else 0
+    if arguments.command == "imports":
+        if arguments.repeat < 1:
+            argumentparser.error("repeat must be greater than zero")
+        lines, regression = run_imports(repeat=arguments.repeat)
+        print("\n".join(lines))
+        return 1 if regression else 0
+    if arguments.command == "lexer":
+        if arguments.repeat < 1:
+            argumentparser.error("repeat must be greater than zero")
+        lines, differ = run_lexer(repeat=arguments.repeat)
+        print("\n".join(lines))
+        return 1 if differ else 0
+    if arguments.command == "wide":
+        if arguments.repeat < 1:
+            argumentparser.error("repeat must be greater than zero")
+        if arguments.filters < 4:
+            argumentparser.error("filters must be at least 4")
+        lines, regression = report_wide(
+            run_wide(filters=arguments.filters, repeat=arguments.repeat),
+            arguments.growth,
+        )
+        print("\n".join(lines))
+        return 1 if regression else 0
+    if arguments.command == "run":
+        if arguments.repeat < 1:
+            argumentparser.error("repeat must be greater than zero")
+        benchmark = run(
+            repeat=arguments.repeat,
+            family_re=arguments.family,
+            disable_gc=arguments.disable_gc,
+        )
+        print("\n".join(report(benchmark)))
+        if arguments.output is not None:
+            with open(arguments.output, mode="w", encoding="utf-8") as file:
+                json.dump(benchmark, file, indent=1)
+        return 0
+    with open(arguments.base, mode="r", encoding="utf-8") as file:
+        base = json.load(file)
+    with open(arguments.new, mode="r", encoding="utf-8") as file:
+        new = json.load(file)
+    lines, regression = compare(base, new, threshold=arguments.threshold)
+    print("\n".join(lines))
+    return 1 if regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())